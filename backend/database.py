@@ -0,0 +1,119 @@
+import os
+from typing import List
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Local store for synced CRM data. SQLite by default; any SQLAlchemy URL works.
+DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./gtm_compass.db')
+
+# Async drivers used for URLs that don't name one
+ASYNC_DRIVERS = {
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg',
+    'mysql': 'aiomysql',
+}
+
+def _async_url(url: str):
+    """DATABASE_URL with an async driver (e.g. sqlite:// -> sqlite+aiosqlite://)"""
+    url = make_url(url)
+    if url.drivername in ASYNC_DRIVERS:
+        url = url.set(drivername=f'{url.drivername}+{ASYNC_DRIVERS[url.drivername]}')
+    return url
+
+def _pool_options(url) -> dict:
+    """Connection pool settings (in-memory SQLite uses a single static connection)"""
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    return {
+        # aiosqlite would otherwise open a new connection per session
+        'poolclass': AsyncAdaptedQueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '10')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT_SECONDS', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE_SECONDS', '1800')),
+        'pool_pre_ping': True,
+    }
+
+async_url = _async_url(DATABASE_URL)
+# Several processes (e.g. sync_runner workers) may write to one SQLite file;
+# wait for the write lock instead of failing after SQLite's default 5s
+connect_args = {'timeout': 30} if async_url.get_backend_name() == 'sqlite' else {}
+engine = create_async_engine(async_url, connect_args=connect_args, **_pool_options(async_url))
+# Objects stay usable after commit; reloading them lazily would need extra awaits
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+Base = declarative_base()
+
+if async_url.get_backend_name() == 'sqlite':
+    @event.listens_for(engine.sync_engine, 'connect')
+    def _configure_sqlite(dbapi_connection, connection_record):
+        # WAL lets queries read while a sync is writing
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.close()
+
+# Store tables whose records are keyed by tenant
+RECORD_TABLES = ('leads', 'calls', 'deals')
+CHANGE_LOG_TABLE = 'record_changes'
+
+def _drop_tables_without_tenant(connection) -> List[str]:
+    """
+    Drop store tables that predate the tenant column
+
+    The records only mirror the CRM, so they are cleared rather than
+    migrated (older stores may hold several tenants' records under one
+    key), and the change log with them. A change log that is the only
+    outdated table goes alone: it is rebuilt from the records
+    (backfill_change_log). The search index is rebuilt on its own.
+
+    Returns:
+        Names of the dropped tables
+    """
+    inspector = inspect(connection)
+    outdated = {
+        table for table in (*RECORD_TABLES, CHANGE_LOG_TABLE)
+        if inspector.has_table(table) and 'tenant' not in {column['name'] for column in inspector.get_columns(table)}
+    }
+    if not outdated:
+        return []
+    to_drop = (*RECORD_TABLES, CHANGE_LOG_TABLE) if outdated - {CHANGE_LOG_TABLE} else (CHANGE_LOG_TABLE,)
+    dropped = []
+    for table in reversed(Base.metadata.sorted_tables):
+        if table.name in to_drop and inspector.has_table(table.name):
+            table.drop(connection)
+            dropped.append(table.name)
+    return dropped
+
+async def init_db():
+    """
+    Create database tables if they don't exist yet
+    This should be called when the application starts
+    """
+    import models  # noqa: F401  (registers tables on Base.metadata)
+    from services.search_index import create_search_index
+    from services.local_store import backfill_change_log
+    
+    async with engine.begin() as conn:
+        dropped = await conn.run_sync(_drop_tables_without_tenant)
+        if set(dropped) & set(RECORD_TABLES):
+            print("⚠️  The local store predates per-tenant records and was cleared; run a sync to fill it again")
+        await conn.run_sync(Base.metadata.create_all)
+    await create_search_index(engine)
+    async with SessionLocal() as db:
+        await backfill_change_log(db)
+
+async def close_db():
+    """Close pooled connections (on shutdown)"""
+    await engine.dispose()
+
+async def get_db():
+    """FastAPI dependency that yields an async database session per request"""
+    async with SessionLocal() as db:
+        yield db
@@ -1,7 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routers.mcp import router as mcp_router
-from services.mcp_orchestrator import initialize_mcps
+from services.mcp_orchestrator import initialize_mcps, get_orchestrators
+from services.health_prober import get_health_probers
+from services.dashboard_push import get_dashboard_broadcasters
+from database import init_db, close_db
+from mcps.executors import shutdown_executors
 
 # Create FastAPI app
 app = FastAPI(
@@ -21,14 +25,34 @@ app.add_middleware(
 
 # Include MCP router
 app.include_router(mcp_router, prefix="/api")
+# The same routes scoped to one tenant (the routes above serve the default tenant)
+app.include_router(mcp_router, prefix="/api/tenants/{tenant_id}")
 
 # Initialize MCP agents on startup
 @app.on_event("startup")
 async def startup_event():
     """Initialize MCP agents when the app starts"""
+    await init_db()
     initialize_mcps()
+    for orchestrator in get_orchestrators().values():
+        orchestrator.start_background_tasks()
+    for prober in get_health_probers():
+        prober.start()
     print("🚀 MCP HubSpot Agent initialized successfully!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks and close connections"""
+    for prober in get_health_probers():
+        await prober.stop()
+    for broadcaster in get_dashboard_broadcasters():
+        await broadcaster.stop()
+    for orchestrator in get_orchestrators().values():
+        await orchestrator.stop_background_tasks()
+        await orchestrator.close()
+    await close_db()
+    shutdown_executors()
+
 # Health check endpoint
 @app.get("/")
 async def root():
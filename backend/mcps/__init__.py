@@ -1,4 +1,4 @@
-from .base import BaseMCP
+from .base import BaseMCP, MCPConnectionError
 from .hubspot import HubSpotMCP
 
-__all__ = ['BaseMCP', 'HubSpotMCP'] 
\ No newline at end of file
+__all__ = ['BaseMCP', 'MCPConnectionError', 'HubSpotMCP'] 
\ No newline at end of file
@@ -0,0 +1,121 @@
+import time
+from typing import Dict, Any, Optional
+
+
+class AdaptiveController:
+    """
+    AIMD tuning of page size and request concurrency for a CRM connection
+
+    Both knobs grow additively while things go well and are cut
+    multiplicatively as soon as they don't:
+    - concurrency backs off on 429 responses, on low rate-limit headroom
+      (remaining/max from the response headers) and when latency climbs far
+      above target; otherwise it grows by about one slot per round of requests
+    - page size backs off when a page takes longer than target_latency
+      (large pages are what time out); otherwise it grows by page_step
+
+    Page size is never reduced because of 429s: smaller pages would only
+    mean more requests against the same budget. A burst of bad responses
+    from requests that were in flight together counts as one back-off.
+    """
+
+    def __init__(self,
+                 min_page_size: int = 10,
+                 max_page_size: int = 100,
+                 page_step: int = 10,
+                 min_concurrency: int = 1,
+                 max_concurrency: int = 10,
+                 target_latency: float = 1.0,
+                 min_headroom: float = 0.1,
+                 decrease_factor: float = 0.5):
+        """
+        Args:
+            min_page_size/max_page_size: Bounds for records per page request
+            page_step: Additive page size increase per fast page
+            min_concurrency/max_concurrency: Bounds for requests in flight
+            target_latency: Seconds a single request should take at most
+            min_headroom: Fraction of the rate-limit budget to keep in reserve
+            decrease_factor: Multiplier applied on a back-off
+        """
+        self.min_page_size = min_page_size
+        self.max_page_size = max_page_size
+        self.page_step = page_step
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.min_headroom = min_headroom
+        self.decrease_factor = decrease_factor
+
+        self._page_size = float(max_page_size)
+        # Start in the middle and let the feedback find the ceiling
+        self._concurrency = float(max(min_concurrency, max_concurrency // 2))
+        self._last_decrease = 0.0
+        self.throttled = 0
+        self.last_latency: Optional[float] = None
+        self.last_headroom: Optional[float] = None
+
+    @property
+    def page_size(self) -> int:
+        return int(self._page_size)
+
+    @property
+    def concurrency(self) -> int:
+        return int(self._concurrency)
+
+    def observe(self,
+                latency: float,
+                status: int,
+                remaining: Optional[int] = None,
+                max_requests: Optional[int] = None,
+                paged: bool = False):
+        """
+        Feed back the outcome of one request
+
+        Args:
+            latency: Seconds the request took
+            status: HTTP status code
+            remaining: Requests left in the current rate-limit window, if reported
+            max_requests: Size of the rate-limit window, if reported
+            paged: Whether this was a page request sized by page_size
+        """
+        self.last_latency = latency
+        if remaining is not None and max_requests:
+            self.last_headroom = remaining / max_requests
+
+        if status == 429:
+            self.throttled += 1
+            self._decrease_concurrency()
+            return
+
+        if status >= 400:
+            return
+
+        if remaining is not None and max_requests and remaining / max_requests < self.min_headroom:
+            self._decrease_concurrency()
+        elif latency > 2 * self.target_latency:
+            self._decrease_concurrency()
+        else:
+            self._concurrency = min(self.max_concurrency, self._concurrency + 1 / self._concurrency)
+
+        if paged:
+            if latency > self.target_latency:
+                self._page_size = max(self.min_page_size, self._page_size * self.decrease_factor)
+            else:
+                self._page_size = min(self.max_page_size, self._page_size + self.page_step)
+
+    def status(self) -> Dict[str, Any]:
+        """Current settings for status endpoints"""
+        return {
+            'page_size': self.page_size,
+            'concurrency': self.concurrency,
+            'throttled': self.throttled,
+            'last_latency_ms': round(self.last_latency * 1000, 1) if self.last_latency is not None else None,
+            'last_headroom': round(self.last_headroom, 3) if self.last_headroom is not None else None
+        }
+
+    def _decrease_concurrency(self):
+        now = time.monotonic()
+        if now - self._last_decrease < self.target_latency:
+            return
+        self._last_decrease = now
+        self._concurrency = max(self.min_concurrency, self._concurrency * self.decrease_factor)
@@ -1,8 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 import asyncio
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from .executors import get_normalize_executor
+
+class MCPConnectionError(Exception):
+    """
+    Raised when a CRM platform cannot be reached or is failing
+    (network errors, timeouts, 5xx responses)
+    
+    Unlike empty results or auth failures, this signals an upstream outage
+    that callers such as the orchestrator's circuit breaker should count.
+    """
+    pass
 
 class BaseMCP(ABC):
     """
@@ -27,6 +38,12 @@ class BaseMCP(ABC):
         self.is_authenticated = False
         self.last_sync = None
         
+        # Pages of at least normalize_offload_records records are normalized
+        # in a shared 'thread' or 'process' pool instead of on the event loop
+        self.normalize_executor = connection_config.get('normalize_executor') or 'thread'
+        self.normalize_offload_records = int(connection_config.get('normalize_offload_records') or 50)
+        get_normalize_executor(self.normalize_executor)  # Fail early on an unknown executor
+        
     @abstractmethod
     async def authenticate(self) -> bool:
         """
@@ -69,6 +86,22 @@ class BaseMCP(ABC):
         """
         pass
     
+    async def get_deals(self,
+                        limit: Optional[int] = None,
+                        since_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch individual deals from the CRM platform
+        Override this in implementations that expose individual deals
+        
+        Args:
+            limit: Maximum number of deals to return
+            since_date: Only return deals created since this date
+            
+        Returns:
+            List of deal dictionaries in normalized format
+        """
+        return []
+    
     @abstractmethod
     async def get_budget_info(self, 
                              lead_ids: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -83,8 +116,51 @@ class BaseMCP(ABC):
         """
         pass
     
+    async def get_leads_by_ids(self, lead_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch specific leads by their CRM IDs
+        Override this with a native batch lookup where the CRM supports one;
+        the default implementation scans get_leads()
+        
+        Args:
+            lead_ids: External IDs of the leads to fetch
+        
+        Returns:
+            List of normalized leads that were found, in request order
+        """
+        leads = {lead.get('external_id'): lead for lead in await self.get_leads()}
+        return [leads[lead_id] for lead_id in dict.fromkeys(lead_ids) if lead_id in leads]
+    
+    async def get_calls_by_ids(self, call_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch specific call records by their CRM IDs
+        Override this with a native batch lookup where the CRM supports one;
+        the default implementation scans get_calls()
+        
+        Args:
+            call_ids: External IDs of the calls to fetch
+        
+        Returns:
+            List of normalized calls that were found, in request order
+        """
+        calls = {call.get('external_id'): call for call in await self.get_calls()}
+        return [calls[call_id] for call_id in dict.fromkeys(call_ids) if call_id in calls]
+    
+    async def get_deals_by_ids(self, deal_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch specific deals by their CRM IDs
+        Override this in implementations that expose individual deals
+        
+        Args:
+            deal_ids: External IDs of the deals to fetch
+        
+        Returns:
+            List of normalized deals that were found, in request order
+        """
+        return []
+    
     @abstractmethod
-    async def sync_to_database(self, db: Session) -> Dict[str, int]:
+    async def sync_to_database(self, db: AsyncSession) -> Dict[str, int]:
         """
         Sync all data from CRM to our database
         
@@ -98,6 +174,29 @@ class BaseMCP(ABC):
     
     # Utility methods that can be overridden by implementations
     
+    async def normalize_page(self,
+                             normalize: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+                             records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run a page-level normalizer on a page of raw records
+        
+        Small pages are normalized inline; larger ones in the configured
+        executor, so big syncs don't stall other requests on the event loop.
+        With the 'process' executor, normalize must be picklable (e.g. a
+        module-level function or a functools.partial of one).
+        
+        Args:
+            normalize: Function turning a list of raw records into normalized ones
+            records: Raw records of one page
+            
+        Returns:
+            Normalized records
+        """
+        executor = get_normalize_executor(self.normalize_executor)
+        if executor is None or len(records) < self.normalize_offload_records:
+            return normalize(records)
+        return await asyncio.get_running_loop().run_in_executor(executor, normalize, records)
+    
     def normalize_lead_data(self, raw_lead: Dict[str, Any]) -> Dict[str, Any]:
         """
         Normalize lead data to our platform's format
@@ -145,6 +244,28 @@ class BaseMCP(ABC):
             'raw_data': raw_call
         }
     
+    def normalize_deal_data(self, raw_deal: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize deal data to our platform's format
+        Override this method in specific MCP implementations
+        
+        Args:
+            raw_deal: Raw deal data from CRM
+        
+        Returns:
+            Normalized deal data
+        """
+        return {
+            'external_id': raw_deal.get('id'),
+            'name': raw_deal.get('name'),
+            'amount': float(raw_deal.get('amount', 0) or 0),
+            'stage': raw_deal.get('stage', 'unknown'),
+            'probability': raw_deal.get('probability'),
+            'close_date': self._parse_date(raw_deal.get('close_date')),
+            'created_at': self._parse_date(raw_deal.get('created_at')),
+            'raw_data': raw_deal
+        }
+    
     def _parse_date(self, date_str: Any) -> Optional[datetime]:
         """
         Parse date string to datetime object
@@ -211,6 +332,49 @@ class BaseMCP(ABC):
                 'last_sync': self.last_sync
             }
     
+    def start_background_tasks(self):
+        """
+        Start background work (e.g. token refresh) once an event loop is running
+        Override this in implementations that need it
+        """
+        pass
+    
+    async def reconcile_deletions(self, db: AsyncSession) -> Dict[str, Any]:
+        """
+        Remove records that were deleted in the CRM from our database
+        
+        Platforms that can't list deletions cheaply leave this as a no-op.
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Dictionary with reconciliation statistics per object type
+        """
+        return {}
+    
+    async def stop_background_tasks(self):
+        """
+        Stop the tasks started by start_background_tasks()
+        """
+        pass
+    
+    async def close(self):
+        """
+        Release connections held by the MCP (on shutdown)
+        """
+        pass
+    
+    def request_stats(self) -> Dict[str, Any]:
+        """
+        Get outbound request statistics (rate limiting, tuning)
+        Override this in implementations that track them
+        
+        Returns:
+            Dictionary of statistics, empty by default
+        """
+        return {}
+    
     def get_platform_name(self) -> str:
         """
         Get the name of the CRM platform
@@ -0,0 +1,133 @@
+import base64
+import contextvars
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+_current_deadline = contextvars.ContextVar('mcp_deadline', default=None)
+
+
+class Deadline:
+    """
+    Time budget for a read, with the cursors needed to resume it
+
+    A deadline is made current with deadline_scope(). Pagination loops stop
+    once it has passed and record, per object type, the cursor of the first
+    page they didn't fetch; the caller returns what was fetched so far as a
+    partial result plus a resume cursor (see encode_resume_cursor). Passing
+    that cursor back in resume_from continues where the read stopped.
+
+    Child deadlines (one per platform) share the parent's expiry and keep
+    their cursors under the platform's key.
+    """
+
+    def __init__(self,
+                 timeout: Optional[float] = None,
+                 resume_from: Optional[Dict[str, Any]] = None,
+                 expires_at: Optional[float] = None):
+        """
+        Args:
+            timeout: Seconds from now until the deadline
+            resume_from: Cursors from an earlier partial read
+            expires_at: Absolute time.monotonic() expiry (instead of timeout)
+        """
+        if expires_at is None:
+            expires_at = time.monotonic() + timeout if timeout is not None else float('inf')
+        self.expires_at = expires_at
+        self.resume_from = resume_from or {}
+        self.cursors: Dict[str, Any] = {}
+        self.partial = False
+        self.children: Dict[str, 'Deadline'] = {}
+        self._parent: Optional['Deadline'] = None
+
+    def remaining(self) -> float:
+        """Seconds left (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def child(self, key: str) -> 'Deadline':
+        """Deadline for one part of the read (e.g. a platform), sharing this expiry"""
+        child = Deadline(expires_at=self.expires_at, resume_from=self.resume_from.get(key))
+        child.cursors = self.cursors.setdefault(key, {})
+        child._parent = self
+        self.children[key] = child
+        return child
+
+    def is_partial(self, key: str) -> bool:
+        """Whether the part read under child(key) stopped early"""
+        child = self.children.get(key)
+        return bool(child and child.partial)
+
+    def is_resuming_without(self, key: str) -> bool:
+        """Whether this resumes a read in which key had already completed"""
+        return bool(self.resume_from) and key not in self.resume_from
+
+    def stop(self, key: str, cursor: Any):
+        """
+        Record that reading key stopped early and where to resume it
+
+        Args:
+            key: What was being read (e.g. 'contacts')
+            cursor: Position to continue from
+        """
+        self.cursors[key] = cursor
+        deadline = self
+        while deadline:
+            deadline.partial = True
+            deadline = deadline._parent
+
+    def resume_cursor(self) -> Optional[str]:
+        """Opaque cursor to resume a partial read, or None if it completed"""
+        return encode_resume_cursor(_prune(self.cursors)) if self.partial else None
+
+def _prune(cursors: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop the empty cursor dicts of parts that completed"""
+    pruned = {}
+    for key, value in cursors.items():
+        if isinstance(value, dict):
+            value = _prune(value)
+            if not value:
+                continue
+        pruned[key] = value
+    return pruned
+
+def encode_resume_cursor(cursors: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(cursors).encode()).decode()
+
+def decode_resume_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by Deadline.resume_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        cursors = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    # {platform: {object type: paging cursor}}; anything else would fail deep in the read
+    if not isinstance(cursors, dict) or not all(_valid_part(part) for part in cursors.values()):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return cursors
+
+def _valid_part(part: Any) -> bool:
+    if part is None:
+        return True
+    return isinstance(part, dict) and all(
+        isinstance(after, (str, int)) or after is None for after in part.values()
+    )
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """Make deadline current for the MCP calls in the block (and tasks they spawn)"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
@@ -0,0 +1,46 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional
+
+# Where page-level normalization runs: on the event loop, or in a shared pool
+NORMALIZE_EXECUTORS = ('inline', 'thread', 'process')
+
+_executors: Dict[str, Executor] = {}
+
+
+def normalize_workers() -> int:
+    """Workers in each normalization pool (NORMALIZE_WORKERS, default up to 4)"""
+    return max(1, int(os.getenv('NORMALIZE_WORKERS') or min(4, os.cpu_count() or 1)))
+
+
+def get_normalize_executor(kind: str) -> Optional[Executor]:
+    """
+    Shared pool for normalizing CRM pages off the event loop
+
+    Threads keep the loop responsive between records but share the GIL;
+    processes normalize in parallel, but the normalizer and the records have
+    to be picklable (module-level functions, plain dicts).
+
+    Args:
+        kind: 'inline', 'thread' or 'process'
+
+    Returns:
+        The pool, or None for inline
+    """
+    if kind not in NORMALIZE_EXECUTORS:
+        raise ValueError(f"Unknown normalize executor: {kind}")
+    if kind == 'inline':
+        return None
+    if kind not in _executors:
+        if kind == 'thread':
+            _executors[kind] = ThreadPoolExecutor(max_workers=normalize_workers(), thread_name_prefix='normalize')
+        else:
+            _executors[kind] = ProcessPoolExecutor(max_workers=normalize_workers())
+    return _executors[kind]
+
+
+def shutdown_executors():
+    """Stop the normalization pools (on shutdown)"""
+    for executor in _executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    _executors.clear()
@@ -1,9 +1,173 @@
 import asyncio
+import contextlib
+import functools
+import hashlib
+import math
+import time
 import aiohttp
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from .base import BaseMCP
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from .base import BaseMCP, MCPConnectionError
+from .rate_limit import RateLimiter, request_priority, get_tenant_scheduler, BACKGROUND, INTERACTIVE
+from .adaptive import AdaptiveController
+from .deadline import Deadline, current_deadline
+from .sync_pipeline import SyncPipeline
+from .executors import normalize_workers
+from .token_store import TokenFileStore
+from services import local_store
+from services.shared_state import get_shared_state, load_once
+
+# Properties requested for each CRM object type
+CONTACT_PROPERTIES = ['firstname', 'lastname', 'email', 'phone', 'company', 'hs_lead_status',
+                      'hs_analytics_source', 'createdate', 'lastmodifieddate']
+CALL_PROPERTIES = ['hs_call_duration', 'hs_call_direction', 'hs_call_status', 'hs_call_body',
+                   'createdate', 'hs_call_recording_url']
+DEAL_PROPERTIES = ['amount', 'dealstage', 'closedate', 'dealname', 'createdate',
+                   'hs_deal_stage_probability']
+
+# Deletion reconciliation compares ranges of this many stored IDs by count,
+# halving the ones that differ down to RECONCILE_LEAF_SIZE IDs, which are
+# then listed and diffed
+RECONCILE_RANGE_SIZE = 2000
+RECONCILE_LEAF_SIZE = 200
+
+def id_digest(ids: List[int]) -> Tuple[int, str]:
+    """Digest of a set of record IDs: (count, SHA-1 of the sorted IDs)"""
+    digest = hashlib.sha1()
+    for record_id in sorted(ids):
+        digest.update(b'%d,' % record_id)
+    return len(ids), digest.hexdigest()
+
+# Object types a full sync covers: name -> (HubSpot object type, properties,
+# date property incremental syncs filter on)
+SYNC_OBJECTS = {
+    'leads': ('contacts', CONTACT_PROPERTIES, 'lastmodifieddate'),
+    'calls': ('calls', CALL_PROPERTIES, 'createdate'),
+    'deals': ('deals', DEAL_PROPERTIES, 'createdate'),
+}
+
+# Maximum number of inputs HubSpot accepts per batch read request
+BATCH_READ_SIZE = 100
+
+# Rate-limit headroom HubSpot reports on every response
+RATE_LIMIT_REMAINING_HEADER = 'X-HubSpot-RateLimit-Remaining'
+RATE_LIMIT_MAX_HEADER = 'X-HubSpot-RateLimit-Max'
+
+# Times a page request answered with 429 is retried before giving up
+MAX_RATE_LIMIT_RETRIES = 5
+
+# The search endpoints have a separate, lower per-second limit, return up
+# to 200 records per page and at most 10,000 results per query
+SEARCH_REQUESTS_PER_SECOND = 4
+SEARCH_PAGE_SIZE = 200
+SEARCH_RESULT_CAP = 10000
+
+# OAuth access tokens are refreshed this long before they expire
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+TOKEN_REFRESH_RETRY_SECONDS = 30
+# Assumed lifetime when a token response has no expires_in (HubSpot's is 30 min)
+DEFAULT_TOKEN_LIFETIME_SECONDS = 1800
+
+# Page-level normalizers. Module-level functions of plain data, so
+# normalize_page can run them in a process pool as well as inline.
+
+def parse_hubspot_date(value: Any) -> Optional[datetime]:
+    """
+    Parse a HubSpot date: milliseconds since epoch or an ISO 8601 string
+    (as returned by the v3 API); offsets are converted to naive UTC
+    """
+    if not value:
+        return None
+    
+    try:
+        if isinstance(value, str):
+            if value.isdigit():
+                return datetime.fromtimestamp(int(value) / 1000)
+            # fromisoformat is far cheaper than trying strptime formats in turn
+            parsed = datetime.fromisoformat(value[:-1] if value.endswith('Z') else value)
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value / 1000)
+    except (ValueError, OSError, OverflowError):
+        return None
+    return None
+
+def normalize_contacts(raw_contacts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Normalize a page of HubSpot contacts to our lead format"""
+    leads = []
+    for raw_lead in raw_contacts:
+        props = raw_lead.get('properties', {})
+        
+        # Combine first and last name
+        first_name = props.get('firstname', '') or ''
+        last_name = props.get('lastname', '') or ''
+        name = f"{first_name} {last_name}".strip() or props.get('email', 'Unknown')
+        
+        leads.append({
+            'external_id': raw_lead.get('id'),
+            'name': name,
+            'email': props.get('email'),
+            'phone': props.get('phone'),
+            'company': props.get('company'),
+            'status': props.get('hs_lead_status', 'new'),
+            'source': props.get('hs_analytics_source', 'unknown'),
+            'created_at': parse_hubspot_date(props.get('createdate')),
+            'updated_at': parse_hubspot_date(props.get('lastmodifieddate')),
+            'raw_data': raw_lead
+        })
+    return leads
+
+def normalize_calls(raw_calls: List[Dict[str, Any]],
+                    contact_ids: Optional[Dict[str, Optional[str]]] = None) -> List[Dict[str, Any]]:
+    """
+    Normalize a page of HubSpot calls to our call format
+    
+    Args:
+        raw_calls: Raw call records
+        contact_ids: Call ID -> associated contact ID, where known
+    """
+    contact_ids = contact_ids or {}
+    calls = []
+    for raw_call in raw_calls:
+        props = raw_call.get('properties', {})
+        
+        calls.append({
+            'external_id': raw_call.get('id'),
+            'lead_external_id': contact_ids.get(raw_call.get('id')),
+            'direction': props.get('hs_call_direction', 'outbound'),
+            'duration': int(props.get('hs_call_duration', 0) or 0),
+            'outcome': props.get('hs_call_status', 'completed'),
+            'notes': props.get('hs_call_body', ''),
+            'recording_url': props.get('hs_call_recording_url'),
+            'created_at': parse_hubspot_date(props.get('createdate')),
+            'raw_data': raw_call
+        })
+    return calls
+
+def normalize_deals(raw_deals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Normalize a page of HubSpot deals to our deal format"""
+    deals = []
+    for raw_deal in raw_deals:
+        props = raw_deal.get('properties', {})
+        
+        probability = props.get('hs_deal_stage_probability')
+        
+        deals.append({
+            'external_id': raw_deal.get('id'),
+            'name': props.get('dealname'),
+            'amount': float(props.get('amount', 0) or 0),
+            'stage': props.get('dealstage', 'unknown'),
+            'probability': float(probability) if probability not in (None, '') else None,
+            'close_date': parse_hubspot_date(props.get('closedate')),
+            'created_at': parse_hubspot_date(props.get('createdate')),
+            'raw_data': raw_deal
+        })
+    return deals
 
 class HubSpotMCP(BaseMCP):
     """
@@ -24,6 +188,135 @@ class HubSpotMCP(BaseMCP):
         self.client_id = connection_config.get('client_id')
         self.client_secret = connection_config.get('client_secret')
         
+        # OAuth token expiry (epoch seconds), known once a token has been refreshed
+        self.token_expires_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        
+        # Refreshed tokens survive restarts when a token file is configured
+        token_file = connection_config.get('token_file')
+        self.token_store = TokenFileStore(token_file) if token_file else None
+        stored = self.token_store.load() if self.token_store else None
+        if stored and stored.get('access_token'):
+            self.access_token = stored['access_token']
+            self.refresh_token = stored.get('refresh_token') or self.refresh_token
+            self.token_expires_at = stored.get('expires_at')
+        
+        # Upper bound on any single HubSpot request, so an outage fails instead of hanging
+        self.timeout = aiohttp.ClientTimeout(total=float(connection_config.get('request_timeout') or 30))
+        
+        # Portal (tenant) this connection belongs to when serving several;
+        # synced records are stored under it
+        self.tenant = connection_config.get('tenant')
+        self.store_tenant = self.tenant or 'default'
+        
+        # Tokens and request budgets shared with other worker processes, if configured
+        self.shared_state = get_shared_state()
+        self.state_key = f"{self.tenant or 'default'}:hubspot"
+        
+        # One request budget shared by every call this MCP makes; interactive
+        # reads are scheduled ahead of background syncs. Tenants also share
+        # the process-wide cap fairly with each other.
+        max_concurrency = int(connection_config.get('max_concurrency') or 10)
+        self.rate_limiter = RateLimiter(
+            max_requests=int(connection_config.get('rate_limit_requests') or 100),
+            interval=float(connection_config.get('rate_limit_interval') or 10),
+            max_concurrency=max_concurrency,
+            interactive_reserve=float(connection_config.get('interactive_reserve') or 0.2),
+            preempt_background=str(connection_config.get('preempt_background', 'true')).lower() in ('1', 'true', 'yes'),
+            tenant=self.tenant,
+            scheduler=get_tenant_scheduler() if self.tenant else None,
+            shared=self.shared_state,
+            shared_key=f'{self.state_key}:rate_limit'
+        )
+        self.search_rate_limiter = RateLimiter(
+            max_requests=SEARCH_REQUESTS_PER_SECOND,
+            interval=1,
+            max_concurrency=SEARCH_REQUESTS_PER_SECOND,
+            shared=self.shared_state,
+            shared_key=f'{self.state_key}:search_rate_limit'
+        )
+        
+        # Concurrent ID ranges a full sync fetches each object type in
+        self.partitions = int(connection_config.get('sync_partitions') or 4)
+        
+        # Bounds on what a full sync holds in memory (see SyncPipeline)
+        memory_limit_mb = float(connection_config.get('sync_memory_limit_mb') or 512)
+        self.sync_pipeline = SyncPipeline(
+            queue_size=int(connection_config.get('sync_queue_size') or 8),
+            memory_limit=int(memory_limit_mb * 1024 * 1024) if memory_limit_mb > 0 else None,
+            spill_dir=connection_config.get('sync_spill_dir') or None,
+            write_batch_size=local_store.UPSERT_CHUNK_SIZE,
+            normalize_concurrency=normalize_workers() if self.normalize_executor != 'inline' else 1
+        )
+        
+        # Tunes page size and the limiter's concurrency from observed responses
+        self.controller = AdaptiveController(
+            max_concurrency=self.rate_limiter.max_concurrency,
+            target_latency=float(connection_config.get('target_latency') or 1.0)
+        )
+        self.rate_limiter.set_max_concurrency(self.controller.concurrency)
+        
+        # Connection pool of this MCP's own, created on first use (needs a running loop)
+        self.pool_size = int(connection_config.get('pool_size') or max_concurrency)
+        self._connector: Optional[aiohttp.TCPConnector] = None
+    
+    def _session(self) -> aiohttp.ClientSession:
+        """
+        Client session on this MCP's connection pool
+        
+        Sessions are opened per call but share one connector, so keep-alive
+        connections are reused and one tenant's load can't use up another
+        tenant's connections.
+        """
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(limit=self.pool_size)
+        return aiohttp.ClientSession(timeout=self.timeout, connector=self._connector, connector_owner=False)
+    
+    async def close(self):
+        """Close the connection pool"""
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+    
+    def _check_outage(self, response: aiohttp.ClientResponse):
+        """
+        Raise MCPConnectionError for responses that mean HubSpot itself is failing
+        """
+        if response.status >= 500:
+            raise MCPConnectionError(f"HubSpot returned {response.status} for {response.url.path}")
+    
+    def _record_response(self, response: aiohttp.ClientResponse, started: float, paged: bool = False):
+        """
+        Feed a response's latency, status and rate-limit headroom to the
+        adaptive controller and apply the resulting concurrency
+        """
+        remaining = response.headers.get(RATE_LIMIT_REMAINING_HEADER, '')
+        max_requests = response.headers.get(RATE_LIMIT_MAX_HEADER, '')
+        self.controller.observe(
+            time.monotonic() - started,
+            response.status,
+            remaining=int(remaining) if remaining.isdigit() else None,
+            max_requests=int(max_requests) if max_requests.isdigit() else None,
+            paged=paged
+        )
+        self.rate_limiter.set_max_concurrency(self.controller.concurrency)
+    
+    def request_stats(self) -> Dict[str, Any]:
+        """Rate limiter load and adaptive controller settings"""
+        return {
+            'rate_limit': self.rate_limiter.stats(),
+            'search_rate_limit': self.search_rate_limiter.stats(),
+            'adaptive': self.controller.status()
+        }
+    
+    def _headers(self) -> Dict[str, str]:
+        """Request headers for authenticated HubSpot API calls"""
+        return {
+            'Authorization': f'Bearer {self.access_token}',
+            'Content-Type': 'application/json'
+        }
+        
     async def authenticate(self) -> bool:
         """
         Authenticate with HubSpot using Private App token or OAuth2
@@ -33,7 +326,7 @@ class HubSpotMCP(BaseMCP):
                 return False
                 
             # Test the access token by making a simple API call
-            async with aiohttp.ClientSession() as session:
+            async with self._session() as session:
                 headers = {
                     'Authorization': f'Bearer {self.access_token}',
                     'Content-Type': 'application/json'
@@ -43,7 +336,8 @@ class HubSpotMCP(BaseMCP):
                 test_url = f'{self.base_url}/crm/v3/objects/contacts'
                 params = {'limit': 1}  # Just get 1 contact to test access
                 
-                async with session.get(test_url, headers=headers, params=params) as response:
+                async with self.rate_limiter, session.get(test_url, headers=headers, params=params) as response:
+                    self._check_outage(response)
                     if response.status == 200:
                         self.is_authenticated = True
                         return True
@@ -54,216 +348,682 @@ class HubSpotMCP(BaseMCP):
                         print(f"HubSpot authentication failed: {response.status}")
                         return False
                         
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
         except Exception as e:
             print(f"HubSpot authentication error: {e}")
             return False
     
+    def _token_expiring(self) -> bool:
+        """Whether the OAuth access token expires within the refresh margin (or its expiry is unknown)"""
+        if self.token_expires_at is None:
+            return True
+        return time.time() >= self.token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS
+    
+    async def _ensure_authenticated(self) -> bool:
+        """
+        Make sure requests can be made, without a live check when possible
+        
+        An authenticated connection is reused as is. OAuth tokens close to
+        expiry are refreshed first; only unauthenticated connections are
+        (re)validated with authenticate().
+        """
+        if self.refresh_token and self.token_expires_at is not None and self._token_expiring():
+            if await self._refresh_access_token():
+                return True
+        if self.is_authenticated:
+            return True
+        return await self.authenticate()
+    
+    def start_background_tasks(self):
+        """Start refreshing the OAuth token ahead of its expiry (OAuth apps only)"""
+        if self.refresh_token and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    async def stop_background_tasks(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+    
+    async def _refresh_loop(self):
+        """Refresh the token TOKEN_REFRESH_MARGIN_SECONDS before each expiry"""
+        refreshed_once = False
+        while True:
+            if self.token_expires_at is not None:
+                delay = self.token_expires_at - TOKEN_REFRESH_MARGIN_SECONDS - time.time()
+            elif refreshed_once:
+                # The token response didn't say when it expires
+                delay = DEFAULT_TOKEN_LIFETIME_SECONDS - TOKEN_REFRESH_MARGIN_SECONDS
+            else:
+                # Unknown expiry at startup: refresh now to learn it
+                delay = 0
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            try:
+                refreshed = await self._refresh_access_token()
+            except Exception as e:
+                print(f"HubSpot background token refresh failed: {e}")
+                refreshed = False
+            if refreshed:
+                refreshed_once = True
+            else:
+                await asyncio.sleep(TOKEN_REFRESH_RETRY_SECONDS)
+    
     async def _refresh_access_token(self) -> bool:
         """
         Refresh the access token using the refresh token
+        
+        Concurrent callers are serialized behind one lock; whoever gets the
+        lock after a refresh has just happened reuses the new token instead
+        of refreshing again. With shared state, the same goes for the other
+        worker processes: one of them refreshes, the rest pick up its token.
         """
-        try:
-            async with aiohttp.ClientSession() as session:
-                data = {
-                    'grant_type': 'refresh_token',
+        stale_token = self.access_token
+        async with self._refresh_lock:
+            if self.access_token != stale_token and not self._token_expiring():
+                return True
+            
+            try:
+                if self.shared_state:
+                    tokens = await self._refresh_shared_tokens(stale_token)
+                else:
+                    tokens = await self._request_tokens()
+            except MCPConnectionError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
+            except Exception as e:
+                print(f"Token refresh error: {e}")
+                return False
+            
+            if not tokens:
+                return False
+            
+            self.access_token = tokens['access_token']
+            self.refresh_token = tokens.get('refresh_token') or self.refresh_token
+            self.token_expires_at = tokens.get('expires_at')
+            
+            # Update connection config
+            self.connection_config['access_token'] = self.access_token
+            self.connection_config['refresh_token'] = self.refresh_token
+            
+            if self.token_store:
+                # The write fsyncs; keep it off the event loop
+                await asyncio.to_thread(self.token_store.save, {
+                    'access_token': self.access_token,
                     'refresh_token': self.refresh_token,
-                    'client_id': self.client_id,
-                    'client_secret': self.client_secret
-                }
-                
-                async with session.post(
+                    'expires_at': self.token_expires_at
+                })
+            
+            self.is_authenticated = True
+            return True
+    
+    async def _refresh_shared_tokens(self, stale_token: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Tokens from the shared state, refreshed by at most one process at a time
+        
+        Shared tokens are stored until they enter the refresh margin, so any
+        token found there is still good to use, unless it is the very token
+        being replaced (e.g. after a 401).
+        """
+        key = f'{self.state_key}:tokens'
+        shared = await self.shared_state.get(key)
+        if shared and shared.get('access_token') == stale_token:
+            await self.shared_state.delete(key, shared)
+        
+        def keep_for(tokens: Dict[str, Any]) -> Optional[float]:
+            if tokens.get('expires_at') is None:
+                return None
+            return max(1.0, tokens['expires_at'] - TOKEN_REFRESH_MARGIN_SECONDS - time.time())
+        
+        return await load_once(self.shared_state, key, self._request_tokens, keep_for)
+    
+    async def _request_tokens(self) -> Optional[Dict[str, Any]]:
+        """
+        Exchange the refresh token for new tokens
+        
+        Returns:
+            access_token, refresh_token and expires_at (epoch seconds), or None on failure
+        """
+        async with self._session() as session:
+            data = {
+                'grant_type': 'refresh_token',
+                'refresh_token': self.refresh_token,
+                'client_id': self.client_id,
+                'client_secret': self.client_secret
+            }
+            
+            # Token refreshes never wait behind background syncs
+            with request_priority(INTERACTIVE):
+                async with self.rate_limiter, session.post(
                     f'{self.base_url}/oauth/v1/token',
                     data=data
                 ) as response:
-                    if response.status == 200:
-                        token_data = await response.json()
-                        self.access_token = token_data.get('access_token')
-                        if token_data.get('refresh_token'):
-                            self.refresh_token = token_data.get('refresh_token')
-                        
-                        # Update connection config
-                        self.connection_config['access_token'] = self.access_token
-                        self.connection_config['refresh_token'] = self.refresh_token
-                        
-                        self.is_authenticated = True
-                        return True
+                    self._check_outage(response)
+                    if response.status != 200:
+                        print(f"HubSpot token refresh failed: {response.status}")
+                        return None
+                    token_data = await response.json()
+        
+        expires_in = token_data.get('expires_in')
+        return {
+            'access_token': token_data.get('access_token'),
+            'refresh_token': token_data.get('refresh_token') or self.refresh_token,
+            'expires_at': time.time() + float(expires_in) if expires_in else None
+        }
+    
+    def _since_filter(self, property_name: str, since_date: datetime) -> List[Dict[str, str]]:
+        """Search API filter for records whose date property is after since_date"""
+        # HubSpot uses milliseconds since epoch
+        return [{
+            'propertyName': property_name,
+            'operator': 'GT',
+            'value': str(int(since_date.timestamp() * 1000))
+        }]
+    
+    async def _fetch_page(self,
+                          session: aiohttp.ClientSession,
+                          object_type: str,
+                          properties: List[str],
+                          page_size: int,
+                          after: Optional[str] = None,
+                          filters: Optional[List[Dict[str, str]]] = None,
+                          sorts: Optional[List[Dict[str, str]]] = None,
+                          archived: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[int]]:
+        """
+        Fetch one page of CRM objects, retrying when rate limited
+        
+        Args:
+            session: Open aiohttp session
+            object_type: HubSpot object type (e.g. 'contacts', 'calls', 'deals')
+            properties: Properties to include in each record
+            page_size: Records to request
+            after: Paging cursor from the previous page
+            filters: Search filters; when given (even empty) the search
+                endpoint is used instead of the list endpoint
+            sorts: Search sort order
+            archived: List archived (deleted) records instead (list endpoint only)
+            
+        Returns:
+            Raw records, the cursor of the next page (None on the last page
+            or when the request failed) and the total number of matches
+            (search only)
+        """
+        if filters is not None:
+            url = f'{self.base_url}/crm/v3/objects/{object_type}/search'
+            body = {
+                'filterGroups': [{'filters': filters}] if filters else [],
+                'properties': properties,
+                'limit': page_size
+            }
+            if sorts:
+                body['sorts'] = sorts
+            if after:
+                body['after'] = after
+        else:
+            url = f'{self.base_url}/crm/v3/objects/{object_type}'
+            params = {'limit': page_size}
+            if properties:
+                params['properties'] = ','.join(properties)
+            if archived:
+                params['archived'] = 'true'
+            if after:
+                params['after'] = after
+        
+        refreshed = False
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            if filters is not None:
+                request = functools.partial(session.post, url, headers=self._headers(), json=body)
+                search_limit = self.search_rate_limiter
+            else:
+                request = functools.partial(session.get, url, headers=self._headers(), params=params)
+                search_limit = contextlib.nullcontext()
+            
+            started = time.monotonic()
+            # Built once the limiters are held, so a cancelled wait leaves no request behind
+            async with search_limit, self.rate_limiter, request() as response:
+                if response.status == 200:
+                    data = await response.json()
+                    self._record_response(response, started, paged=True)
+                    next_after = data.get('paging', {}).get('next', {}).get('after')
+                    return data.get('results', []), next_after, data.get('total')
+                
+                self._record_response(response, started)
+                self._check_outage(response)
+                expired_token = response.status == 401 and self.refresh_token and not refreshed
+                if response.status != 429 and not expired_token:
+                    print(f"HubSpot {object_type} page request failed: {response.status}")
+                    return [], None, None
+                retry_after = response.headers.get('Retry-After', '')
+            
+            if expired_token:
+                # Token expired or was revoked early: refresh once, then retry
+                refreshed = True
+                if not await self._refresh_access_token():
+                    return [], None, None
+                continue
+            
+            # Wait outside the limiter so the slot goes to other requests meanwhile
+            await asyncio.sleep(float(retry_after) if retry_after.isdigit() else min(10.0, 0.5 * 2 ** attempt))
+        
+        print(f"HubSpot {object_type} page request still rate limited after {MAX_RATE_LIMIT_RETRIES} retries")
+        return [], None, None
+    
+    def _page_size(self, search: bool) -> int:
+        """Current adaptive page size; search pages may be twice as large as list pages"""
+        if search:
+            return min(SEARCH_PAGE_SIZE, self.controller.page_size * 2)
+        return self.controller.page_size
+    
+    async def _iter_pages(self,
+                          session: aiohttp.ClientSession,
+                          object_type: str,
+                          properties: List[str],
+                          limit: Optional[int] = None,
+                          filters: Optional[List[Dict[str, str]]] = None,
+                          deadline: Optional[Deadline] = None):
+        """
+        Yield pages of raw CRM objects until the end of the list or limit
+        
+        Page size follows the adaptive controller. The next page is requested
+        as soon as its cursor is known, so it downloads while the caller is
+        still processing the current page.
+        
+        Args:
+            session: Open aiohttp session
+            object_type: HubSpot object type
+            properties: Properties to include in each record
+            limit: Maximum number of records in total
+            filters: Search filters (see _fetch_page)
+            deadline: Stop once it passes, recording the cursor to resume
+                from; starts at the cursor it was resumed with
+        """
+        fetched = 0
+        
+        def fetch(after: Optional[str]) -> asyncio.Future:
+            page_size = self._page_size(filters is not None)
+            if limit:
+                page_size = min(page_size, limit - fetched)
+            return asyncio.ensure_future(
+                self._fetch_page(session, object_type, properties, page_size, after, filters)
+            )
+        
+        pending_after = deadline.resume_from.get(object_type) if deadline else None
+        pending = fetch(pending_after)
+        try:
+            while pending:
+                if deadline:
+                    done, _ = await asyncio.wait({pending}, timeout=deadline.remaining())
+                    if not done:
+                        deadline.stop(object_type, pending_after)
+                        return
+                
+                records, after, _ = await pending
+                pending = None
+                if limit:
+                    records = records[:limit - fetched]
+                fetched += len(records)
+                
+                if after and not (limit and fetched >= limit):
+                    if deadline and deadline.expired():
+                        deadline.stop(object_type, after)
                     else:
-                        return False
-                        
-        except Exception as e:
-            print(f"Token refresh error: {e}")
-            return False
+                        pending, pending_after = fetch(after), after
+                if records:
+                    yield records
+        finally:
+            if pending:
+                pending.cancel()
+                pending.add_done_callback(lambda future: future.cancelled() or future.exception())
+    
+    async def _id_bounds(self,
+                         session: aiohttp.ClientSession,
+                         object_type: str,
+                         filters: List[Dict[str, str]]) -> Optional[Tuple[int, int, int]]:
+        """
+        Get the lowest and highest hs_object_id matching filters, and the match count
+        
+        Returns:
+            (lowest id, highest id, total) or None if nothing matches
+            
+        Raises:
+            RuntimeError: If a request failed
+        """
+        bounds = []
+        total = None
+        for direction in ('ASCENDING', 'DESCENDING'):
+            records, _, total = await self._fetch_page(
+                session, object_type, [], 1, filters=filters,
+                sorts=[{'propertyName': 'hs_object_id', 'direction': direction}]
+            )
+            if total is None:
+                # Never mistake a failed request for an empty object type
+                raise RuntimeError(f"Could not get HubSpot {object_type} ID bounds")
+            if not records:
+                return None
+            bounds.append(int(records[0]['id']))
+        return bounds[0], bounds[1], total or 0
+    
+    async def _iter_partitioned(self,
+                                session: aiohttp.ClientSession,
+                                object_type: str,
+                                properties: List[str],
+                                filters: Optional[List[Dict[str, str]]] = None):
+        """
+        Yield pages of raw CRM objects, fetching disjoint hs_object_id ranges concurrently
+        
+        Cursor pages of one list are inherently serial; splitting the ID space
+        into self.partitions ranges (searched in parallel) lets a full fetch
+        run that many page requests at once, within the shared limiters. A
+        range whose search would exceed SEARCH_RESULT_CAP is split in half.
+        Records seen twice (e.g. modified mid-fetch) are only yielded once.
+        
+        Args:
+            session: Open aiohttp session
+            object_type: HubSpot object type
+            properties: Properties to include in each record
+            filters: Extra search filters applied to every range
+            
+        Raises:
+            RuntimeError: If a page request failed, rather than ending early
+        """
+        filters = filters or []
+        bounds = await self._id_bounds(session, object_type, filters)
+        if not bounds:
+            return
+        
+        low, high, total = bounds
+        partitions = max(self.partitions, math.ceil(total / SEARCH_RESULT_CAP))
+        if total <= SEARCH_PAGE_SIZE:
+            partitions = 1
+        step = max(1, math.ceil((high + 1 - low) / partitions))
+        
+        ranges = asyncio.Queue()
+        for start in range(low, high + 1, step):
+            ranges.put_nowait((start, min(start + step, high + 1)))
+        # Bounded, so workers pause while the caller is busy with earlier pages
+        pages = asyncio.Queue(maxsize=partitions * 2)
+        
+        async def fetch_range(start: int, end: int):
+            range_filters = self._range_filters(filters, start, end)
+            sorts = [{'propertyName': 'hs_object_id', 'direction': 'ASCENDING'}]
+            records, after, range_total = await self._fetch_page(
+                session, object_type, properties, self._page_size(True), filters=range_filters, sorts=sorts
+            )
+            if range_total is None:
+                raise RuntimeError(f"Could not fetch HubSpot {object_type} {start}-{end}")
+            if range_total > SEARCH_RESULT_CAP and end - start > 1:
+                middle = (start + end) // 2
+                ranges.put_nowait((start, middle))
+                ranges.put_nowait((middle, end))
+                return
+            
+            await pages.put(records)
+            while after:
+                records, after, range_total = await self._fetch_page(
+                    session, object_type, properties, self._page_size(True), after, range_filters, sorts
+                )
+                if range_total is None:
+                    raise RuntimeError(f"Could not fetch HubSpot {object_type} {start}-{end}")
+                await pages.put(records)
+        
+        async def worker():
+            while True:
+                start, end = await ranges.get()
+                try:
+                    await fetch_range(start, end)
+                except Exception as e:
+                    await pages.put(e)
+                finally:
+                    ranges.task_done()
+        
+        async def finish():
+            await ranges.join()
+            await pages.put(None)
+        
+        tasks = [asyncio.ensure_future(worker()) for _ in range(partitions)]
+        tasks.append(asyncio.ensure_future(finish()))
+        seen = set()
+        try:
+            while True:
+                records = await pages.get()
+                if records is None:
+                    break
+                if isinstance(records, Exception):
+                    raise records
+                
+                fresh = [record for record in records if record['id'] not in seen]
+                seen.update(record['id'] for record in fresh)
+                if fresh:
+                    yield fresh
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _range_filters(self, filters: List[Dict[str, str]], start: int, end: int) -> List[Dict[str, str]]:
+        """filters narrowed to records with start <= hs_object_id < end"""
+        return filters + [
+            {'propertyName': 'hs_object_id', 'operator': 'GTE', 'value': str(start)},
+            {'propertyName': 'hs_object_id', 'operator': 'LT', 'value': str(end)}
+        ]
+    
+    async def _iter_id_range(self,
+                             session: aiohttp.ClientSession,
+                             object_type: str,
+                             properties: List[str],
+                             start: int,
+                             end: int,
+                             filters: List[Dict[str, str]]):
+        """
+        Yield pages of raw CRM objects with start <= hs_object_id < end, in ascending ID order
+        
+        The range must match at most SEARCH_RESULT_CAP records (see plan_sync_ranges).
+        
+        Raises:
+            RuntimeError: If a page request failed, rather than ending early
+        """
+        range_filters = self._range_filters(filters, start, end)
+        sorts = [{'propertyName': 'hs_object_id', 'direction': 'ASCENDING'}]
+        after = None
+        while True:
+            records, after, total = await self._fetch_page(
+                session, object_type, properties, self._page_size(True), after, range_filters, sorts
+            )
+            if total is None:
+                raise RuntimeError(f"Could not fetch HubSpot {object_type} {start}-{end}")
+            if records:
+                yield records
+            if not after:
+                return
+    
+    def _pages(self,
+               session: aiohttp.ClientSession,
+               object_type: str,
+               properties: List[str],
+               limit: Optional[int],
+               filters: Optional[List[Dict[str, str]]],
+               partitioned: bool):
+        """
+        Page iterator for a list fetch: partitioned for full fetches when
+        asked, otherwise serial and bounded by the current deadline (if any)
+        """
+        if partitioned and not limit and self.partitions > 1:
+            return self._iter_partitioned(session, object_type, properties, filters)
+        return self._iter_pages(session, object_type, properties, limit, filters, current_deadline())
     
     async def get_leads(self, 
                        limit: Optional[int] = None,
-                       since_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+                       since_date: Optional[datetime] = None,
+                       partitioned: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch contacts (leads) from HubSpot
+        
+        With since_date, only contacts modified after it are fetched (through
+        the search endpoint). With partitioned, a full fetch (no limit) runs
+        as concurrent ID-range searches.
         """
-        if not await self.authenticate():
+        if not await self._ensure_authenticated():
             return []
         
         try:
             leads = []
-            after = None
-            fetched_count = 0
-            batch_limit = min(100, limit if limit else 100)
-            
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    # Build URL with parameters
-                    url = f'{self.base_url}/crm/v3/objects/contacts'
-                    params = {
-                        'limit': batch_limit,
-                        'properties': 'firstname,lastname,email,phone,company,hs_lead_status,hs_analytics_source,createdate,lastmodifieddate'
-                    }
-                    
-                    if after:
-                        params['after'] = after
-                    
-                    if since_date:
-                        # HubSpot uses milliseconds since epoch
-                        timestamp_ms = int(since_date.timestamp() * 1000)
-                        params['filterGroups'] = [{
-                            'filters': [{
-                                'propertyName': 'lastmodifieddate',
-                                'operator': 'GT',
-                                'value': str(timestamp_ms)
-                            }]
-                        }]
-                    
-                    headers = {
-                        'Authorization': f'Bearer {self.access_token}',
-                        'Content-Type': 'application/json'
-                    }
-                    
-                    async with session.get(url, headers=headers, params=params) as response:
-                        if response.status != 200:
-                            break
-                            
-                        data = await response.json()
-                        contacts = data.get('results', [])
-                        
-                        # Normalize and add to results
-                        for contact in contacts:
-                            normalized_lead = self.normalize_lead_data(contact)
-                            leads.append(normalized_lead)
-                            fetched_count += 1
-                            
-                            if limit and fetched_count >= limit:
-                                return leads
-                        
-                        # Check for pagination
-                        paging = data.get('paging', {})
-                        if not paging.get('next'):
-                            break
-                        after = paging['next']['after']
+            filters = self._since_filter('lastmodifieddate', since_date) if since_date else None
+            
+            async with self._session() as session:
+                pages = self._pages(session, 'contacts', CONTACT_PROPERTIES, limit, filters, partitioned)
+                async with contextlib.aclosing(pages):
+                    async for contacts in pages:
+                        leads.extend(await self.normalize_page(normalize_contacts, contacts))
                         
             return leads
             
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
         except Exception as e:
             print(f"Error fetching HubSpot leads: {e}")
             return []
     
     async def get_calls(self,
                        limit: Optional[int] = None,
-                       since_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+                       since_date: Optional[datetime] = None,
+                       partitioned: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch call records from HubSpot
+        
+        With since_date, only calls created after it are fetched (through the
+        search endpoint). With partitioned, a full fetch (no limit) runs as
+        concurrent ID-range searches.
         """
-        if not await self.authenticate():
+        if not await self._ensure_authenticated():
             return []
         
         try:
             calls = []
-            after = None
-            fetched_count = 0
-            batch_limit = min(100, limit if limit else 100)
-            
-            async with aiohttp.ClientSession() as session:
-                while True:
-                    url = f'{self.base_url}/crm/v3/objects/calls'
-                    params = {
-                        'limit': batch_limit,
-                        'properties': 'hs_call_duration,hs_call_direction,hs_call_status,hs_call_body,createdate,hs_call_recording_url'
-                    }
-                    
-                    if after:
-                        params['after'] = after
-                    
-                    if since_date:
-                        timestamp_ms = int(since_date.timestamp() * 1000)
-                        params['filterGroups'] = [{
-                            'filters': [{
-                                'propertyName': 'createdate',
-                                'operator': 'GT',
-                                'value': str(timestamp_ms)
-                            }]
-                        }]
-                    
-                    headers = {
-                        'Authorization': f'Bearer {self.access_token}',
-                        'Content-Type': 'application/json'
-                    }
-                    
-                    async with session.get(url, headers=headers, params=params) as response:
-                        if response.status != 200:
-                            break
-                            
-                        data = await response.json()
-                        call_records = data.get('results', [])
-                        
-                        for call in call_records:
-                            # Get associated contact for this call
-                            contact_id = await self._get_call_contact_id(session, call['id'])
-                            
-                            normalized_call = self.normalize_call_data(call)
-                            normalized_call['lead_external_id'] = contact_id
-                            calls.append(normalized_call)
-                            fetched_count += 1
-                            
-                            if limit and fetched_count >= limit:
-                                return calls
-                        
-                        paging = data.get('paging', {})
-                        if not paging.get('next'):
-                            break
-                        after = paging['next']['after']
+            filters = self._since_filter('createdate', since_date) if since_date else None
+            
+            async with self._session() as session:
+                pages = self._pages(session, 'calls', CALL_PROPERTIES, limit, filters, partitioned)
+                async with contextlib.aclosing(pages):
+                    async for call_records in pages:
+                        calls.extend(await self._normalize_call_page(session, call_records))
                         
             return calls
             
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
         except Exception as e:
             print(f"Error fetching HubSpot calls: {e}")
             return []
     
-    async def _get_call_contact_id(self, session: aiohttp.ClientSession, call_id: str) -> Optional[str]:
+    async def _normalize_call_page(self,
+                                   session: aiohttp.ClientSession,
+                                   call_records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalize a page of calls, with their associated contacts resolved for the whole page at once"""
+        contact_ids = await self._get_calls_contact_ids(session, [call['id'] for call in call_records])
+        return await self.normalize_page(functools.partial(normalize_calls, contact_ids=contact_ids), call_records)
+    
+    async def _get_calls_contact_ids(self,
+                                     session: aiohttp.ClientSession,
+                                     call_ids: List[str]) -> Dict[str, Optional[str]]:
         """
-        Get the contact ID associated with a call
+        Get the contact IDs associated with a set of calls
+        
+        Uses the associations batch endpoint so a page of calls costs one
+        request per BATCH_READ_SIZE calls instead of one request per call.
+        """
+        chunks = [call_ids[i:i + BATCH_READ_SIZE] for i in range(0, len(call_ids), BATCH_READ_SIZE)]
+        results = await asyncio.gather(*(
+            self._get_calls_contact_ids_chunk(session, chunk) for chunk in chunks
+        ))
+        
+        contact_ids = {}
+        for chunk_result in results:
+            contact_ids.update(chunk_result)
+        return contact_ids
+    
+    async def _get_calls_contact_ids_chunk(self,
+                                           session: aiohttp.ClientSession,
+                                           call_ids: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve contact associations for up to BATCH_READ_SIZE calls
         """
         try:
-            url = f'{self.base_url}/crm/v3/objects/calls/{call_id}/associations/contact'
-            headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            }
+            url = f'{self.base_url}/crm/v3/associations/calls/contacts/batch/read'
+            body = {'inputs': [{'id': call_id} for call_id in call_ids]}
             
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    results = data.get('results', [])
-                    if results:
-                        return results[0].get('id')
-            return None
+            started = time.monotonic()
+            async with self.rate_limiter, session.post(url, headers=self._headers(), json=body) as response:
+                self._record_response(response, started)
+                self._check_outage(response)
+                if response.status not in (200, 207):
+                    return {}
+                data = await response.json()
             
+            contact_ids = {}
+            for result in data.get('results', []):
+                to = result.get('to', [])
+                if to:
+                    contact_ids[str(result.get('from', {}).get('id'))] = to[0].get('id')
+            return contact_ids
+            
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
         except Exception:
-            return None
+            return {}
+    
+    async def get_deals(self,
+                        limit: Optional[int] = None,
+                        since_date: Optional[datetime] = None,
+                        partitioned: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch deals from HubSpot
+        
+        With since_date, only deals created after it are fetched (through the
+        search endpoint). With partitioned, a full fetch (no limit) runs as
+        concurrent ID-range searches.
+        """
+        if not await self._ensure_authenticated():
+            return []
+        
+        try:
+            deals = []
+            filters = self._since_filter('createdate', since_date) if since_date else None
+            
+            async with self._session() as session:
+                pages = self._pages(session, 'deals', DEAL_PROPERTIES, limit, filters, partitioned)
+                async with contextlib.aclosing(pages):
+                    async for deal_records in pages:
+                        deals.extend(await self.normalize_page(normalize_deals, deal_records))
+            
+            return deals
+            
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
+        except Exception as e:
+            print(f"Error fetching HubSpot deals: {e}")
+            return []
     
     async def get_budget_info(self, 
                              lead_ids: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get budget/deal information from HubSpot
         """
-        if not await self.authenticate():
+        if not await self._ensure_authenticated():
             return {}
         
         try:
@@ -276,30 +1036,10 @@ class HubSpotMCP(BaseMCP):
                 'monthly_recurring_revenue': 0
             }
             
-            async with aiohttp.ClientSession() as session:
-                url = f'{self.base_url}/crm/v3/objects/deals'
-                params = {
-                    'limit': 100,
-                    'properties': 'amount,dealstage,closedate,dealname,createdate,hs_deal_stage_probability'
-                }
-                
-                headers = {
-                    'Authorization': f'Bearer {self.access_token}',
-                    'Content-Type': 'application/json'
-                }
-                
-                after = None
-                while True:
-                    if after:
-                        params['after'] = after
-                    
-                    async with session.get(url, headers=headers, params=params) as response:
-                        if response.status != 200:
-                            break
-                            
-                        data = await response.json()
-                        deals = data.get('results', [])
-                        
+            async with self._session() as session:
+                pages = self._iter_pages(session, 'deals', DEAL_PROPERTIES)
+                async with contextlib.aclosing(pages):
+                    async for deals in pages:
                         for deal in deals:
                             props = deal.get('properties', {})
                             amount = float(props.get('amount', 0) or 0)
@@ -321,11 +1061,6 @@ class HubSpotMCP(BaseMCP):
                                 }
                             budget_info['deals_by_stage'][stage]['count'] += 1
                             budget_info['deals_by_stage'][stage]['total_value'] += amount
-                        
-                        paging = data.get('paging', {})
-                        if not paging.get('next'):
-                            break
-                        after = paging['next']['after']
                 
                 # Calculate averages
                 total_deals = sum(stage['count'] for stage in budget_info['deals_by_stage'].values())
@@ -336,91 +1071,450 @@ class HubSpotMCP(BaseMCP):
                 
                 return budget_info
                 
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
         except Exception as e:
             print(f"Error fetching HubSpot budget info: {e}")
             return {}
     
-    async def sync_to_database(self, db: Session) -> Dict[str, int]:
+    async def get_leads_by_ids(self, lead_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch specific contacts (leads) from HubSpot by ID
+        """
+        if not await self._ensure_authenticated():
+            return []
+        
+        try:
+            async with self._session() as session:
+                contacts = await self._batch_read(session, 'contacts', lead_ids, CONTACT_PROPERTIES)
+            return await self.normalize_page(normalize_contacts, contacts)
+            
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
+        except Exception as e:
+            print(f"Error fetching HubSpot leads by ID: {e}")
+            return []
+    
+    async def get_calls_by_ids(self, call_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch specific call records from HubSpot by ID
+        """
+        if not await self._ensure_authenticated():
+            return []
+        
+        try:
+            async with self._session() as session:
+                call_records = await self._batch_read(session, 'calls', call_ids, CALL_PROPERTIES)
+                return await self._normalize_call_page(session, call_records)
+            
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
+        except Exception as e:
+            print(f"Error fetching HubSpot calls by ID: {e}")
+            return []
+    
+    async def get_deals_by_ids(self, deal_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch specific deals from HubSpot by ID
+        """
+        if not await self._ensure_authenticated():
+            return []
+        
+        try:
+            async with self._session() as session:
+                deals = await self._batch_read(session, 'deals', deal_ids, DEAL_PROPERTIES)
+            return await self.normalize_page(normalize_deals, deals)
+            
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
+        except Exception as e:
+            print(f"Error fetching HubSpot deals by ID: {e}")
+            return []
+    
+    async def _batch_read(self,
+                          session: aiohttp.ClientSession,
+                          object_type: str,
+                          object_ids: List[str],
+                          properties: List[str]) -> List[Dict[str, Any]]:
+        """
+        Read CRM objects by ID through the batch read endpoint
+        
+        IDs are de-duplicated and split into chunks of BATCH_READ_SIZE. The
+        chunks are requested concurrently; the shared rate limiter keeps the
+        fan-out inside the portal's request budget.
+        
+        Args:
+            session: Open aiohttp session
+            object_type: HubSpot object type (e.g. 'contacts', 'calls', 'deals')
+            object_ids: IDs to read
+            properties: Properties to include in each record
+            
+        Returns:
+            Raw HubSpot records that were found, in request order
+        """
+        unique_ids = [str(object_id) for object_id in dict.fromkeys(object_ids) if object_id]
+        chunks = [unique_ids[i:i + BATCH_READ_SIZE] for i in range(0, len(unique_ids), BATCH_READ_SIZE)]
+        
+        results = await asyncio.gather(*(
+            self._batch_read_chunk(session, object_type, chunk, properties) for chunk in chunks
+        ))
+        
+        records = {}
+        for chunk_records in results:
+            for record in chunk_records:
+                records[str(record.get('id'))] = record
+        
+        return [records[object_id] for object_id in unique_ids if object_id in records]
+    
+    async def _batch_read_chunk(self,
+                                session: aiohttp.ClientSession,
+                                object_type: str,
+                                object_ids: List[str],
+                                properties: List[str]) -> List[Dict[str, Any]]:
+        """
+        Read up to BATCH_READ_SIZE objects in a single request
+        """
+        url = f'{self.base_url}/crm/v3/objects/{object_type}/batch/read'
+        body = {
+            'properties': properties,
+            'inputs': [{'id': object_id} for object_id in object_ids]
+        }
+        
+        started = time.monotonic()
+        async with self.rate_limiter, session.post(url, headers=self._headers(), json=body) as response:
+            # 207 means some IDs were not found; the rest are still returned
+            self._record_response(response, started)
+            self._check_outage(response)
+            if response.status not in (200, 207):
+                print(f"HubSpot batch read of {object_type} failed: {response.status}")
+                return []
+            data = await response.json()
+        
+        return data.get('results', [])
+    
+    async def sync_to_database(self, db: AsyncSession) -> Dict[str, int]:
         """
         Sync all HubSpot data to database
+        
+        Runs at background priority, so interactive reads made meanwhile are
+        served ahead of the sync's page requests. Each object type is
+        fetched as sync_partitions concurrent ID ranges and streamed through
+        self.sync_pipeline into the local store (and its search index), so
+        only a bounded number of pages is ever held in memory.
+        
+        Args:
+            db: Database session (None to fetch and count without storing)
         """
+        if not await self._ensure_authenticated():
+            return {'error': 'Not authenticated with HubSpot'}
+        
         try:
-            # This would integrate with your database models
-            # For now, return mock sync stats
-            leads = await self.get_leads()
-            calls = await self.get_calls()
+            counts = {}
+            with request_priority(BACKGROUND):
+                async with self._session() as session:
+                    for name, (object_type, properties, _) in SYNC_OBJECTS.items():
+                        normalize, write = self._sync_stages(session, db, name)
+                        pages = self._pages(session, object_type, properties, None, None, partitioned=True)
+                        counts[name] = await self.sync_pipeline.run(pages, normalize, write)
             
             self.last_sync = datetime.now()
             
             return {
-                'leads': len(leads),
-                'calls': len(calls),
+                **counts,
                 'timestamp': self.last_sync.isoformat()
             }
             
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
         except Exception as e:
             print(f"Error syncing HubSpot data: {e}")
             return {'error': str(e)}
     
-    def normalize_lead_data(self, raw_lead: Dict[str, Any]) -> Dict[str, Any]:
+    def _sync_stages(self,
+                     session: aiohttp.ClientSession,
+                     db: Optional[AsyncSession],
+                     name: str) -> Tuple[Callable, Optional[Callable]]:
+        """Page normalizer and batch writer (None without a database) for syncing an object type"""
+        normalize, upsert = {
+            'leads': (functools.partial(self.normalize_page, normalize_contacts), local_store.upsert_leads),
+            'calls': (functools.partial(self._normalize_call_page, session), local_store.upsert_calls),
+            'deals': (functools.partial(self.normalize_page, normalize_deals), local_store.upsert_deals),
+        }[name]
+        if db is None:
+            return normalize, None
+        return normalize, functools.partial(upsert, db, self.store_tenant, self.get_platform_name().lower())
+    
+    async def plan_sync_ranges(self,
+                               name: str,
+                               shards: int,
+                               since_date: Optional[datetime] = None) -> List[Tuple[int, int]]:
         """
-        Normalize HubSpot contact data to our platform format
+        Split an object type's hs_object_id space into ranges for a sharded sync
+        
+        Ranges that would match more than SEARCH_RESULT_CAP records are
+        split further, so each range can be fetched with sync_id_range.
+        Ranges without records are left out.
+        
+        Args:
+            name: Object type, a key of SYNC_OBJECTS
+            shards: Number of ranges to aim for
+            since_date: Only count records changed after it
+            
+        Returns:
+            (start, end) ID ranges (end exclusive) in ascending order
+            
+        Raises:
+            RuntimeError: If not authenticated or a request failed
         """
-        props = raw_lead.get('properties', {})
+        if not await self._ensure_authenticated():
+            raise RuntimeError("Not authenticated with HubSpot")
         
-        # Combine first and last name
-        first_name = props.get('firstname', '') or ''
-        last_name = props.get('lastname', '') or ''
-        name = f"{first_name} {last_name}".strip() or props.get('email', 'Unknown')
+        object_type, _, since_property = SYNC_OBJECTS[name]
+        filters = self._since_filter(since_property, since_date) if since_date else []
         
-        return {
-            'external_id': raw_lead.get('id'),
-            'name': name,
-            'email': props.get('email'),
-            'phone': props.get('phone'),
-            'company': props.get('company'),
-            'status': props.get('hs_lead_status', 'new'),
-            'source': props.get('hs_analytics_source', 'unknown'),
-            'created_at': self._parse_hubspot_date(props.get('createdate')),
-            'updated_at': self._parse_hubspot_date(props.get('lastmodifieddate')),
-            'raw_data': raw_lead
-        }
+        with request_priority(BACKGROUND):
+            async with self._session() as session:
+                bounds = await self._id_bounds(session, object_type, filters)
+                if not bounds:
+                    return []
+                
+                low, high, total = bounds
+                shards = max(1, shards, math.ceil(total / SEARCH_RESULT_CAP))
+                step = max(1, math.ceil((high + 1 - low) / shards))
+                pending = [(start, min(start + step, high + 1)) for start in range(low, high + 1, step)]
+                
+                ranges = []
+                while pending:
+                    start, end = pending.pop()
+                    _, _, count = await self._fetch_page(
+                        session, object_type, [], 1, filters=self._range_filters(filters, start, end)
+                    )
+                    if count is None:
+                        # Never mistake a failed request for an empty range
+                        raise RuntimeError(f"Could not count HubSpot {object_type} {start}-{end}")
+                    if count > SEARCH_RESULT_CAP and end - start > 1:
+                        middle = (start + end) // 2
+                        pending.extend([(start, middle), (middle, end)])
+                    elif count:
+                        ranges.append((start, end))
+        return sorted(ranges)
     
-    def normalize_call_data(self, raw_call: Dict[str, Any]) -> Dict[str, Any]:
+    async def sync_id_range(self,
+                            db: Optional[AsyncSession],
+                            name: str,
+                            start: int,
+                            end: int,
+                            since_date: Optional[datetime] = None,
+                            on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None) -> int:
         """
-        Normalize HubSpot call data to our platform format
+        Sync the records of one object type with start <= hs_object_id < end
+        
+        Records go through self.sync_pipeline in ascending ID order. After
+        each batch is written, on_progress(next_start, records) is awaited:
+        everything below next_start is stored, so an interrupted sync can
+        resume from there. Unlike sync_to_database, errors are raised.
+        
+        Args:
+            db: Database session (None to fetch and count without storing)
+            name: Object type, a key of SYNC_OBJECTS
+            start: Lowest ID to sync
+            end: ID to stop before
+            since_date: Only sync records changed after it
+            on_progress: Coroutine function called after each written batch
+            
+        Returns:
+            Number of records synced
         """
-        props = raw_call.get('properties', {})
+        if not await self._ensure_authenticated():
+            raise RuntimeError("Not authenticated with HubSpot")
         
-        return {
-            'external_id': raw_call.get('id'),
-            'lead_external_id': None,  # Will be set by caller
-            'direction': props.get('hs_call_direction', 'outbound'),
-            'duration': int(props.get('hs_call_duration', 0) or 0),
-            'outcome': props.get('hs_call_status', 'completed'),
-            'notes': props.get('hs_call_body', ''),
-            'recording_url': props.get('hs_call_recording_url'),
-            'created_at': self._parse_hubspot_date(props.get('createdate')),
-            'raw_data': raw_call
-        }
+        object_type, properties, since_property = SYNC_OBJECTS[name]
+        filters = self._since_filter(since_property, since_date) if since_date else []
+        
+        with request_priority(BACKGROUND):
+            async with self._session() as session:
+                normalize, write = self._sync_stages(session, db, name)
+                
+                async def write_batch(records: List[Dict[str, Any]]):
+                    if write:
+                        await write(records)
+                    if on_progress:
+                        await on_progress(int(records[-1]['external_id']) + 1, len(records))
+                
+                pages = self._iter_id_range(session, object_type, properties, start, end, filters)
+                return await self.sync_pipeline.run(pages, normalize, write_batch)
     
-    def _parse_hubspot_date(self, date_str: Any) -> Optional[datetime]:
+    async def reconcile_deletions(self, db: AsyncSession, names: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        Parse HubSpot date format (milliseconds since epoch)
+        Remove records deleted or archived in HubSpot from the local store
+        
+        Fetches IDs only, never full records:
+        1. Archived records (the list endpoint with archived=true) that are
+           stored locally are deleted right away.
+        2. The remaining stored IDs are split into ranges of
+           RECONCILE_RANGE_SIZE. Each range's digest is compared with
+           HubSpot's: a range's count costs one search request, so that is
+           compared first, and matching ranges are done. Differing ranges
+           are halved until they hold RECONCILE_LEAF_SIZE IDs or fewer;
+           those are listed (one request) and their ID digests compared,
+           and stored IDs HubSpot no longer has are deleted.
+        
+        Records created in HubSpot since the last sync aren't stored yet;
+        one of them can hide a deletion in the same range until it is
+        synced, after which the counts differ and the next pass finds it.
+        
+        Only the records of this connection's tenant are compared and
+        deleted; other portals' records in the same store are left alone.
+        
+        Args:
+            db: Database session
+            names: Object types to reconcile (keys of SYNC_OBJECTS; all by default)
+            
+        Returns:
+            Per object type: IDs stored, archived and vanished records found,
+            records deleted and ranges compared/listed
         """
-        if not date_str:
-            return None
+        if not await self._ensure_authenticated():
+            return {'error': 'Not authenticated with HubSpot'}
+        
+        platform = self.get_platform_name().lower()
+        try:
+            results = {}
+            with request_priority(BACKGROUND):
+                async with self._session() as session:
+                    for name in names or SYNC_OBJECTS:
+                        results[name] = await self._reconcile_object(session, db, platform, name)
+            return results
             
+        except MCPConnectionError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise MCPConnectionError(f"HubSpot unreachable: {e}") from e
+        except Exception as e:
+            print(f"Error reconciling HubSpot deletions: {e}")
+            return {'error': str(e)}
+    
+    async def _reconcile_object(self,
+                                session: aiohttp.ClientSession,
+                                db: AsyncSession,
+                                platform: str,
+                                name: str) -> Dict[str, int]:
+        """Reconcile the stored records of one object type (see reconcile_deletions)"""
+        object_type = SYNC_OBJECTS[name][0]
+        stored = sorted(
+            int(external_id) for external_id in await local_store.list_external_ids(db, name, self.store_tenant, platform)
+            if external_id.isdigit()
+        )
+        stats = {'stored': len(stored), 'archived': 0, 'vanished': 0, 'ranges_compared': 0, 'ranges_listed': 0}
+        if not stored:
+            stats['deleted'] = 0
+            return stats
+        
+        archived = await self._archived_ids(session, object_type)
+        tombstones = [record_id for record_id in stored if record_id in archived]
+        live = [record_id for record_id in stored if record_id not in archived]
+        stats['archived'] = len(tombstones)
+        
+        async def vanished(start: int, end: int, ids: List[int]) -> List[int]:
+            """Stored IDs in [start, end) that HubSpot no longer has"""
+            stats['ranges_compared'] += 1
+            if await self._count_range(session, object_type, start, end) == len(ids):
+                return []
+            if len(ids) <= RECONCILE_LEAF_SIZE:
+                stats['ranges_listed'] += 1
+                remote = await self._list_range_ids(session, object_type, start, end)
+                if id_digest(remote) == id_digest(ids):
+                    return []
+                remote = set(remote)
+                return [record_id for record_id in ids if record_id not in remote]
+            middle = len(ids) // 2
+            lower, upper = await asyncio.gather(
+                vanished(start, ids[middle], ids[:middle]),
+                vanished(ids[middle], end, ids[middle:])
+            )
+            return lower + upper
+        
+        # Contiguous ranges from the lowest to the highest stored ID
+        chunks = [live[i:i + RECONCILE_RANGE_SIZE] for i in range(0, len(live), RECONCILE_RANGE_SIZE)]
+        bounds = [chunk[0] for chunk in chunks[1:]] + [live[-1] + 1] if live else []
+        checks = [asyncio.ensure_future(vanished(chunk[0], end, chunk)) for chunk, end in zip(chunks, bounds)]
         try:
-            if isinstance(date_str, str) and date_str.isdigit():
-                timestamp_ms = int(date_str)
-                return datetime.fromtimestamp(timestamp_ms / 1000)
-            elif isinstance(date_str, (int, float)):
-                return datetime.fromtimestamp(date_str / 1000)
-            else:
-                return super()._parse_date(date_str)
-        except (ValueError, OSError):
-            return None
+            results = await asyncio.gather(*checks)
+        except BaseException:
+            # One failed check fails the pass; don't leave the others running
+            for check in checks:
+                check.cancel()
+            raise
+        gone = [record_id for result in results for record_id in result]
+        stats['vanished'] = len(gone)
+        
+        to_delete = [str(record_id) for record_id in tombstones + gone]
+        stats['deleted'] = await local_store.delete_records(db, name, self.store_tenant, platform, to_delete) if db is not None else 0
+        return stats
+    
+    async def _archived_ids(self, session: aiohttp.ClientSession, object_type: str) -> set:
+        """IDs of all archived records of an object type"""
+        ids = set()
+        after = None
+        while True:
+            records, after, _ = await self._fetch_page(
+                session, object_type, [], self._page_size(False), after, archived=True
+            )
+            ids.update(int(record['id']) for record in records)
+            if not after:
+                return ids
+    
+    async def _count_range(self, session: aiohttp.ClientSession, object_type: str, start: int, end: int) -> int:
+        """Number of (unarchived) records with start <= hs_object_id < end"""
+        _, _, total = await self._fetch_page(session, object_type, [], 1, filters=self._range_filters([], start, end))
+        if total is None:
+            # Never mistake a failed request for an empty range
+            raise RuntimeError(f"Could not count HubSpot {object_type} {start}-{end}")
+        return total
+    
+    async def _list_range_ids(self, session: aiohttp.ClientSession, object_type: str, start: int, end: int) -> List[int]:
+        """IDs of all (unarchived) records with start <= hs_object_id < end"""
+        range_filters = self._range_filters([], start, end)
+        sorts = [{'propertyName': 'hs_object_id', 'direction': 'ASCENDING'}]
+        ids = []
+        after = None
+        while True:
+            records, after, total = await self._fetch_page(
+                session, object_type, [], SEARCH_PAGE_SIZE, after, range_filters, sorts
+            )
+            if total is None:
+                raise RuntimeError(f"Could not list HubSpot {object_type} {start}-{end}")
+            ids.extend(int(record['id']) for record in records)
+            if not after:
+                return ids
+    
+    def normalize_lead_data(self, raw_lead: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize HubSpot contact data to our platform format
+        """
+        return normalize_contacts([raw_lead])[0]
+    
+    def normalize_call_data(self, raw_call: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize HubSpot call data to our platform format
+        """
+        return normalize_calls([raw_call])[0]
+    
+    def normalize_deal_data(self, raw_deal: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize HubSpot deal data to our platform format
+        """
+        return normalize_deals([raw_deal])[0]
     
     def get_platform_name(self) -> str:
         return "HubSpot" 
\ No newline at end of file
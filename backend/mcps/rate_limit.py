@@ -0,0 +1,347 @@
+import asyncio
+import contextvars
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+# Priority classes and their weights in the fair share of request slots
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+PRIORITY_WEIGHTS = {INTERACTIVE: 4, BACKGROUND: 1}
+
+_request_priority = contextvars.ContextVar('mcp_request_priority', default=INTERACTIVE)
+
+@contextmanager
+def request_priority(priority: str):
+    """
+    Run the enclosed MCP calls in a priority class
+
+    The class is carried in a context variable, so it also applies to tasks
+    spawned inside the block (gathered batch chunks, association lookups).
+    Requests default to INTERACTIVE.
+
+    Args:
+        priority: INTERACTIVE or BACKGROUND
+    """
+    if priority not in PRIORITY_WEIGHTS:
+        raise ValueError(f"Unknown request priority '{priority}'")
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+def current_priority() -> str:
+    return _request_priority.get()
+
+
+class RateLimiter:
+    """
+    Shared outbound request budget for a CRM connection
+
+    Combines a sliding-window request budget (e.g. HubSpot's 100 requests
+    per 10 seconds for private apps) with a cap on in-flight requests.
+    Every HTTP call an MCP makes should run inside ``async with limiter:``
+    so that concurrent work (batch chunks, pagination, associations) shares
+    one budget instead of tripping 429s.
+
+    Waiting requests are granted slots by priority class:
+    - classes share slots by weight (PRIORITY_WEIGHTS), so background work
+      keeps making progress under sustained interactive load
+    - a fraction of the window and of the concurrency (interactive_reserve)
+      is only usable by interactive requests, so a running sync can't use
+      up the whole budget
+    - with preempt_background, queued background requests (e.g. the next
+      sync page) are held back while any interactive request is waiting
+
+    With a scheduler, a request that got a slot here also waits for the
+    tenant's fair share of the process-wide cap (see TenantScheduler).
+
+    With a shared state backend, every request is also counted in a
+    fixed window shared by all worker processes (under shared_key), so N
+    workers stay within one max_requests budget together.
+    """
+
+    def __init__(self,
+                 max_requests: int = 100,
+                 interval: float = 10.0,
+                 max_concurrency: int = 10,
+                 interactive_reserve: float = 0.2,
+                 preempt_background: bool = True,
+                 tenant: Optional[str] = None,
+                 scheduler: Optional['TenantScheduler'] = None,
+                 shared=None,
+                 shared_key: str = 'rate_limit'):
+        """
+        Args:
+            max_requests: Requests allowed per sliding window
+            interval: Window length in seconds
+            max_concurrency: Maximum number of requests in flight at once
+            interactive_reserve: Share (0-1) of the window and concurrency
+                background requests can't use
+            preempt_background: Hold back background requests while
+                interactive ones are queued
+            tenant: Tenant the requests are made for
+            scheduler: Cross-tenant scheduler to take a slot from as well
+            shared: StateBackend holding the cross-process request counters
+            shared_key: Key prefix of this budget's counters in the backend
+        """
+        self.max_requests = max_requests
+        self.interval = interval
+        self.interactive_reserve = interactive_reserve
+        self.preempt_background = preempt_background
+        self.tenant = tenant
+        self.scheduler = scheduler
+        self.shared = shared
+        self.shared_key = shared_key
+        self._timestamps = deque()
+        self._in_flight = 0
+        self._waiters: Dict[str, deque] = {priority: deque() for priority in PRIORITY_WEIGHTS}
+        # Stride scheduling: the class with the lowest pass value goes next
+        self._pass: Dict[str, float] = {priority: 0.0 for priority in PRIORITY_WEIGHTS}
+        self._virtual_time = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.granted: Dict[str, int] = {priority: 0 for priority in PRIORITY_WEIGHTS}
+        self.set_max_concurrency(max_concurrency)
+
+    async def acquire(self, priority: Optional[str] = None):
+        """
+        Wait for a concurrency slot and a free spot in the request window
+
+        Args:
+            priority: Priority class (defaults to the one set by request_priority())
+        """
+        priority = priority or current_priority()
+        waiters = self._waiters[priority]
+
+        if not any(self._waiters.values()) and self._can_admit(priority):
+            self._admit(priority)
+            return
+
+        if not waiters:
+            # Don't let a class bank credit while it had nothing queued
+            self._pass[priority] = max(self._pass[priority], self._virtual_time)
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                if future in waiters:
+                    waiters.remove(future)
+                self._dispatch()
+            else:
+                # Granted just as we were cancelled; hand the slot back
+                self.release()
+            raise
+
+    def release(self):
+        """Give back the concurrency slot taken by acquire()"""
+        self._in_flight -= 1
+        self._dispatch()
+
+    def set_max_concurrency(self, max_concurrency: int):
+        """
+        Change the in-flight cap, e.g. from an adaptive controller
+
+        Lowering it never interrupts requests already in flight; new ones
+        just wait until the count drops below the new cap.
+        """
+        self.max_concurrency = max_concurrency
+        self._limits = {
+            INTERACTIVE: (max_concurrency, self.max_requests),
+            BACKGROUND: (
+                max(1, max_concurrency - int(max_concurrency * self.interactive_reserve)),
+                max(1, self.max_requests - int(self.max_requests * self.interactive_reserve))
+            )
+        }
+        if any(self._waiters.values()):
+            self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load, queue lengths and grants per priority class"""
+        self._expire()
+        return {
+            'in_flight': self._in_flight,
+            'max_concurrency': self.max_concurrency,
+            'window_used': len(self._timestamps),
+            'window_limit': self.max_requests,
+            'queued': {priority: len(waiters) for priority, waiters in self._waiters.items()},
+            'granted': dict(self.granted)
+        }
+
+    async def _reserve_shared(self):
+        """Count a request in the cross-process window, waiting for the next window when it's full"""
+        while True:
+            window = int(time.time() // self.interval)
+            used = await self.shared.incr(f'{self.shared_key}:{window}', ttl=self.interval * 2)
+            if used <= self.max_requests:
+                return
+            await asyncio.sleep(max(0.0, (window + 1) * self.interval - time.time()))
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._timestamps and now - self._timestamps[0] >= self.interval:
+            self._timestamps.popleft()
+
+    def _can_admit(self, priority: str) -> bool:
+        self._expire()
+        max_in_flight, max_window = self._limits[priority]
+        return self._in_flight < max_in_flight and len(self._timestamps) < max_window
+
+    def _admit(self, priority: str):
+        self._in_flight += 1
+        self._timestamps.append(time.monotonic())
+        self._virtual_time = max(self._virtual_time, self._pass[priority])
+        self._pass[priority] += 1 / PRIORITY_WEIGHTS[priority]
+        self.granted[priority] += 1
+
+    def _dispatch(self):
+        """Grant freed slots to queued requests, in weighted fair order"""
+        while True:
+            for waiters in self._waiters.values():
+                while waiters and waiters[0].done():
+                    waiters.popleft()
+
+            interactive_waiting = bool(self._waiters[INTERACTIVE])
+            candidates = [
+                priority for priority, waiters in self._waiters.items()
+                if waiters
+                and self._can_admit(priority)
+                and not (priority == BACKGROUND and self.preempt_background and interactive_waiting)
+            ]
+            if not candidates:
+                break
+
+            priority = min(candidates, key=lambda p: self._pass[p])
+            self._waiters[priority].popleft().set_result(None)
+            self._admit(priority)
+
+        if any(self._waiters.values()) and self._timestamps and self._timer is None:
+            # Blocked (at least partly) by the window: retry when its oldest entry expires
+            delay = max(0.0, self.interval - (time.monotonic() - self._timestamps[0]))
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    async def __aenter__(self):
+        await self.acquire()
+        if self.scheduler:
+            try:
+                await self.scheduler.acquire(self.tenant)
+            except BaseException:
+                self.release()
+                raise
+        if self.shared:
+            try:
+                await self._reserve_shared()
+            except BaseException:
+                await self.__aexit__(None, None, None)
+                raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.scheduler:
+            self.scheduler.release(self.tenant)
+        self.release()
+
+
+class TenantScheduler:
+    """
+    Process-wide cap on outbound requests, shared fairly between tenants
+
+    Each tenant (HubSpot portal) has its own RateLimiter for its own API
+    budget, but all of them share this process's connections and event
+    loop. When the cap is reached, a freed slot goes to the waiting tenant
+    with the fewest requests in flight (oldest waiter on ties), so a large
+    portal's sync holding many slots can't starve smaller tenants.
+    """
+
+    def __init__(self, max_concurrency: int = 20):
+        """
+        Args:
+            max_concurrency: Maximum requests in flight across all tenants
+        """
+        self.max_concurrency = max_concurrency
+        self._in_flight: Dict[str, int] = {}
+        self._waiters: Dict[str, deque] = {}
+        self.granted: Dict[str, int] = {}
+
+    async def acquire(self, tenant: str):
+        waiters = self._waiters.setdefault(tenant, deque())
+        if not any(self._waiters.values()) and self._total_in_flight() < self.max_concurrency:
+            self._admit(tenant)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append((time.monotonic(), future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                for entry in waiters:
+                    if entry[1] is future:
+                        waiters.remove(entry)
+                        break
+                self._dispatch()
+            else:
+                self.release(tenant)
+            raise
+
+    def release(self, tenant: str):
+        self._in_flight[tenant] -= 1
+        self._dispatch()
+
+    def set_max_concurrency(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests in flight, queued and granted per tenant"""
+        return {
+            'in_flight': self._total_in_flight(),
+            'max_concurrency': self.max_concurrency,
+            'tenants': {
+                tenant: {
+                    'in_flight': self._in_flight.get(tenant, 0),
+                    'queued': len(self._waiters.get(tenant, ())),
+                    'granted': self.granted.get(tenant, 0)
+                }
+                for tenant in set(self._in_flight) | set(self._waiters)
+            }
+        }
+
+    def _total_in_flight(self) -> int:
+        return sum(self._in_flight.values())
+
+    def _admit(self, tenant: str):
+        self._in_flight[tenant] = self._in_flight.get(tenant, 0) + 1
+        self.granted[tenant] = self.granted.get(tenant, 0) + 1
+
+    def _dispatch(self):
+        """Grant free slots to the least-served waiting tenants"""
+        while self._total_in_flight() < self.max_concurrency:
+            for waiters in self._waiters.values():
+                while waiters and waiters[0][1].done():
+                    waiters.popleft()
+
+            waiting = [tenant for tenant, waiters in self._waiters.items() if waiters]
+            if not waiting:
+                break
+
+            tenant = min(waiting, key=lambda t: (self._in_flight.get(t, 0), self._waiters[t][0][0]))
+            self._waiters[tenant].popleft()[1].set_result(None)
+            self._admit(tenant)
+
+# Shared by the MCPs of every tenant
+tenant_scheduler = TenantScheduler()
+
+def get_tenant_scheduler() -> TenantScheduler:
+    """Get the process-wide tenant scheduler"""
+    return tenant_scheduler
@@ -0,0 +1,224 @@
+import asyncio
+import collections
+import contextlib
+import inspect
+import os
+import pickle
+import tempfile
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Union
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None where /proc isn't available"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class SpillQueue:
+    """
+    FIFO of record batches that keeps at most max_batches in memory
+
+    Batches put while the queue is full, or while the process is over its
+    memory limit, are appended to a temporary file instead and read back in
+    order once the consumer gets to them. Puts never wait, so the stage
+    feeding the queue keeps going when the consumer falls behind. Meant for
+    one producer and one consumer.
+    """
+
+    def __init__(self,
+                 max_batches: int,
+                 memory_limit: Optional[int] = None,
+                 spill_dir: Optional[str] = None):
+        """
+        Args:
+            max_batches: Batches held in memory before spilling
+            memory_limit: Spill every batch while RSS is above this many bytes
+            spill_dir: Directory for the spill file (system temp dir by default)
+        """
+        self.max_batches = max_batches
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.spilled_batches = 0
+
+        self._memory = collections.deque()
+        self._file = None
+        self._file_lock = asyncio.Lock()
+        self._unread = 0
+        self._read_offset = 0
+        self._closed = False
+        self._available = asyncio.Event()
+
+    def _must_spill(self) -> bool:
+        # Once a batch is on disk, later ones follow it there to keep FIFO order
+        if self._unread or len(self._memory) >= self.max_batches:
+            return True
+        if self.memory_limit:
+            rss = current_rss()
+            return rss is not None and rss > self.memory_limit
+        return False
+
+    async def put(self, batch: List[Any]):
+        if self._must_spill():
+            async with self._file_lock:
+                await asyncio.to_thread(self._write, batch)
+            self._unread += 1
+            self.spilled_batches += 1
+        else:
+            self._memory.append(batch)
+        self._available.set()
+
+    def _write(self, batch: List[Any]):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self.spill_dir, prefix='sync-spill-')
+        self._file.seek(0, os.SEEK_END)
+        pickle.dump(batch, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _read(self) -> List[Any]:
+        self._file.seek(self._read_offset)
+        batch = pickle.load(self._file)
+        self._read_offset = self._file.tell()
+        return batch
+
+    async def get(self) -> Optional[List[Any]]:
+        """Next batch, or None once the queue is closed and drained"""
+        while True:
+            # Batches in memory are older than any on disk
+            if self._memory:
+                return self._memory.popleft()
+            if self._unread:
+                async with self._file_lock:
+                    batch = await asyncio.to_thread(self._read)
+                    self._unread -= 1
+                    if not self._unread:
+                        # Everything spilled has been read; reclaim the disk space
+                        await asyncio.to_thread(self._file.truncate, 0)
+                        self._read_offset = 0
+                return batch
+            if self._closed:
+                return None
+            self._available.clear()
+            await self._available.wait()
+
+    def close(self):
+        """No more batches will be put"""
+        self._closed = True
+        self._available.set()
+
+    def discard(self):
+        """Drop the spill file (and whatever is still in it)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._unread = 0
+        self._memory.clear()
+
+
+class SyncPipeline:
+    """
+    Streams a full sync through bounded stages: fetch -> normalize -> write
+
+    Each stage runs as its own task, so pages download while earlier ones
+    are normalized and written. Raw pages wait in a queue of queue_size
+    pages; a full queue makes the fetcher wait (backpressure). Normalized
+    batches wait in a SpillQueue of the same size, which spills to a
+    temporary file when the writer (the database) falls behind or the
+    process is above memory_limit, so the CRM side isn't held up by a slow
+    database. Memory use depends on these bounds, not on the portal size.
+
+    Up to normalize_concurrency pages are normalized at once (useful when
+    normalize hands pages to an executor); batches still reach the writer
+    in page order.
+    """
+
+    def __init__(self,
+                 queue_size: int = 8,
+                 memory_limit: Optional[int] = None,
+                 spill_dir: Optional[str] = None,
+                 write_batch_size: int = 500,
+                 normalize_concurrency: int = 1):
+        """
+        Args:
+            queue_size: Pages buffered in memory between two stages
+            memory_limit: RSS in bytes above which normalized batches go to disk
+            spill_dir: Directory for spill files (system temp dir by default)
+            write_batch_size: Records handed to write at once
+            normalize_concurrency: Pages normalized at the same time
+        """
+        self.queue_size = max(1, queue_size)
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.write_batch_size = write_batch_size
+        self.normalize_concurrency = max(1, normalize_concurrency)
+
+    async def run(self,
+                  pages: AsyncIterator[List[Any]],
+                  normalize: Callable[[List[Any]], Union[List[Any], Awaitable[List[Any]]]],
+                  write: Optional[Callable[[List[Any]], Awaitable[Any]]] = None) -> int:
+        """
+        Run the pipeline until pages is exhausted
+
+        Args:
+            pages: Async iterator of raw record pages (closed when done)
+            normalize: Turns a raw page into records (may be a coroutine function)
+            write: Coroutine function persisting a batch of records (None to only count them)
+
+        Returns:
+            Number of records that went through the pipeline
+        """
+        raw_pages = asyncio.Queue(maxsize=self.queue_size)
+        batches = SpillQueue(self.queue_size, self.memory_limit, self.spill_dir)
+
+        async def fetch():
+            async with contextlib.aclosing(pages):
+                async for page in pages:
+                    await raw_pages.put(page)
+            await raw_pages.put(None)
+
+        async def normalized(page: List[Any]) -> List[Any]:
+            records = normalize(page)
+            if inspect.isawaitable(records):
+                records = await records
+            return records
+
+        async def transform():
+            in_flight = collections.deque()
+            try:
+                while (page := await raw_pages.get()) is not None:
+                    in_flight.append(asyncio.ensure_future(normalized(page)))
+                    if len(in_flight) >= self.normalize_concurrency:
+                        await batches.put(await in_flight.popleft())
+                while in_flight:
+                    await batches.put(await in_flight.popleft())
+            finally:
+                for task in in_flight:
+                    task.cancel()
+            batches.close()
+
+        async def store() -> int:
+            count = 0
+            pending = []
+            while (records := await batches.get()) is not None:
+                pending.extend(records)
+                if len(pending) >= self.write_batch_size:
+                    if write:
+                        await write(pending)
+                    count += len(pending)
+                    pending = []
+            if pending and write:
+                await write(pending)
+            return count + len(pending)
+
+        stages = [asyncio.ensure_future(stage()) for stage in (fetch, transform, store)]
+        try:
+            # Fails as soon as any stage does
+            await asyncio.gather(*stages)
+        finally:
+            for stage in stages:
+                stage.cancel()
+            batches.discard()
+            if batches.spilled_batches:
+                print(f"Sync spilled {batches.spilled_batches} batches to disk while the writer caught up")
+        return stages[2].result()
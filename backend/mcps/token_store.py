@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+from typing import Dict, Any, Optional
+
+
+class TokenFileStore:
+    """
+    Persists OAuth tokens to a JSON file
+
+    Writes go to a temporary file in the same directory which then replaces
+    the old file in one os.replace() call, so readers (and a process that
+    crashes mid-write) only ever see the previous or the new tokens, never
+    a truncated file. The file is only readable by its owner.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Token file location
+        """
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Stored tokens, or None if there are none (or the file is unreadable)"""
+        try:
+            with open(self.path) as token_file:
+                tokens = json.load(token_file)
+            return tokens if isinstance(tokens, dict) else None
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Could not read token file {self.path}: {e}")
+            return None
+
+    def save(self, tokens: Dict[str, Any]):
+        """Atomically replace the stored tokens"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tokens-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as token_file:
+                json.dump(tokens, token_file)
+                token_file.flush()
+                os.fsync(token_file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
@@ -0,0 +1,125 @@
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, JSON, Index, UniqueConstraint
+
+from database import Base
+
+class Lead(Base):
+    """
+    Lead synced from a CRM platform, stored in our normalized lead format
+    
+    Records are keyed by tenant: two portals may use the same external ids.
+    """
+    __tablename__ = 'leads'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tenant = Column(String(64), nullable=False)
+    platform = Column(String(50), nullable=False)
+    external_id = Column(String(64), nullable=False)
+    name = Column(String(255))
+    email = Column(String(255))
+    email_domain = Column(String(255))
+    phone = Column(String(64))
+    company = Column(String(255))
+    company_key = Column(String(255))  # lower-cased company for case-insensitive filtering
+    status = Column(String(64))
+    source = Column(String(64))
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    synced_at = Column(DateTime)
+    raw_data = Column(JSON)
+    
+    __table_args__ = (
+        UniqueConstraint('tenant', 'platform', 'external_id', name='uq_leads_tenant_platform_external_id'),
+        # Every query is limited to one tenant, so indexes start with it
+        Index('ix_leads_tenant_status', 'tenant', 'status'),
+        Index('ix_leads_tenant_source', 'tenant', 'source'),
+        Index('ix_leads_tenant_company_key', 'tenant', 'company_key'),
+        Index('ix_leads_tenant_email_domain', 'tenant', 'email_domain'),
+        # (sort column, id) pairs back the keyset pagination order
+        Index('ix_leads_tenant_created_at_id', 'tenant', 'created_at', 'id'),
+        Index('ix_leads_tenant_updated_at_id', 'tenant', 'updated_at', 'id'),
+        Index('ix_leads_tenant_name_id', 'tenant', 'name', 'id'),
+    )
+
+class Call(Base):
+    """
+    Call record synced from a CRM platform, stored in our normalized call format
+    """
+    __tablename__ = 'calls'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tenant = Column(String(64), nullable=False)
+    platform = Column(String(50), nullable=False)
+    external_id = Column(String(64), nullable=False)
+    lead_external_id = Column(String(64))
+    direction = Column(String(32))
+    duration = Column(Integer, default=0)
+    outcome = Column(String(64))
+    notes = Column(Text)
+    recording_url = Column(String(1024))
+    created_at = Column(DateTime)
+    synced_at = Column(DateTime)
+    raw_data = Column(JSON)
+    
+    __table_args__ = (
+        UniqueConstraint('tenant', 'platform', 'external_id', name='uq_calls_tenant_platform_external_id'),
+        Index('ix_calls_tenant_lead_external_id', 'tenant', 'lead_external_id'),
+        Index('ix_calls_tenant_outcome', 'tenant', 'outcome'),
+        Index('ix_calls_tenant_direction', 'tenant', 'direction'),
+        Index('ix_calls_tenant_created_at_id', 'tenant', 'created_at', 'id'),
+        Index('ix_calls_tenant_duration_id', 'tenant', 'duration', 'id'),
+    )
+
+class Deal(Base):
+    """
+    Deal synced from a CRM platform, stored in our normalized deal format
+    """
+    __tablename__ = 'deals'
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tenant = Column(String(64), nullable=False)
+    platform = Column(String(50), nullable=False)
+    external_id = Column(String(64), nullable=False)
+    name = Column(String(255))
+    amount = Column(Float, default=0)
+    stage = Column(String(64))
+    probability = Column(Float)
+    close_date = Column(DateTime)
+    created_at = Column(DateTime)
+    synced_at = Column(DateTime)
+    raw_data = Column(JSON)
+    
+    __table_args__ = (
+        UniqueConstraint('tenant', 'platform', 'external_id', name='uq_deals_tenant_platform_external_id'),
+        Index('ix_deals_tenant_stage', 'tenant', 'stage'),
+        Index('ix_deals_tenant_close_date', 'tenant', 'close_date'),
+    )
+
+class RecordChange(Base):
+    """
+    Change log of the synced records, read by the /changes feed
+
+    Holds one entry per record: its latest insert, update or delete. A new
+    change replaces the record's entry with one under the next version, so
+    reading entries above a version gives each record changed since then
+    once. Deleted records keep their entry as a tombstone.
+    
+    Entries are keyed by tenant like the records. Versions come from one
+    sequence, so a tenant's feed sees increasing versions with gaps.
+    """
+    __tablename__ = 'record_changes'
+    
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    tenant = Column(String(64), nullable=False)
+    kind = Column(String(16), nullable=False)  # 'leads', 'calls' or 'deals'
+    platform = Column(String(50), nullable=False)
+    external_id = Column(String(64), nullable=False)
+    operation = Column(String(16), nullable=False)  # 'insert', 'update' or 'delete'
+    changed_at = Column(DateTime)
+    
+    __table_args__ = (
+        UniqueConstraint('tenant', 'kind', 'platform', 'external_id', name='uq_record_changes_record'),
+        # A tenant's feed and latest version
+        Index('ix_record_changes_tenant_version', 'tenant', 'version'),
+        # Versions are never reused, even after the newest entry is replaced
+        {'sqlite_autoincrement': True},
+    )
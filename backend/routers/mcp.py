@@ -1,34 +1,135 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional, Dict, Any, List
+import asyncio
+import json
+import math
+import re
+import time
+from fastapi import APIRouter, HTTPException, Depends, Request, WebSocket, WebSocketException, status
+from fastapi.requests import HTTPConnection
+from fastapi.responses import StreamingResponse
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
-from services.mcp_orchestrator import get_orchestrator
-# from database import get_db  # Uncomment when database is set up
+from services.mcp_orchestrator import MCPOrchestrator, get_orchestrator
+from services.circuit_breaker import CircuitOpenError
+from services.health_prober import get_health_prober
+from services.dashboard_push import get_dashboard_broadcaster
+from mcps.deadline import Deadline, decode_resume_cursor, deadline_scope
+from services import local_store, search_index
+from services.chat_context import ChatContextBuilder
+from services.chat_sessions import get_session_store
+from services.etags import ConditionalResponder
+from database import get_db, SessionLocal
 
-router = APIRouter(prefix="/mcp", tags=["MCP"])
+def get_tenant_orchestrator(connection: HTTPConnection, tenant_id: Optional[str] = None) -> MCPOrchestrator:
+    """
+    Orchestrator of the tenant (HubSpot portal) a request is for
+    
+    The tenant comes from the /api/tenants/{tenant_id}/... path, or the
+    tenant_id query parameter on the unscoped routes, which otherwise serve
+    the default tenant.
+    
+    Raises:
+        HTTPException: 404 if the tenant isn't configured
+        WebSocketException: The same, for WebSocket connections (closed with 1008)
+    """
+    orchestrator = get_orchestrator(tenant_id)
+    if orchestrator is None:
+        if connection.scope["type"] == "websocket":
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=f"Tenant '{tenant_id}' not found")
+        raise HTTPException(status_code=404, detail=f"Tenant '{tenant_id}' not found")
+    return orchestrator
+
+# Every route is tenant-scoped (unknown tenants get a 404)
+router = APIRouter(prefix="/mcp", tags=["MCP"], dependencies=[Depends(get_tenant_orchestrator)])
+
+# Size-budgeted chat context, cached per data version
+context_builder = ChatContextBuilder()
+
+# ETag / If-None-Match handling for the polled read endpoints
+conditional = ConditionalResponder()
 
 class ChatMessage(BaseModel):
     message: str
+    # Server-side session to continue; omit to start a new one
+    session_id: Optional[str] = None
+    # Legacy: full client-side history, only used when no session exists yet
     conversation_history: Optional[List[Dict[str, str]]] = []
 
+class BatchReadRequest(BaseModel):
+    object_type: str
+    ids: List[str]
+
+def _circuit_open_exception(error: CircuitOpenError) -> HTTPException:
+    """503 telling clients when the platform's circuit will be probed again"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+def _read_deadline(timeout_ms: Optional[int], cursor: Optional[str]) -> Optional[Deadline]:
+    """
+    Deadline for a read endpoint, resuming from cursor if given
+    
+    Raises:
+        HTTPException: 400 if timeout_ms or cursor is invalid
+    """
+    if timeout_ms is None and not cursor:
+        return None
+    if timeout_ms is not None and timeout_ms <= 0:
+        raise HTTPException(status_code=400, detail="timeout_ms must be positive")
+    try:
+        resume_from = decode_resume_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Deadline(timeout=timeout_ms / 1000 if timeout_ms else None, resume_from=resume_from)
+
+async def _read_cached(orchestrator: MCPOrchestrator,
+                       key: str,
+                       loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, Optional[Tuple]]:
+    """
+    Read through the orchestrator cache
+    
+    Returns:
+        The value and the versions identifying it for conditional.respond
+        (None for warm-start snapshot data, which has no cache entry yet)
+    """
+    value = await orchestrator.get_cached(key, loader)
+    entry = orchestrator.cache.get_entry(key)
+    if entry is None or entry.value is not value:
+        return value, None
+    return value, (('tenant', orchestrator.tenant), (key, entry.version))
+
 @router.get("/health")
-async def get_mcp_health():
+async def get_mcp_health(
+    deep: bool = False,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
     """
     Get health status of all MCP connections
+    
+    Returns the result of the latest background probe, with rolling latency
+    and error stats per platform.
+    
+    Args:
+        deep: Probe every platform now instead of returning the cached result
     """
     try:
-        orchestrator = get_orchestrator()
-        health_status = await orchestrator.health_check()
+        health_status = await get_health_prober(orchestrator.tenant).get_health(deep=deep)
         return health_status
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 @router.get("/leads")
 async def get_leads(
+    request: Request,
     limit: Optional[int] = 100,
-    since_days: Optional[int] = None
+    since_days: Optional[int] = None,
+    timeout_ms: Optional[int] = None,
+    cursor: Optional[str] = None,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
 ):
     """
     Get leads from all connected MCP platforms
@@ -36,32 +137,50 @@ async def get_leads(
     Args:
         limit: Maximum number of leads per platform
         since_days: Number of days back to fetch leads (e.g., 7 for last week)
+        timeout_ms: Return what was fetched so far after this long, with a resume cursor
+        cursor: Resume cursor from an earlier partial response
+    
+    Without timeout_ms or cursor, reads go through the orchestrator cache,
+    so polls over unchanged data get a 304 without refetching.
     """
     try:
-        orchestrator = get_orchestrator()
+        deadline = _read_deadline(timeout_ms, cursor)
         
         since_date = None
         if since_days:
             since_date = datetime.now() - timedelta(days=since_days)
         
-        leads_data = await orchestrator.get_all_leads(
-            limit=limit,
-            since_date=since_date
-        )
+        def load():
+            return orchestrator.get_all_leads(limit=limit, since_date=since_date, deadline=deadline)
         
-        return {
+        versions = None
+        if deadline:
+            # Partial results are never cached
+            leads_data = await load()
+        else:
+            leads_data, versions = await _read_cached(orchestrator, f'leads:{limit}:{since_days}', load)
+        
+        return conditional.respond(request, {
             "leads": leads_data,
             "total_platforms": len(leads_data),
+            "partial": bool(deadline and deadline.partial),
+            "cursor": deadline.resume_cursor() if deadline else None,
             "retrieved_at": datetime.now().isoformat()
-        }
+        }, versions=versions, volatile=("retrieved_at",))
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch leads: {str(e)}")
 
 @router.get("/calls")
 async def get_calls(
+    request: Request,
     limit: Optional[int] = 100,
-    since_days: Optional[int] = None
+    since_days: Optional[int] = None,
+    timeout_ms: Optional[int] = None,
+    cursor: Optional[str] = None,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
 ):
     """
     Get calls from all connected MCP platforms
@@ -69,57 +188,73 @@ async def get_calls(
     Args:
         limit: Maximum number of calls per platform  
         since_days: Number of days back to fetch calls
+        timeout_ms: Return what was fetched so far after this long, with a resume cursor
+        cursor: Resume cursor from an earlier partial response
+    
+    Without timeout_ms or cursor, reads go through the orchestrator cache,
+    so polls over unchanged data get a 304 without refetching.
     """
     try:
-        orchestrator = get_orchestrator()
+        deadline = _read_deadline(timeout_ms, cursor)
         
         since_date = None
         if since_days:
             since_date = datetime.now() - timedelta(days=since_days)
         
-        calls_data = await orchestrator.get_all_calls(
-            limit=limit,
-            since_date=since_date
-        )
+        def load():
+            return orchestrator.get_all_calls(limit=limit, since_date=since_date, deadline=deadline)
         
-        return {
+        versions = None
+        if deadline:
+            # Partial results are never cached
+            calls_data = await load()
+        else:
+            calls_data, versions = await _read_cached(orchestrator, f'calls:{limit}:{since_days}', load)
+        
+        return conditional.respond(request, {
             "calls": calls_data,
             "total_platforms": len(calls_data),
+            "partial": bool(deadline and deadline.partial),
+            "cursor": deadline.resume_cursor() if deadline else None,
             "retrieved_at": datetime.now().isoformat()
-        }
+        }, versions=versions, volatile=("retrieved_at",))
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch calls: {str(e)}")
 
 @router.get("/budget")
-async def get_budget_info():
+async def get_budget_info(
+    request: Request,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
     """
     Get budget and deal information from all connected MCP platforms
     """
     try:
-        orchestrator = get_orchestrator()
         budget_data = await orchestrator.get_all_budget_info()
         
-        return {
+        return conditional.respond(request, {
             "budget_info": budget_data,
             "total_platforms": len(budget_data),
             "retrieved_at": datetime.now().isoformat()
-        }
+        }, volatile=("retrieved_at",))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch budget info: {str(e)}")
 
 @router.post("/sync")
-async def sync_mcp_data():
+async def sync_mcp_data(
+    db: AsyncSession = Depends(get_db),
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
     """
     Sync data from all MCP platforms to database
     """
     try:
-        orchestrator = get_orchestrator()
         
-        # For now, pass None for db session since database setup is pending
-        # In production, this would use: db: Session = Depends(get_db)
-        sync_results = await orchestrator.sync_all_data(db=None)
+        sync_results = await orchestrator.sync_all_data(db=db)
         
         return {
             "results": sync_results,
@@ -130,27 +265,289 @@ async def sync_mcp_data():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sync failed: {str(e)}")
 
+@router.post("/reconcile")
+async def reconcile_mcp_data(
+    db: AsyncSession = Depends(get_db),
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Remove records deleted in the MCP platforms from the database
+    
+    Much cheaper than a full sync: only record IDs are fetched, and only
+    for ID ranges whose counts differ from the stored ones.
+    """
+    try:
+        reconcile_results = await orchestrator.reconcile_all_data(db=db)
+        
+        return {
+            "results": reconcile_results,
+            "reconciled_at": datetime.now().isoformat(),
+            "status": "completed"
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reconciliation failed: {str(e)}")
+
+@router.get("/query/leads")
+async def query_leads(
+    platform: Optional[str] = None,
+    status: Optional[str] = None,
+    source: Optional[str] = None,
+    company: Optional[str] = None,
+    email_domain: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_raw: bool = False,
+    db: AsyncSession = Depends(get_db),
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Filter, sort and page through synced leads from the local store
+    
+    Served entirely from the database populated by /sync - no CRM calls.
+    Pass the returned next_cursor back as `cursor` to get the next page.
+    
+    Args:
+        platform: Only leads from this platform (e.g. 'hubspot')
+        status, source, company, email_domain: Exact-match filters
+        created_after, created_before, updated_after, updated_before: ISO date ranges
+        sort_by: 'created_at', 'updated_at' or 'name'
+        order: 'asc' or 'desc'
+        limit: Page size (max 500)
+        cursor: Cursor from the previous page
+    """
+    try:
+        if order not in ("asc", "desc"):
+            raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+        
+        result = await local_store.query_leads(
+            db,
+            orchestrator.tenant,
+            platform=platform,
+            status=status,
+            source=source,
+            company=company,
+            email_domain=email_domain,
+            created_after=created_after,
+            created_before=created_before,
+            updated_after=updated_after,
+            updated_before=updated_before,
+            sort_by=sort_by,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+            include_raw=include_raw
+        )
+        result["retrieved_at"] = datetime.now().isoformat()
+        return result
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Lead query failed: {str(e)}")
+
+@router.get("/query/calls")
+async def query_calls(
+    platform: Optional[str] = None,
+    outcome: Optional[str] = None,
+    direction: Optional[str] = None,
+    lead_id: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    min_duration: Optional[int] = None,
+    sort_by: str = "created_at",
+    order: str = "desc",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_raw: bool = False,
+    db: AsyncSession = Depends(get_db),
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Filter, sort and page through synced call records from the local store
+    
+    Args:
+        platform: Only calls from this platform (e.g. 'hubspot')
+        outcome, direction: Exact-match filters
+        lead_id: External ID of the associated lead
+        created_after, created_before: ISO date range
+        min_duration: Minimum call duration in seconds
+        sort_by: 'created_at' or 'duration'
+        order: 'asc' or 'desc'
+        limit: Page size (max 500)
+        cursor: Cursor from the previous page
+    """
+    try:
+        if order not in ("asc", "desc"):
+            raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+        
+        result = await local_store.query_calls(
+            db,
+            orchestrator.tenant,
+            platform=platform,
+            outcome=outcome,
+            direction=direction,
+            lead_id=lead_id,
+            created_after=created_after,
+            created_before=created_before,
+            min_duration=min_duration,
+            sort_by=sort_by,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor,
+            include_raw=include_raw
+        )
+        result["retrieved_at"] = datetime.now().isoformat()
+        return result
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Call query failed: {str(e)}")
+
+@router.get("/changes")
+async def get_changes(
+    since: int = 0,
+    kinds: Optional[str] = None,
+    limit: int = 100,
+    include_raw: bool = False,
+    db: AsyncSession = Depends(get_db),
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    The tenant's records inserted, updated or deleted in the local store since a version
+    
+    Lets consumers stay in sync without re-downloading /leads or /calls:
+    start with since=0, then pass the returned next_since back as `since`
+    (immediately while has_more is true, later to poll for new changes).
+    Deleted records come with their IDs only (record is null).
+    
+    Args:
+        since: Change log version already seen (0 for everything)
+        kinds: Comma-separated record kinds ('leads', 'calls', 'deals')
+        limit: Maximum number of changes (max 500)
+        include_raw: Include the raw CRM payload in each record
+    """
+    try:
+        if since < 0:
+            raise HTTPException(status_code=400, detail="since must not be negative")
+        kind_list = [k.strip() for k in kinds.split(",") if k.strip()] if kinds else None
+        
+        result = await local_store.query_changes(
+            db,
+            orchestrator.tenant,
+            since=since,
+            kinds=kind_list,
+            limit=limit,
+            include_raw=include_raw
+        )
+        result["retrieved_at"] = datetime.now().isoformat()
+        return result
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Change feed failed: {str(e)}")
+
+@router.get("/search")
+async def search_records(
+    q: str,
+    types: Optional[str] = None,
+    platform: Optional[str] = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_db),
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Full-text search over synced leads, call notes and deals
+    
+    Matches lead name/email/company, call notes and deal names from the
+    local search index kept up to date by /sync. Results are ranked best first.
+    
+    Args:
+        q: Search text (the last word also matches as a prefix)
+        types: Comma-separated document types to include ('lead', 'call', 'deal')
+        platform: Only results from this platform (e.g. 'hubspot')
+        limit: Maximum number of results (max 100)
+    """
+    try:
+        started = datetime.now()
+        doc_types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+        
+        results = await search_index.search(db, orchestrator.tenant, q, doc_types=doc_types, platform=platform, limit=limit)
+        
+        return {
+            "query": q,
+            "results": results,
+            "count": len(results),
+            "took_ms": round((datetime.now() - started).total_seconds() * 1000, 2)
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+
 @router.get("/dashboard")
-async def get_dashboard_summary():
+async def get_dashboard_summary(
+    request: Request,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
     """
     Get unified dashboard summary from all MCP platforms
+    
+    Served from the orchestrator cache; right after a restart, from the
+    warm-start snapshot while fresh data loads in the background.
+    Polls over an unchanged cache entry reuse its ETag and body.
     """
     try:
-        orchestrator = get_orchestrator()
-        dashboard_data = await orchestrator.get_dashboard_summary()
+        dashboard_data, versions = await _read_cached(orchestrator, 'dashboard', orchestrator.get_dashboard_summary)
         
-        return dashboard_data
+        return conditional.respond(request, dashboard_data, versions=versions)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch dashboard summary: {str(e)}")
 
+@router.websocket("/dashboard/ws")
+async def dashboard_updates(
+    websocket: WebSocket,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Push dashboard summary updates instead of polling /dashboard
+    
+    The first message is the full summary:
+    {"type": "snapshot", "version": n, "data": {...}}. After each sync that
+    changes the aggregates, a JSON merge patch follows:
+    {"type": "patch", "version": n, "from_version": m, "patch": {...}}.
+    A client gets at most one message per DASHBOARD_PUSH_MIN_INTERVAL_SECONDS;
+    changes in between are combined into it.
+    """
+    await websocket.accept()
+    await get_dashboard_broadcaster(orchestrator.tenant).serve(websocket)
+
 @router.get("/platforms")
-async def get_connected_platforms():
+async def get_connected_platforms(
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
     """
     Get list of connected MCP platforms
+    
+    No ETag: the request stats in it change with every CRM request.
     """
     try:
-        orchestrator = get_orchestrator()
         platforms = []
         
         for name, mcp in orchestrator.mcps.items():
@@ -158,7 +555,9 @@ async def get_connected_platforms():
                 "name": name,
                 "platform": mcp.get_platform_name(),
                 "authenticated": mcp.is_authenticated,
-                "last_sync": mcp.last_sync.isoformat() if mcp.last_sync else None
+                "last_sync": mcp.last_sync.isoformat() if mcp.last_sync else None,
+                "circuit": orchestrator.circuit_status(name),
+                "requests": mcp.request_stats()
             })
         
         return {
@@ -173,7 +572,10 @@ async def get_connected_platforms():
 async def get_platform_leads(
     platform_name: str,
     limit: Optional[int] = 100,
-    since_days: Optional[int] = None
+    since_days: Optional[int] = None,
+    timeout_ms: Optional[int] = None,
+    cursor: Optional[str] = None,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
 ):
     """
     Get leads from a specific MCP platform
@@ -182,9 +584,10 @@ async def get_platform_leads(
         platform_name: Name of the MCP platform (e.g., 'hubspot')
         limit: Maximum number of leads
         since_days: Number of days back to fetch leads
+        timeout_ms: Return what was fetched so far after this long, with a resume cursor
+        cursor: Resume cursor from an earlier partial response
     """
     try:
-        orchestrator = get_orchestrator()
         mcp = orchestrator.get_mcp(platform_name)
         
         if not mcp:
@@ -194,12 +597,26 @@ async def get_platform_leads(
         if since_days:
             since_date = datetime.now() - timedelta(days=since_days)
         
-        leads = await mcp.get_leads(limit=limit, since_date=since_date)
+        deadline = _read_deadline(timeout_ms, cursor)
+        stale = False
+        try:
+            if deadline and deadline.is_resuming_without(platform_name):
+                leads = []
+            else:
+                with deadline_scope(deadline):
+                    leads = await orchestrator.call_mcp(platform_name, 'get_leads', limit=limit, since_date=since_date)
+        except CircuitOpenError as e:
+            if e.cached is None:
+                raise _circuit_open_exception(e)
+            leads, stale = e.cached, True
         
         return {
             "platform": platform_name,
             "leads": leads,
             "count": len(leads),
+            "stale": stale,
+            "partial": bool(deadline and deadline.partial),
+            "cursor": deadline.resume_cursor() if deadline else None,
             "retrieved_at": datetime.now().isoformat()
         }
         
@@ -212,7 +629,10 @@ async def get_platform_leads(
 async def get_platform_calls(
     platform_name: str,
     limit: Optional[int] = 100,
-    since_days: Optional[int] = None
+    since_days: Optional[int] = None,
+    timeout_ms: Optional[int] = None,
+    cursor: Optional[str] = None,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
 ):
     """
     Get calls from a specific MCP platform
@@ -221,9 +641,10 @@ async def get_platform_calls(
         platform_name: Name of the MCP platform
         limit: Maximum number of calls
         since_days: Number of days back to fetch calls
+        timeout_ms: Return what was fetched so far after this long, with a resume cursor
+        cursor: Resume cursor from an earlier partial response
     """
     try:
-        orchestrator = get_orchestrator()
         mcp = orchestrator.get_mcp(platform_name)
         
         if not mcp:
@@ -233,12 +654,26 @@ async def get_platform_calls(
         if since_days:
             since_date = datetime.now() - timedelta(days=since_days)
         
-        calls = await mcp.get_calls(limit=limit, since_date=since_date)
+        deadline = _read_deadline(timeout_ms, cursor)
+        stale = False
+        try:
+            if deadline and deadline.is_resuming_without(platform_name):
+                calls = []
+            else:
+                with deadline_scope(deadline):
+                    calls = await orchestrator.call_mcp(platform_name, 'get_calls', limit=limit, since_date=since_date)
+        except CircuitOpenError as e:
+            if e.cached is None:
+                raise _circuit_open_exception(e)
+            calls, stale = e.cached, True
         
         return {
             "platform": platform_name,
             "calls": calls,
             "count": len(calls),
+            "stale": stale,
+            "partial": bool(deadline and deadline.partial),
+            "cursor": deadline.resume_cursor() if deadline else None,
             "retrieved_at": datetime.now().isoformat()
         }
         
@@ -248,7 +683,10 @@ async def get_platform_calls(
         raise HTTPException(status_code=500, detail=f"Failed to fetch calls from {platform_name}: {str(e)}")
 
 @router.get("/platform/{platform_name}/budget")
-async def get_platform_budget(platform_name: str):
+async def get_platform_budget(
+    platform_name: str,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
     """
     Get budget information from a specific MCP platform
     
@@ -256,17 +694,23 @@ async def get_platform_budget(platform_name: str):
         platform_name: Name of the MCP platform
     """
     try:
-        orchestrator = get_orchestrator()
         mcp = orchestrator.get_mcp(platform_name)
         
         if not mcp:
             raise HTTPException(status_code=404, detail=f"Platform '{platform_name}' not found")
         
-        budget_info = await mcp.get_budget_info()
+        stale = False
+        try:
+            budget_info = await orchestrator.call_mcp(platform_name, 'get_budget_info')
+        except CircuitOpenError as e:
+            if e.cached is None:
+                raise _circuit_open_exception(e)
+            budget_info, stale = e.cached, True
         
         return {
             "platform": platform_name,
             "budget_info": budget_info,
+            "stale": stale,
             "retrieved_at": datetime.now().isoformat()
         }
         
@@ -275,8 +719,170 @@ async def get_platform_budget(platform_name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch budget from {platform_name}: {str(e)}")
 
+@router.get("/platform/{platform_name}/leads/{lead_id}")
+async def get_platform_lead(
+    platform_name: str,
+    lead_id: str,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Get a single lead from a specific MCP platform
+    
+    Args:
+        platform_name: Name of the MCP platform
+        lead_id: External ID of the lead
+    """
+    try:
+        mcp = orchestrator.get_mcp(platform_name)
+        
+        if not mcp:
+            raise HTTPException(status_code=404, detail=f"Platform '{platform_name}' not found")
+        
+        try:
+            leads = await orchestrator.call_mcp(platform_name, 'get_leads_by_ids', [lead_id], keep_last_good=False)
+        except CircuitOpenError as e:
+            raise _circuit_open_exception(e)
+        if not leads:
+            raise HTTPException(status_code=404, detail=f"Lead '{lead_id}' not found in {platform_name}")
+        
+        return {
+            "platform": platform_name,
+            "lead": leads[0],
+            "retrieved_at": datetime.now().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch lead from {platform_name}: {str(e)}")
+
+@router.get("/platform/{platform_name}/calls/{call_id}")
+async def get_platform_call(
+    platform_name: str,
+    call_id: str,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Get a single call record from a specific MCP platform
+    
+    Args:
+        platform_name: Name of the MCP platform
+        call_id: External ID of the call
+    """
+    try:
+        mcp = orchestrator.get_mcp(platform_name)
+        
+        if not mcp:
+            raise HTTPException(status_code=404, detail=f"Platform '{platform_name}' not found")
+        
+        try:
+            calls = await orchestrator.call_mcp(platform_name, 'get_calls_by_ids', [call_id], keep_last_good=False)
+        except CircuitOpenError as e:
+            raise _circuit_open_exception(e)
+        if not calls:
+            raise HTTPException(status_code=404, detail=f"Call '{call_id}' not found in {platform_name}")
+        
+        return {
+            "platform": platform_name,
+            "call": calls[0],
+            "retrieved_at": datetime.now().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch call from {platform_name}: {str(e)}")
+
+@router.get("/platform/{platform_name}/deals/{deal_id}")
+async def get_platform_deal(
+    platform_name: str,
+    deal_id: str,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Get a single deal from a specific MCP platform
+    
+    Args:
+        platform_name: Name of the MCP platform
+        deal_id: External ID of the deal
+    """
+    try:
+        mcp = orchestrator.get_mcp(platform_name)
+        
+        if not mcp:
+            raise HTTPException(status_code=404, detail=f"Platform '{platform_name}' not found")
+        
+        try:
+            deals = await orchestrator.call_mcp(platform_name, 'get_deals_by_ids', [deal_id], keep_last_good=False)
+        except CircuitOpenError as e:
+            raise _circuit_open_exception(e)
+        if not deals:
+            raise HTTPException(status_code=404, detail=f"Deal '{deal_id}' not found in {platform_name}")
+        
+        return {
+            "platform": platform_name,
+            "deal": deals[0],
+            "retrieved_at": datetime.now().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch deal from {platform_name}: {str(e)}")
+
+@router.post("/platform/{platform_name}/batch/read")
+async def batch_read_platform_records(
+    platform_name: str,
+    batch_request: BatchReadRequest,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Get several leads, calls or deals from a specific MCP platform by ID
+    
+    Args:
+        platform_name: Name of the MCP platform
+        batch_request: Object type ('leads', 'calls' or 'deals') and the IDs to read
+    """
+    try:
+        mcp = orchestrator.get_mcp(platform_name)
+        
+        if not mcp:
+            raise HTTPException(status_code=404, detail=f"Platform '{platform_name}' not found")
+        
+        readers = {
+            "leads": 'get_leads_by_ids',
+            "calls": 'get_calls_by_ids',
+            "deals": 'get_deals_by_ids'
+        }
+        reader = readers.get(batch_request.object_type)
+        if not reader:
+            raise HTTPException(status_code=400, detail=f"Unsupported object type '{batch_request.object_type}'")
+        
+        try:
+            records = await orchestrator.call_mcp(platform_name, reader, batch_request.ids, keep_last_good=False)
+        except CircuitOpenError as e:
+            raise _circuit_open_exception(e)
+        
+        return {
+            "platform": platform_name,
+            "object_type": batch_request.object_type,
+            batch_request.object_type: records,
+            "count": len(records),
+            "missing": sorted(set(batch_request.ids) - {record.get('external_id') for record in records}),
+            "retrieved_at": datetime.now().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch read from {platform_name} failed: {str(e)}")
+
 @router.post("/platform/{platform_name}/sync")
-async def sync_platform_data(platform_name: str):
+async def sync_platform_data(
+    platform_name: str,
+    db: AsyncSession = Depends(get_db),
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
     """
     Sync data from a specific MCP platform
     
@@ -284,14 +890,15 @@ async def sync_platform_data(platform_name: str):
         platform_name: Name of the MCP platform to sync
     """
     try:
-        orchestrator = get_orchestrator()
         mcp = orchestrator.get_mcp(platform_name)
         
         if not mcp:
             raise HTTPException(status_code=404, detail=f"Platform '{platform_name}' not found")
         
-        # For now, pass None for db session
-        sync_result = await mcp.sync_to_database(db=None)
+        try:
+            sync_result = await orchestrator.call_mcp(platform_name, 'sync_to_database', db=db, keep_last_good=False)
+        except CircuitOpenError as e:
+            raise _circuit_open_exception(e)
         
         return {
             "platform": platform_name,
@@ -304,35 +911,119 @@ async def sync_platform_data(platform_name: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to sync {platform_name}: {str(e)}")
 
+# Chat intents, checked in order; the first matching pattern wins
+CHAT_INTENT_PATTERNS = [
+    ('search', re.compile(r'\b(search|find|look ?up|mentioning|mentions?)\b')),
+    ('greeting', re.compile(r'\b(hello|hi|hey|good morning|good afternoon)\b')),
+    ('leads', re.compile(r'\b(lead|contact|prospect|customer)')),
+    ('calls', re.compile(r'\b(call|phone|conversation|talk)')),
+    ('budget', re.compile(r'\b(budget|deal|revenue|pipeline|money|sales)')),
+    ('sync', re.compile(r'\b(sync|update|refresh|latest)')),
+    ('help', re.compile(r'\b(help|what can you do|capabilities|features)')),
+]
+
+# Data sources each intent needs; anything not listed is never fetched
+INTENT_SOURCES = {
+    'search': ['health'],
+    'greeting': ['leads', 'calls', 'health'],
+    'leads': ['leads', 'health'],
+    'calls': ['calls', 'health'],
+    'budget': ['budget', 'health'],
+    'sync': ['health'],
+    'help': ['health'],
+    'general': ['leads', 'health'],
+}
+
+def _classify_intent(user_message: str) -> str:
+    """Classify a chat message into one of the INTENT_SOURCES intents"""
+    user_message_lower = user_message.lower()
+    for intent, pattern in CHAT_INTENT_PATTERNS:
+        if pattern.search(user_message_lower):
+            return intent
+    return 'general'
+
+def _chat_source_loaders(orchestrator) -> Dict[str, Any]:
+    """
+    Coroutine functions that load each chat data source
+    
+    CRM data goes through the orchestrator cache; health is the prober's
+    latest result, which is already in memory and kept current by it.
+    """
+    warm_loaders = orchestrator.warm_loaders()
+    return {
+        'leads': lambda: orchestrator.get_cached('chat:leads', warm_loaders['chat:leads']),
+        'calls': lambda: orchestrator.get_cached('chat:calls', warm_loaders['chat:calls']),
+        'budget': lambda: orchestrator.get_cached('chat:budget', warm_loaders['chat:budget']),
+        'health': get_health_prober(orchestrator.tenant).get_health,
+    }
+
+async def _load_chat_sources(orchestrator, sources: List[str]) -> Dict[str, Dict]:
+    """Load only the given data sources, concurrently"""
+    loaders = _chat_source_loaders(orchestrator)
+    results = await asyncio.gather(*(loaders[source]() for source in sources))
+    return dict(zip(sources, results))
+
+async def _search_for_chat(db: AsyncSession, tenant: str, user_message: str) -> Dict[str, Any]:
+    """Run a local full-text search of a tenant's records for a 'find ...' style chat message"""
+    user_message_lower = user_message.lower()
+    
+    match = re.search(r'\b(?:mentioning|mentions?|about|named|called|for|at)\s+(.+)', user_message_lower)
+    query = match.group(1) if match else re.sub(
+        r'\b(search|find|look ?up|me|the|all|any|leads?|contacts?|calls?|deals?)\b', ' ', user_message_lower
+    )
+    query = query.strip(' ?.!"\'')
+    
+    doc_types = [
+        doc_type for doc_type, pattern in (
+            ('lead', r'\b(lead|contact|prospect|customer)'),
+            ('call', r'\b(call|phone|conversation)'),
+            ('deal', r'\bdeal'),
+        )
+        if re.search(pattern, user_message_lower)
+    ] or None
+    
+    return {
+        'query': query,
+        'results': await search_index.search(db, tenant, query, doc_types=doc_types, limit=10) if query else []
+    }
+
 @router.post("/chat")
-async def chat_with_mcp_agent(chat_request: ChatMessage):
+async def chat_with_mcp_agent(
+    chat_request: ChatMessage,
+    db: AsyncSession = Depends(get_db),
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
     """
     Chat with the MCP HubSpot Agent using natural language
     
+    The message intent is classified first and only the data sources that
+    intent needs are loaded (concurrently, from cache when fresh).
+    
     Args:
         chat_request: Contains the user message and conversation history
     """
     try:
-        orchestrator = get_orchestrator()
+        sessions = get_session_store()
+        session = sessions.get_or_create(orchestrator.tenant, chat_request.session_id)
         
-        # Get fresh data for context
-        leads_data = await orchestrator.get_all_leads(limit=50)
-        calls_data = await orchestrator.get_all_calls(limit=50)  
-        budget_data = await orchestrator.get_all_budget_info()
-        health_data = await orchestrator.health_check()
-        
-        # Create context for the AI
-        context = _build_context_for_ai(leads_data, calls_data, budget_data, health_data)
+        intent = _classify_intent(chat_request.message)
+        data = await _load_chat_sources(orchestrator, INTENT_SOURCES[intent])
+        context = await _build_chat_context(orchestrator, db, chat_request.message, intent, data)
         
         # Generate AI response (for now, using enhanced logic - can be replaced with OpenAI/Claude later)
         ai_response = await _generate_ai_response(
             chat_request.message, 
             context, 
-            chat_request.conversation_history
+            _conversation_history(session, chat_request)
         )
         
+        sessions.append(session, 'user', chat_request.message)
+        sessions.append(session, 'bot', ai_response)
+        
         return {
             "response": ai_response,
+            "session_id": session.session_id,
+            "intent": intent,
             "timestamp": datetime.now().isoformat(),
             "context_used": True
         }
@@ -340,64 +1031,181 @@ async def chat_with_mcp_agent(chat_request: ChatMessage):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
 
-def _build_context_for_ai(leads_data: Dict, calls_data: Dict, budget_data: Dict, health_data: Dict) -> Dict:
-    """Build comprehensive context from MCP data for AI responses"""
+@router.post("/chat/stream")
+async def stream_chat_with_mcp_agent(
+    chat_request: ChatMessage,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Server-Sent Events variant of /chat
     
-    context = {
-        "timestamp": datetime.now().isoformat(),
-        "platforms_status": health_data,
-        "leads_summary": {},
-        "calls_summary": {},
-        "budget_summary": {},
-        "recent_activity": []
+    Emits events as soon as they are available instead of after the whole
+    response is ready:
+    - `start`: intent and the data sources being loaded (sent immediately)
+    - `progress`: one per data source as it resolves (or fails)
+    - `token`: the response text, in chunks
+    - `done`: end of the response
+    - `error`: the chat failed; no further events follow
+    
+    Args:
+        chat_request: Contains the user message and conversation history
+    """
+    sessions = get_session_store()
+    session = sessions.get_or_create(orchestrator.tenant, chat_request.session_id)
+    intent = _classify_intent(chat_request.message)
+    sources = INTENT_SOURCES[intent]
+    
+    async def event_stream():
+        started = time.monotonic()
+        yield _sse_event("start", {"session_id": session.session_id, "intent": intent, "sources": sources})
+        
+        loaders = _chat_source_loaders(orchestrator)
+        
+        async def load(source: str):
+            try:
+                return source, await loaders[source](), None
+            except Exception as e:
+                return source, None, e
+        
+        tasks = [asyncio.ensure_future(load(source)) for source in sources]
+        data = {}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                source, value, error = await next_done
+                if error is None:
+                    data[source] = value
+                    status = "loaded"
+                else:
+                    status = f"error: {str(error)}"
+                yield _sse_event("progress", {
+                    "source": source,
+                    "status": status,
+                    "loaded": len(data),
+                    "total": len(sources),
+                    "elapsed_ms": round((time.monotonic() - started) * 1000)
+                })
+            
+            # The stream outlives the request's dependencies, so it opens its own session
+            async with SessionLocal() as db:
+                context = await _build_chat_context(orchestrator, db, chat_request.message, intent, data)
+            ai_response = await _generate_ai_response(
+                chat_request.message,
+                context,
+                _conversation_history(session, chat_request)
+            )
+            sessions.append(session, 'user', chat_request.message)
+            sessions.append(session, 'bot', ai_response)
+            
+            for chunk in _chunk_text(ai_response):
+                yield _sse_event("token", {"text": chunk})
+            
+            yield _sse_event("done", {
+                "session_id": session.session_id,
+                "intent": intent,
+                "timestamp": datetime.now().isoformat(),
+                "elapsed_ms": round((time.monotonic() - started) * 1000)
+            })
+            
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Chat failed: {str(e)}"})
+        finally:
+            # Client went away or we failed: don't leave loads running
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/chat/sessions/{session_id}")
+async def get_chat_session(
+    session_id: str,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    Get the server-side history of a chat session
+    
+    Args:
+        session_id: Session id returned by /chat (for the same tenant)
+    """
+    session = get_session_store().get(orchestrator.tenant, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail=f"Chat session '{session_id}' not found or expired")
+    
+    return {
+        "session_id": session.session_id,
+        "messages": session.history(),
+        "total_messages": session.total_messages,
+        "created_at": session.created_at.isoformat()
     }
+
+@router.delete("/chat/sessions/{session_id}")
+async def delete_chat_session(
+    session_id: str,
+    orchestrator: MCPOrchestrator = Depends(get_tenant_orchestrator)
+):
+    """
+    End a chat session and drop its history
     
-    # Process leads data
-    for platform, data in leads_data.items():
-        if 'error' not in data:
-            leads = data.get('leads', [])
-            context["leads_summary"][platform] = {
-                "total_count": len(leads),
-                "recent_leads": [
-                    {
-                        "name": lead.get('name', 'Unknown'),
-                        "email": lead.get('email', ''),
-                        "status": lead.get('status', 'Unknown'),
-                        "created_at": lead.get('created_at', ''),
-                        "company": lead.get('company', '')
-                    }
-                    for lead in leads[:5]  # Last 5 leads for context
-                ],
-                "status_breakdown": _get_status_breakdown(leads, 'status')
-            }
-    
-    # Process calls data  
-    for platform, data in calls_data.items():
-        if 'error' not in data:
-            calls = data.get('calls', [])
-            context["calls_summary"][platform] = {
-                "total_count": len(calls),
-                "total_duration": sum(call.get('duration', 0) for call in calls),
-                "avg_duration": sum(call.get('duration', 0) for call in calls) / len(calls) if calls else 0,
-                "recent_calls": calls[:3],  # Last 3 calls for context
-                "outcome_breakdown": _get_status_breakdown(calls, 'outcome')
-            }
-    
-    # Process budget data
-    for platform, data in budget_data.items():
-        if 'error' not in data:
-            budget_info = data.get('budget_info', {})
-            context["budget_summary"][platform] = budget_info
+    Args:
+        session_id: Session id returned by /chat (for the same tenant)
+    """
+    if not get_session_store().delete(orchestrator.tenant, session_id):
+        raise HTTPException(status_code=404, detail=f"Chat session '{session_id}' not found or expired")
     
-    return context
+    return {"session_id": session_id, "status": "deleted"}
+
+def _conversation_history(session, chat_request: ChatMessage) -> List[Dict[str, str]]:
+    """Server-side history for the session, falling back to a client-sent history for new sessions"""
+    if session.total_messages:
+        return session.history()
+    return chat_request.conversation_history or []
 
-def _get_status_breakdown(items: List[Dict], field: str) -> Dict:
-    """Get breakdown by status/outcome field"""
-    breakdown = {}
-    for item in items:
-        status = item.get(field, 'Unknown')
-        breakdown[status] = breakdown.get(status, 0) + 1
-    return breakdown
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _chunk_text(text: str, chunk_size: int = 48) -> List[str]:
+    """Split text into chunks of roughly chunk_size characters on word boundaries"""
+    chunks = []
+    current = ""
+    for piece in re.findall(r'\S+\s*|\s+', text):
+        if current and len(current) + len(piece) > chunk_size:
+            chunks.append(current)
+            current = ""
+        current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+async def _build_chat_context(orchestrator, db: AsyncSession, user_message: str, intent: str, data: Dict[str, Dict]) -> Dict:
+    """Build the AI context from whichever data sources were loaded for the intent"""
+    # Cache versions are per tenant, so the tenant is part of the key
+    versions = [('tenant', orchestrator.tenant)]
+    for source in sorted(data):
+        if source == 'health':
+            # Not cached: keyed by the fields the context takes from it instead
+            versions.append((source, tuple(sorted(
+                (platform, status.get('status'), status.get('authenticated', False))
+                for platform, status in data[source].items()
+            ))))
+            continue
+        entry = orchestrator.cache.get_entry(f'chat:{source}')
+        versions.append((source, entry.version if entry else None))
+    
+    context = dict(context_builder.build(
+        data.get('leads', {}),
+        data.get('calls', {}),
+        data.get('budget', {}),
+        data.get('health', {}),
+        versions=tuple(versions)
+    ))
+    context['intent'] = intent
+    if intent == 'search':
+        context['search'] = await _search_for_chat(db, orchestrator.tenant, user_message)
+    return context
 
 async def _generate_ai_response(user_message: str, context: Dict, history: List[Dict]) -> str:
     """
@@ -406,6 +1214,7 @@ async def _generate_ai_response(user_message: str, context: Dict, history: List[
     """
     
     user_message_lower = user_message.lower()
+    intent = context.get('intent') or _classify_intent(user_message)
     
     # Check platform health first
     platforms_healthy = all(
@@ -418,8 +1227,24 @@ async def _generate_ai_response(user_message: str, context: Dict, history: List[
     
     # Conversational AI logic with context awareness
     
+    # Local full-text search ("find calls mentioning pricing")
+    if intent == 'search':
+        search = context.get('search', {})
+        results = search.get('results', [])
+        
+        if not search.get('query'):
+            return "🔍 What should I search for? Try something like \"find calls mentioning pricing\" or \"find leads at Acme\"."
+        if not results:
+            return f"🔍 I couldn't find anything matching **{search['query']}** in your synced data. Try a sync first if the data is new."
+        
+        response = f"🔍 **Results for \"{search['query']}\":**\n\n"
+        for i, hit in enumerate(results, 1):
+            label = hit['title'] or f"{hit['type'].title()} {hit['external_id']}"
+            response += f"{i}. [{hit['type']}] {label} - {hit['snippet']}\n"
+        return response
+    
     # Greeting and general questions
-    if any(word in user_message_lower for word in ['hello', 'hi', 'hey', 'good morning', 'good afternoon']):
+    elif intent == 'greeting':
         total_leads = sum(summary.get('total_count', 0) for summary in context['leads_summary'].values())
         total_calls = sum(summary.get('total_count', 0) for summary in context['calls_summary'].values())
         
@@ -433,7 +1258,7 @@ async def _generate_ai_response(user_message: str, context: Dict, history: List[
 I can help you analyze leads, review call performance, examine your sales pipeline, or answer any specific questions about your HubSpot data. What would you like to explore?"""
 
     # Lead-related queries
-    elif any(word in user_message_lower for word in ['lead', 'contact', 'prospect', 'customer']):
+    elif intent == 'leads':
         response = "📊 **Lead Analysis:**\n\n"
         
         for platform, summary in context['leads_summary'].items():
@@ -461,7 +1286,7 @@ I can help you analyze leads, review call performance, examine your sales pipeli
         return response
     
     # Call-related queries
-    elif any(word in user_message_lower for word in ['call', 'phone', 'conversation', 'talk']):
+    elif intent == 'calls':
         response = "📞 **Call Performance Analysis:**\n\n"
         
         for platform, summary in context['calls_summary'].items():
@@ -489,7 +1314,7 @@ I can help you analyze leads, review call performance, examine your sales pipeli
         return response
     
     # Budget/deal/revenue queries  
-    elif any(word in user_message_lower for word in ['budget', 'deal', 'revenue', 'pipeline', 'money', 'sales']):
+    elif intent == 'budget':
         response = "💰 **Sales Pipeline & Revenue Analysis:**\n\n"
         
         total_pipeline = 0
@@ -521,7 +1346,7 @@ I can help you analyze leads, review call performance, examine your sales pipeli
         return response
     
     # Sync/update queries
-    elif any(word in user_message_lower for word in ['sync', 'update', 'refresh', 'latest']):
+    elif intent == 'sync':
         return f"""🔄 **Data Synchronization:**
 
 ✅ Your data was last updated: {context['timestamp']}
@@ -531,7 +1356,7 @@ I can trigger a fresh sync with your HubSpot account to get the latest informati
 Would you like me to refresh your data now, or is there something specific you'd like me to analyze with the current data?"""
 
     # Help/capability queries
-    elif any(word in user_message_lower for word in ['help', 'what can you do', 'capabilities', 'features']):
+    elif intent == 'help':
         return """🤖 **I'm your HubSpot MCP Agent!** Here's what I can help you with:
 
 🔍 **Data Analysis:**
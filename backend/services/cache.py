@@ -0,0 +1,142 @@
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from services.shared_state import StateBackend, load_once
+
+@dataclass
+class CacheEntry:
+    """A cached value with the time it was stored and its data version"""
+    value: Any
+    stored_at: float
+    expires_at: float
+    version: int
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+class TTLCache:
+    """
+    In-memory cache with per-entry TTL and single-flight loading
+
+    Concurrent get_or_load() calls for the same missing key share one
+    loader call instead of each hitting the CRM. Every stored value gets a
+    new, monotonically increasing version so callers can tell when cached
+    data has changed.
+
+    With a shared backend, a local miss is served from the backend when
+    another worker process has already loaded the key, and only one process
+    at a time runs the loader for it (see load_once).
+    """
+
+    def __init__(self,
+                 default_ttl: float = 60.0,
+                 shared: Optional[StateBackend] = None,
+                 namespace: str = ''):
+        """
+        Args:
+            default_ttl: Seconds an entry stays fresh unless a ttl is given
+            shared: State backend shared with other worker processes
+            namespace: Prefix for this cache's keys in the shared backend
+        """
+        self.default_ttl = default_ttl
+        self.shared = shared
+        self.namespace = namespace
+        self._entries: Dict[str, CacheEntry] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._versions = itertools.count(1)
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Get the entry for a key, fresh or stale"""
+        return self._entries.get(key)
+
+    def get(self, key: str) -> Any:
+        """Get a fresh cached value, or None"""
+        entry = self._entries.get(key)
+        if entry and entry.is_fresh():
+            return entry.value
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> CacheEntry:
+        """Store a value and assign it a new version"""
+        now = time.monotonic()
+        entry = CacheEntry(
+            value=value,
+            stored_at=now,
+            expires_at=now + (self.default_ttl if ttl is None else ttl),
+            version=next(self._versions)
+        )
+        self._entries[key] = entry
+        return entry
+
+    def invalidate(self, prefix: str = ''):
+        """Drop every entry whose key starts with prefix (all entries by default)"""
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    async def invalidate_shared(self, prefix: str = ''):
+        """
+        Like invalidate(), but also drop the entries from the shared backend
+
+        Other processes keep their local copies until those expire.
+        """
+        self.invalidate(prefix)
+        if self.shared:
+            await self.shared.delete_prefix(self._shared_key(prefix))
+
+    def _shared_key(self, key: str) -> str:
+        return f'{self.namespace}cache:{key}'
+
+    async def _load_shared(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: float):
+        """Load through the shared backend; returns the value and its remaining ttl"""
+        async def load():
+            return {'value': await loader(), 'expires_at': time.time() + ttl}
+
+        stored = await load_once(self.shared, self._shared_key(key), load, ttl)
+        return stored['value'], max(0.0, stored['expires_at'] - time.time())
+
+    async def get_or_load(self,
+                          key: str,
+                          loader: Callable[[], Awaitable[Any]],
+                          ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached value for key, loading it if missing or expired
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing the value
+            ttl: Freshness in seconds (defaults to default_ttl)
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        entry = self._entries.get(key)
+        if entry and entry.is_fresh():
+            return entry.value
+
+        inflight = self._inflight.get(key)
+        if inflight:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if self.shared:
+                value, ttl = await self._load_shared(key, loader, self.default_ttl if ttl is None else ttl)
+            else:
+                value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+        self.set(key, value, ttl)
+        future.set_result(value)
+        return value
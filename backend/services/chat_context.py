@@ -0,0 +1,198 @@
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+# Rough bytes-per-token ratio for English/JSON prompt text
+BYTES_PER_TOKEN = 4
+
+DEFAULT_MAX_BYTES = int(os.getenv('CHAT_CONTEXT_MAX_BYTES', '6000'))
+
+RECENT_LEADS = 5
+RECENT_CALLS = 3
+MAX_BREAKDOWN_ENTRIES = 10
+MAX_NOTES_CHARS = 200
+
+def _size(value: Any) -> int:
+    """Serialized size in bytes, as the context would appear in a prompt"""
+    return len(json.dumps(value, default=str, separators=(',', ':')).encode())
+
+def _iso(value: Any) -> Optional[str]:
+    return value.isoformat() if isinstance(value, datetime) else value or None
+
+def _breakdown(items: List[Dict], field: str, max_entries: int) -> Dict[str, int]:
+    """Count items per field value, keeping the most common entries"""
+    counts = {}
+    for item in items:
+        key = item.get(field) or 'Unknown'
+        counts[key] = counts.get(key, 0) + 1
+    top = sorted(counts.items(), key=lambda entry: entry[1], reverse=True)[:max_entries]
+    return dict(top)
+
+def _lead_summary(lead: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'name': lead.get('name') or 'Unknown',
+        'email': lead.get('email') or '',
+        'status': lead.get('status') or 'Unknown',
+        'created_at': _iso(lead.get('created_at')),
+        'company': lead.get('company') or ''
+    }
+
+def _call_summary(call: Dict[str, Any]) -> Dict[str, Any]:
+    notes = call.get('notes') or ''
+    return {
+        'lead_external_id': call.get('lead_external_id'),
+        'direction': call.get('direction'),
+        'duration': call.get('duration') or 0,
+        'outcome': call.get('outcome'),
+        'created_at': _iso(call.get('created_at')),
+        'notes': notes[:MAX_NOTES_CHARS]
+    }
+
+class ChatContextBuilder:
+    """
+    Builds the chat/LLM context from MCP data within a fixed size budget
+
+    Aggregates (counts, durations, breakdowns, pipeline totals) are always
+    included. Per-record detail is added in priority order - the leads the
+    response shows first, then deal stages, call details and the remaining
+    leads - until the byte budget is used up. Raw CRM payloads never make it
+    into the context.
+
+    Built contexts are cached by the versions of the data they came from,
+    so repeated messages over unchanged data skip both compaction and
+    serialization.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, cache_size: int = 32):
+        """
+        Args:
+            max_bytes: Budget for the serialized context (CHAT_CONTEXT_MAX_BYTES by default)
+            cache_size: Number of built contexts to keep
+        """
+        self.max_bytes = max_bytes or DEFAULT_MAX_BYTES
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+
+    @property
+    def max_tokens(self) -> int:
+        return self.max_bytes // BYTES_PER_TOKEN
+
+    def build(self,
+              leads_data: Dict,
+              calls_data: Dict,
+              budget_data: Dict,
+              health_data: Dict,
+              versions: Optional[Tuple] = None) -> Dict:
+        """
+        Build (or reuse) a compacted context
+
+        Args:
+            leads_data/calls_data/budget_data/health_data: Orchestrator results per source
+            versions: Identifies the data versions the inputs came from; when
+                given, an identical earlier build is returned from cache
+
+        Returns:
+            Context dictionary, guaranteed to serialize within max_bytes
+            unless the aggregates alone exceed it
+        """
+        if versions is not None and versions in self._cache:
+            self._cache.move_to_end(versions)
+            return self._cache[versions]
+
+        context = self._compact(leads_data, calls_data, budget_data, health_data)
+
+        if versions is not None:
+            self._cache[versions] = context
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return context
+
+    def _compact(self, leads_data: Dict, calls_data: Dict, budget_data: Dict, health_data: Dict) -> Dict:
+        context = {
+            'timestamp': datetime.now().isoformat(),
+            'platforms_status': {
+                platform: {
+                    'status': status.get('status'),
+                    'authenticated': status.get('authenticated', False)
+                }
+                for platform, status in health_data.items()
+            },
+            'leads_summary': {},
+            'calls_summary': {},
+            'budget_summary': {},
+            'recent_activity': []
+        }
+
+        # (priority, target list or dict, key, item) - lower priority is added first
+        optional = []
+
+        for platform, data in leads_data.items():
+            if 'error' in data:
+                continue
+            leads = data.get('leads', [])
+            summary = {
+                'total_count': len(leads),
+                'recent_leads': [],
+                'status_breakdown': _breakdown(leads, 'status', MAX_BREAKDOWN_ENTRIES)
+            }
+            context['leads_summary'][platform] = summary
+            for i, lead in enumerate(leads[:RECENT_LEADS]):
+                optional.append((0 if i < 3 else 3, summary['recent_leads'], None, _lead_summary(lead)))
+
+        for platform, data in calls_data.items():
+            if 'error' in data:
+                continue
+            calls = data.get('calls', [])
+            total_duration = sum(call.get('duration') or 0 for call in calls)
+            summary = {
+                'total_count': len(calls),
+                'total_duration': total_duration,
+                'avg_duration': total_duration / len(calls) if calls else 0,
+                'recent_calls': [],
+                'outcome_breakdown': _breakdown(calls, 'outcome', MAX_BREAKDOWN_ENTRIES)
+            }
+            context['calls_summary'][platform] = summary
+            for call in calls[:RECENT_CALLS]:
+                optional.append((2, summary['recent_calls'], None, _call_summary(call)))
+
+        for platform, data in budget_data.items():
+            if 'error' in data:
+                continue
+            budget_info = data.get('budget_info', {})
+            summary = {key: value for key, value in budget_info.items() if key != 'deals_by_stage'}
+            summary['deals_by_stage'] = {}
+            context['budget_summary'][platform] = summary
+            stages = sorted(
+                budget_info.get('deals_by_stage', {}).items(),
+                key=lambda entry: entry[1].get('total_value', 0),
+                reverse=True
+            )
+            for stage, stats in stages:
+                optional.append((1, summary['deals_by_stage'], stage, stats))
+
+        # Reserve room for the size report itself (bytes can't exceed max_bytes)
+        context['context_size'] = {'bytes': self.max_bytes, 'max_bytes': self.max_bytes, 'truncated': False}
+        size = _size(context)
+        truncated = False
+
+        for _, target, key, item in sorted(optional, key=lambda entry: entry[0]):
+            # Each added item also costs a separator and, for dicts, its key
+            item_size = _size(item) + 1 + (_size(key) + 1 if key is not None else 0)
+            if size + item_size > self.max_bytes:
+                truncated = True
+                continue
+            if key is None:
+                target.append(item)
+            else:
+                target[key] = item
+            size += item_size
+
+        context['context_size'] = {
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'truncated': truncated
+        }
+        return context
@@ -0,0 +1,161 @@
+import os
+import secrets
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class ChatSession:
+    """
+    One conversation: the most recent messages plus a summary of older turns
+    """
+
+    def __init__(self, tenant: str, session_id: str, max_messages: int):
+        self.tenant = tenant
+        self.session_id = session_id
+        self.messages = deque(maxlen=max_messages)
+        self.summary = ''
+        self.total_messages = 0
+        self.created_at = datetime.now()
+        self.last_active = time.monotonic()
+
+    def history(self) -> List[Dict[str, str]]:
+        """Messages in the format the chat endpoints use, oldest first"""
+        history = list(self.messages)
+        if self.summary:
+            history.insert(0, {'type': 'summary', 'content': self.summary, 'timestamp': ''})
+        return history
+
+class ChatSessionStore:
+    """
+    Bounded in-memory store of server-side chat sessions
+
+    Sessions belong to a tenant: a session id only resolves for the tenant
+    that created it. Memory stays bounded on three axes:
+    - each session keeps at most max_messages (a ring buffer); older turns are
+      optionally folded into a short running summary instead of being kept
+    - at most max_sessions sessions exist; the least recently used is evicted
+    - sessions idle for longer than idle_ttl seconds expire
+    """
+
+    def __init__(self,
+                 max_sessions: int = 1000,
+                 max_messages: int = 20,
+                 idle_ttl: float = 1800,
+                 summarize: bool = True,
+                 max_summary_chars: int = 1000):
+        """
+        Args:
+            max_sessions: Sessions kept before evicting the least recently used
+            max_messages: Messages kept per session
+            idle_ttl: Seconds of inactivity before a session expires
+            summarize: Fold messages pushed out of the buffer into a summary
+            max_summary_chars: Upper bound on the summary length
+        """
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.idle_ttl = idle_ttl
+        self.summarize = summarize
+        self.max_summary_chars = max_summary_chars
+        # Ordered least to most recently used, which is also oldest to newest activity
+        self._sessions: OrderedDict = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> 'ChatSessionStore':
+        """Create a store configured from CHAT_* environment variables"""
+        return cls(
+            max_sessions=int(os.getenv('CHAT_MAX_SESSIONS', '1000')),
+            max_messages=int(os.getenv('CHAT_SESSION_MAX_MESSAGES', '20')),
+            idle_ttl=float(os.getenv('CHAT_SESSION_IDLE_SECONDS', '1800')),
+            summarize=os.getenv('CHAT_SESSION_SUMMARIZE', 'true').lower() in ('1', 'true', 'yes')
+        )
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, tenant: str, session_id: Optional[str]) -> Optional[ChatSession]:
+        """Get a tenant's live session and mark it as used, or None"""
+        self._expire_idle()
+        session = self._sessions.get((tenant, session_id)) if session_id else None
+        if session:
+            session.last_active = time.monotonic()
+            self._sessions.move_to_end((tenant, session_id))
+        return session
+
+    def get_or_create(self, tenant: str, session_id: Optional[str] = None) -> ChatSession:
+        """
+        Get a tenant's live session, or start a new one
+
+        Unknown or expired session ids (including other tenants' ones) get a
+        brand new session with a new id; callers should always use the id of
+        the returned session.
+        """
+        session = self.get(tenant, session_id)
+        if session:
+            return session
+
+        session = ChatSession(tenant, secrets.token_urlsafe(16), self.max_messages)
+        self._sessions[(tenant, session.session_id)] = session
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return session
+
+    def append(self, session: ChatSession, message_type: str, content: str):
+        """
+        Add a message to a session's buffer
+
+        Args:
+            session: Session to add to
+            message_type: 'user' or 'bot'
+            content: Message text
+        """
+        if self.summarize and len(session.messages) == session.messages.maxlen:
+            self._fold_into_summary(session, session.messages[0])
+
+        session.messages.append({
+            'type': message_type,
+            'content': content,
+            'timestamp': datetime.now().isoformat()
+        })
+        session.total_messages += 1
+        session.last_active = time.monotonic()
+
+    def delete(self, tenant: str, session_id: str) -> bool:
+        """Forget a tenant's session; returns False if it didn't exist"""
+        return self._sessions.pop((tenant, session_id), None) is not None
+
+    def _fold_into_summary(self, session: ChatSession, message: Dict[str, str]):
+        """
+        Keep the gist of a message that is about to leave the buffer
+
+        Only user turns are kept (the bot's replies are regenerated from
+        live data anyway), each cut to its first line. The oldest entries
+        are dropped once the summary would exceed max_summary_chars.
+        """
+        if message['type'] != 'user':
+            return
+
+        gist = message['content'].strip().splitlines()[0][:120] if message['content'].strip() else ''
+        if not gist:
+            return
+
+        entries = [entry for entry in session.summary.split(' | ') if entry] + [gist]
+        while entries and len(' | '.join(entries)) > self.max_summary_chars:
+            entries.pop(0)
+        session.summary = ' | '.join(entries)
+
+    def _expire_idle(self):
+        """Drop idle sessions; they sit at the front of the LRU order"""
+        cutoff = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if session.last_active >= cutoff:
+                break
+            del self._sessions[key]
+
+# Global session store instance
+session_store = ChatSessionStore.from_env()
+
+def get_session_store() -> ChatSessionStore:
+    """Get the global chat session store"""
+    return session_store
@@ -0,0 +1,137 @@
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an MCP whose circuit is open"""
+
+    def __init__(self, name: str, retry_after: float, cached: Any = None):
+        self.name = name
+        self.retry_after = retry_after
+        # Last successful result of the rejected call, if the caller kept one
+        self.cached = cached
+        super().__init__(f"Circuit for '{name}' is open; retry in {retry_after:.0f}s")
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one MCP connector
+
+    - closed: calls go through; outcomes are recorded in a rolling window.
+      Once the window holds at least min_calls outcomes and the failure rate
+      reaches failure_rate_threshold, the circuit opens.
+    - open: calls are rejected immediately for open_seconds.
+    - half_open: up to half_open_max_calls probe calls are let through. A
+      successful probe closes the circuit; a failed one re-opens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self,
+                 failure_rate_threshold: float = 0.5,
+                 min_calls: int = 5,
+                 window_size: int = 20,
+                 open_seconds: float = 30.0,
+                 half_open_max_calls: int = 1):
+        """
+        Args:
+            failure_rate_threshold: Failure ratio (0-1) in the window that opens the circuit
+            min_calls: Outcomes needed in the window before the rate is trusted
+            window_size: Number of most recent outcomes considered
+            open_seconds: How long the circuit stays open before probing
+            half_open_max_calls: Concurrent probe calls allowed while half-open
+        """
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = self.CLOSED
+        self._outcomes = deque(maxlen=window_size)
+        self._opened_at: Optional[float] = None
+        self._probes_in_flight = 0
+        self.total_failures = 0
+        self.total_rejections = 0
+        self.last_failure: Optional[str] = None
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit starts probing again"""
+        if self.state != self.OPEN or self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed; every allowed call must be followed
+        by record_success(), record_failure() or record_ignored()
+        """
+        if self.state == self.OPEN:
+            if self.retry_after() > 0:
+                self.total_rejections += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._probes_in_flight = 0
+
+        if self.state == self.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_max_calls:
+                self.total_rejections += 1
+                return False
+            self._probes_in_flight += 1
+
+        return True
+
+    def record_success(self):
+        if self.state == self.HALF_OPEN:
+            self._close()
+            return
+        self._outcomes.append(True)
+
+    def record_failure(self, error: Optional[Exception] = None):
+        self.total_failures += 1
+        self.last_failure = str(error) if error else None
+
+        if self.state == self.HALF_OPEN:
+            self._open()
+            return
+
+        self._outcomes.append(False)
+        if len(self._outcomes) >= self.min_calls and self.failure_rate() >= self.failure_rate_threshold:
+            self._open()
+
+    def record_ignored(self):
+        """The call ended in a way that says nothing about upstream health"""
+        if self.state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def status(self) -> Dict[str, Any]:
+        """Current state for health/platform endpoints"""
+        if self.state == self.OPEN and self.retry_after() == 0:
+            state = self.HALF_OPEN  # will probe on the next call
+        else:
+            state = self.state
+        return {
+            'state': state,
+            'failure_rate': round(self.failure_rate(), 3),
+            'window_calls': len(self._outcomes),
+            'retry_after_seconds': round(self.retry_after(), 1),
+            'total_failures': self.total_failures,
+            'total_rejections': self.total_rejections,
+            'last_failure': self.last_failure
+        }
+
+    def _open(self):
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probes_in_flight = 0
+
+    def _close(self):
+        self.state = self.CLOSED
+        self._opened_at = None
+        self._probes_in_flight = 0
+        self._outcomes.clear()
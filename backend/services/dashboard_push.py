@@ -0,0 +1,272 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi import WebSocket
+from fastapi.encoders import jsonable_encoder
+
+from database import SessionLocal
+from services import local_store
+from services.mcp_orchestrator import MCPOrchestrator, get_orchestrator, get_orchestrators
+
+# Summary fields that change on every recomputation; on their own they aren't pushed
+VOLATILE_FIELDS = {'last_updated'}
+
+# Seconds a client gets to take an update before it is disconnected
+SEND_TIMEOUT_SECONDS = 10.0
+
+def merge_patch(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON merge patch (RFC 7386) that turns old into new
+
+    Nested objects are diffed key by key; other values, lists included, are
+    replaced whole. Removed keys map to None (so on the client, a value that
+    became null reads as removed).
+    """
+    patch = {key: None for key in old if key not in new}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested = merge_patch(old[key], value)
+            if nested:
+                patch[key] = nested
+        elif value != old[key]:
+            patch[key] = value
+    return patch
+
+class _Subscriber:
+    """An open dashboard connection and the summary it was last sent"""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.version = 0  # 0: nothing sent yet
+        self.summary: Optional[Dict[str, Any]] = None
+        self.sent_at = 0.0
+        self.wake = asyncio.Event()
+
+class DashboardBroadcaster:
+    """
+    Pushes a tenant's dashboard summary to WebSocket subscribers as it changes
+
+    While anyone is subscribed, a watcher recomputes the summary once per
+    data change - right after a sync or reconciliation in this process, or
+    when the tenant's change log version moves (syncs by other workers or
+    sync_runner), checked every poll_interval seconds. Each new summary
+    with different aggregates gets a version; subscribers receive a merge
+    patch from the version they have to the current one.
+
+    Updates are coalesced per connection: a client is sent at most one
+    message per min_interval, covering every change since its last one.
+    Each patch is serialized once per (from, to) version pair, however
+    many connections it goes to.
+    """
+
+    def __init__(self,
+                 orchestrator: MCPOrchestrator,
+                 min_interval: float = 2.0,
+                 poll_interval: float = 5.0):
+        """
+        Args:
+            orchestrator: Orchestrator whose dashboard is pushed
+            min_interval: Minimum seconds between two messages to one client
+            poll_interval: Seconds between change log checks
+        """
+        self.orchestrator = orchestrator
+        self.min_interval = min_interval
+        self.poll_interval = poll_interval
+        self.version = 0
+        self.summary: Optional[Dict[str, Any]] = None
+        self._subscribers: Set[_Subscriber] = set()
+        self._messages: Dict[int, str] = {}
+        self._refresh_lock = asyncio.Lock()
+        self._changed = asyncio.Event()
+        self._watcher: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def serve(self, websocket: WebSocket):
+        """
+        Send the current summary to an accepted WebSocket, then updates
+        until the client disconnects (or stops taking them)
+        """
+        subscriber = _Subscriber(websocket)
+        self._subscribers.add(subscriber)
+        self._start_watcher()
+        tasks = []
+        try:
+            try:
+                await self.refresh()
+            except Exception as e:
+                # The watcher keeps trying; the summary goes out once there is one
+                print(f"Loading the dashboard for tenant '{self.orchestrator.tenant}' failed: {e}")
+            subscriber.wake.set()  # the first message is the full summary
+            tasks = [
+                asyncio.ensure_future(self._send_updates(subscriber)),
+                asyncio.ensure_future(self._receive_until_closed(websocket))
+            ]
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception():
+                    print(f"Dashboard push to a client of tenant '{self.orchestrator.tenant}' failed: {task.exception()!r}")
+                    await self._close(websocket, code=1011)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._subscribers.discard(subscriber)
+            if not self._subscribers:
+                self._stop_watcher()
+
+    async def refresh(self, reload: bool = False):
+        """
+        Recompute the summary (once, for every subscriber) and wake the
+        subscribers if its aggregates changed
+
+        Args:
+            reload: Drop this process's cached summary first (it predates a
+                change made by another process)
+        """
+        async with self._refresh_lock:
+            if reload:
+                self.orchestrator.cache.invalidate('dashboard')
+            summary = await self.orchestrator.get_cached('dashboard', self.orchestrator.get_dashboard_summary)
+            if not isinstance(summary, dict) or 'error' in summary:
+                # Keep the last good summary rather than pushing the failure
+                return
+            summary = jsonable_encoder(summary)
+            if self.summary is not None and not (set(merge_patch(self.summary, summary)) - VOLATILE_FIELDS):
+                return
+            self.summary = summary
+            self.version += 1
+            self._messages.clear()
+            for subscriber in self._subscribers:
+                subscriber.wake.set()
+
+    async def stop(self):
+        """Stop watching and disconnect every subscriber (on shutdown)"""
+        for subscriber in list(self._subscribers):
+            await self._close(subscriber.websocket, code=1001)
+        watcher = self._watcher
+        self._stop_watcher()
+        if watcher:
+            try:
+                await watcher
+            except asyncio.CancelledError:
+                pass
+
+    def _message(self, subscriber: _Subscriber) -> str:
+        """Serialized update from the subscriber's version to the current one"""
+        message = self._messages.get(subscriber.version)
+        if message is None:
+            if subscriber.summary is None:
+                payload = {'type': 'snapshot', 'version': self.version, 'data': self.summary}
+            else:
+                payload = {
+                    'type': 'patch',
+                    'version': self.version,
+                    'from_version': subscriber.version,
+                    'patch': merge_patch(subscriber.summary, self.summary)
+                }
+            message = json.dumps(payload, separators=(',', ':'))
+            self._messages[subscriber.version] = message
+        return message
+
+    async def _send_updates(self, subscriber: _Subscriber):
+        while True:
+            await subscriber.wake.wait()
+            # Changes arriving until the client may be sent again go out as one patch
+            delay = subscriber.sent_at + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            subscriber.wake.clear()
+            if self.summary is None or subscriber.version == self.version:
+                continue
+            version, summary = self.version, self.summary
+            await asyncio.wait_for(subscriber.websocket.send_text(self._message(subscriber)), SEND_TIMEOUT_SECONDS)
+            subscriber.version, subscriber.summary = version, summary
+            subscriber.sent_at = time.monotonic()
+
+    async def _receive_until_closed(self, websocket: WebSocket):
+        # Clients have nothing to say; reading just notices the disconnect
+        while (await websocket.receive())['type'] != 'websocket.disconnect':
+            pass
+
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass  # already closed
+
+    def _start_watcher(self):
+        if self._watcher is None or self._watcher.done():
+            self.orchestrator.add_data_listener(self._changed.set)
+            self._watcher = asyncio.create_task(self._watch())
+
+    def _stop_watcher(self):
+        # Not awaited, so a subscriber arriving meanwhile starts a new watcher
+        self.orchestrator.remove_data_listener(self._changed.set)
+        if self._watcher:
+            self._watcher.cancel()
+            self._watcher = None
+        # Nobody is left to patch; the next subscriber starts from a fresh summary
+        self.summary = None
+        self._messages.clear()
+
+    async def _change_version(self) -> int:
+        async with SessionLocal() as db:
+            return await local_store.change_log_version(db, self.orchestrator.tenant)
+
+    async def _watch(self):
+        seen = None
+        while True:
+            try:
+                if seen is None:
+                    seen = await self._change_version()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                notified = self._changed.is_set()
+                self._changed.clear()
+
+                version = await self._change_version()
+                # A sync of this process notifies once it's done; reloading
+                # for each batch it writes would only compete with it for the CRM
+                changed_elsewhere = version != seen and not notified and not self.orchestrator.is_syncing
+                seen = version
+                if notified or changed_elsewhere or self.summary is None:
+                    await self.refresh(reload=changed_elsewhere)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Dashboard push for tenant '{self.orchestrator.tenant}' failed: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+# Dashboard broadcaster per tenant, created on first use
+dashboard_broadcasters: Dict[str, DashboardBroadcaster] = {}
+
+def get_dashboard_broadcaster(tenant: Optional[str] = None) -> DashboardBroadcaster:
+    """
+    Get a tenant's dashboard broadcaster
+
+    Args:
+        tenant: Tenant id (defaults to the default tenant)
+    """
+    orchestrator = get_orchestrator(tenant)
+    broadcaster = dashboard_broadcasters.get(orchestrator.tenant)
+    if broadcaster is None or broadcaster.orchestrator is not orchestrator:
+        broadcaster = DashboardBroadcaster(
+            orchestrator,
+            min_interval=float(os.getenv('DASHBOARD_PUSH_MIN_INTERVAL_SECONDS', '2')),
+            poll_interval=float(os.getenv('DASHBOARD_PUSH_POLL_SECONDS', '5'))
+        )
+        dashboard_broadcasters[orchestrator.tenant] = broadcaster
+    return broadcaster
+
+def get_dashboard_broadcasters() -> List[DashboardBroadcaster]:
+    """Get the dashboard broadcasters of all tenants"""
+    return [get_dashboard_broadcaster(tenant) for tenant in get_orchestrators()]
@@ -0,0 +1,205 @@
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from services.circuit_breaker import CircuitOpenError
+from services.mcp_orchestrator import MCPOrchestrator, get_orchestrator, get_orchestrators
+
+class ProbeStats:
+    """Rolling latency/error statistics over the most recent probes of one MCP"""
+
+    def __init__(self, window: int = 20):
+        self._probes = deque(maxlen=window)
+        self.total_probes = 0
+        self.total_errors = 0
+        self.last_ok_at: Optional[datetime] = None
+        self.last_error_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    def record(self, latency_ms: Optional[float], ok: bool, error: Optional[str] = None):
+        """
+        Args:
+            latency_ms: Round-trip time, or None if no request was made
+            ok: Whether the probe succeeded
+            error: Failure message
+        """
+        self._probes.append((latency_ms, ok))
+        self.total_probes += 1
+        if ok:
+            self.last_ok_at = datetime.now()
+        else:
+            self.total_errors += 1
+            self.last_error_at = datetime.now()
+            self.last_error = error
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(latency for latency, _ in self._probes if latency is not None)
+        errors = sum(1 for _, ok in self._probes if not ok)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1)
+
+        return {
+            'window_probes': len(self._probes),
+            'window_errors': errors,
+            'error_rate': round(errors / len(self._probes), 3) if self._probes else 0.0,
+            'latency_ms': {
+                'avg': round(sum(latencies) / len(latencies), 1) if latencies else None,
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'max': round(latencies[-1], 1) if latencies else None
+            },
+            'total_probes': self.total_probes,
+            'total_errors': self.total_errors,
+            'last_ok_at': self.last_ok_at.isoformat() if self.last_ok_at else None,
+            'last_error_at': self.last_error_at.isoformat() if self.last_error_at else None,
+            'last_error': self.last_error
+        }
+
+class HealthProber:
+    """
+    Probes every registered MCP on a fixed cadence and caches the result
+
+    Health endpoints read the cached snapshot instead of calling the CRM on
+    every poll. Probes go through the orchestrator's circuit breakers, so a
+    failing platform is probed at most once per open period and a recovered
+    one closes its circuit on the next successful probe.
+    """
+
+    def __init__(self,
+                 orchestrator: MCPOrchestrator,
+                 interval: float = 30.0,
+                 window: int = 20):
+        """
+        Args:
+            orchestrator: Orchestrator whose MCPs are probed
+            interval: Seconds between probe rounds
+            window: Number of recent probes kept for stats
+        """
+        self.orchestrator = orchestrator
+        self.interval = interval
+        self.window = window
+        self.stats: Dict[str, ProbeStats] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._probing: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background probe loop (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background probe loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get_health(self, deep: bool = False) -> Dict[str, Any]:
+        """
+        Get health for all MCPs
+
+        Args:
+            deep: Probe every MCP now instead of returning the cached result
+
+        Returns:
+            Dictionary with health status for each MCP
+        """
+        if deep or set(self._results) != set(self.orchestrator.mcps):
+            await self.probe_once()
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Last probe results with the current circuit state; never calls the CRM"""
+        return {
+            name: {**result, 'circuit': self.orchestrator.circuit_status(name)}
+            for name, result in self._results.items()
+            if name in self.orchestrator.mcps
+        }
+
+    async def probe_once(self) -> Dict[str, Any]:
+        """
+        Probe all MCPs concurrently and update the cached results
+
+        Concurrent callers share the probe round already in progress.
+        """
+        if self._probing is None or self._probing.done():
+            self._probing = asyncio.ensure_future(self._probe_all())
+        await asyncio.shield(self._probing)
+        return self.snapshot()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                print(f"Health probe error: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _probe_all(self):
+        names = list(self.orchestrator.mcps)
+        await asyncio.gather(*(self._probe(name) for name in names))
+        self.orchestrator.last_health_check = datetime.now()
+
+    async def _probe(self, name: str):
+        mcp = self.orchestrator.mcps[name]
+        stats = self.stats.setdefault(name, ProbeStats(self.window))
+
+        started = time.perf_counter()
+        latency_ms = None
+        try:
+            authenticated = await self.orchestrator.call_mcp(name, 'authenticate', keep_last_good=False)
+            latency_ms = (time.perf_counter() - started) * 1000
+            message = 'Connection active' if authenticated else 'Authentication failed'
+        except CircuitOpenError as e:
+            authenticated = False
+            message = str(e)
+        except Exception as e:
+            latency_ms = (time.perf_counter() - started) * 1000
+            authenticated = False
+            message = f'Health check failed: {str(e)}'
+
+        stats.record(latency_ms, authenticated, None if authenticated else message)
+        self._results[name] = {
+            'status': 'healthy' if authenticated else 'unhealthy',
+            'message': message,
+            'authenticated': mcp.is_authenticated,
+            'last_sync': mcp.last_sync,
+            'checked_at': datetime.now().isoformat(),
+            'latency_ms': round(latency_ms, 1) if latency_ms is not None else None,
+            'stats': stats.summary()
+        }
+
+# Health prober per tenant, created on first use
+health_probers: Dict[str, HealthProber] = {}
+
+def get_health_prober(tenant: Optional[str] = None) -> HealthProber:
+    """
+    Get a tenant's health prober
+    
+    Args:
+        tenant: Tenant id (defaults to the default tenant)
+    """
+    orchestrator = get_orchestrator(tenant)
+    prober = health_probers.get(orchestrator.tenant)
+    if prober is None or prober.orchestrator is not orchestrator:
+        prober = HealthProber(
+            orchestrator,
+            interval=float(os.getenv('HEALTH_PROBE_INTERVAL_SECONDS', '30')),
+            window=int(os.getenv('HEALTH_PROBE_WINDOW', '20'))
+        )
+        health_probers[orchestrator.tenant] = prober
+    return prober
+
+def get_health_probers() -> List[HealthProber]:
+    """Get the health probers of all tenants"""
+    return [get_health_prober(tenant) for tenant in get_orchestrators()]
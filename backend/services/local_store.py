@@ -0,0 +1,630 @@
+import base64
+import json
+from typing import Dict, List, Any, Optional
+from datetime import datetime
+from sqlalchemy import and_, delete, func, insert, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Lead, Call, Deal, RecordChange
+from services import search_index
+
+# Columns that query endpoints may sort by (keyset pagination uses column + id)
+LEAD_SORT_FIELDS = {
+    'created_at': Lead.created_at,
+    'updated_at': Lead.updated_at,
+    'name': Lead.name,
+}
+CALL_SORT_FIELDS = {
+    'created_at': Call.created_at,
+    'duration': Call.duration,
+}
+
+# Stored record kinds: model and search document type
+RECORD_KINDS = {
+    'leads': (Lead, 'lead'),
+    'calls': (Call, 'call'),
+    'deals': (Deal, 'deal'),
+}
+
+MAX_PAGE_SIZE = 500
+UPSERT_CHUNK_SIZE = 500
+
+def _email_domain(email: Optional[str]) -> Optional[str]:
+    if not email or '@' not in email:
+        return None
+    return email.rsplit('@', 1)[1].strip().lower() or None
+
+def _lead_columns(lead: Dict[str, Any]) -> Dict[str, Any]:
+    company = lead.get('company')
+    return {
+        'name': lead.get('name'),
+        'email': lead.get('email'),
+        'email_domain': _email_domain(lead.get('email')),
+        'phone': lead.get('phone'),
+        'company': company,
+        'company_key': company.strip().lower() if company else None,
+        'status': lead.get('status'),
+        'source': lead.get('source'),
+        'created_at': lead.get('created_at'),
+        'updated_at': lead.get('updated_at'),
+        'raw_data': lead.get('raw_data'),
+    }
+
+def _call_columns(call: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'lead_external_id': call.get('lead_external_id'),
+        'direction': call.get('direction'),
+        'duration': call.get('duration') or 0,
+        'outcome': call.get('outcome'),
+        'notes': call.get('notes'),
+        'recording_url': call.get('recording_url'),
+        'created_at': call.get('created_at'),
+        'raw_data': call.get('raw_data'),
+    }
+
+def _deal_columns(deal: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'name': deal.get('name'),
+        'amount': deal.get('amount') or 0,
+        'stage': deal.get('stage'),
+        'probability': deal.get('probability'),
+        'close_date': deal.get('close_date'),
+        'created_at': deal.get('created_at'),
+        'raw_data': deal.get('raw_data'),
+    }
+
+async def _log_changes(db: AsyncSession, kind: str, tenant: str, platform: str, changes: List[tuple]):
+    """
+    Record (external id, operation) changes in the change log
+
+    Each record's previous entry is replaced by one under a new version.
+    Runs inside the caller's transaction, so the log commits with the data.
+    """
+    if not changes:
+        return
+    changed_at = datetime.now()
+    await db.execute(delete(RecordChange).where(
+        RecordChange.tenant == tenant,
+        RecordChange.kind == kind,
+        RecordChange.platform == platform,
+        RecordChange.external_id.in_([external_id for external_id, _ in changes])
+    ))
+    await db.execute(insert(RecordChange), [
+        {'tenant': tenant, 'kind': kind, 'platform': platform, 'external_id': external_id,
+         'operation': operation, 'changed_at': changed_at}
+        for external_id, operation in changes
+    ])
+
+async def _upsert(db: AsyncSession, kind: str, tenant: str, platform: str, records: List[Dict[str, Any]],
+                  to_columns, to_text) -> int:
+    """
+    Insert or update normalized records keyed by (tenant, platform, external_id)
+
+    Only records whose searchable text is new or changed are re-indexed,
+    so repeated syncs leave the search index untouched for unchanged rows.
+    Likewise only new and changed records go to the change log. Each chunk
+    is committed on its own, so a large sync never holds the write lock
+    for long and reads keep being served in between.
+    """
+    model, doc_type = RECORD_KINDS[kind]
+    synced_at = datetime.now()
+    by_id = {str(record['external_id']): record for record in records if record.get('external_id')}
+    external_ids = list(by_id)
+
+    for start in range(0, len(external_ids), UPSERT_CHUNK_SIZE):
+        chunk = external_ids[start:start + UPSERT_CHUNK_SIZE]
+        existing = {
+            row.external_id: row
+            for row in await db.scalars(
+                select(model).where(
+                    model.tenant == tenant, model.platform == platform, model.external_id.in_(chunk)
+                )
+            )
+        }
+
+        to_index = []
+        changes = []
+        for external_id in chunk:
+            columns = to_columns(by_id[external_id])
+            searchable = to_text(columns)
+            row = existing.get(external_id)
+            if row is None:
+                row = model(tenant=tenant, platform=platform, external_id=external_id, synced_at=synced_at, **columns)
+                db.add(row)
+                to_index.append((row, searchable))
+                changes.append((external_id, 'insert'))
+            else:
+                previous = {key: getattr(row, key) for key in columns}
+                for key, value in columns.items():
+                    setattr(row, key, value)
+                row.synced_at = synced_at
+                if searchable != to_text(previous):
+                    to_index.append((row, searchable))
+                if columns != previous:
+                    changes.append((external_id, 'update'))
+
+        if to_index:
+            await db.flush()  # assigns ids to new rows
+            await search_index.index_documents(db, doc_type, [
+                (row.id, tenant, platform, row.external_id, title, body) for row, (title, body) in to_index
+            ])
+        await _log_changes(db, kind, tenant, platform, changes)
+
+        await db.commit()
+
+    return len(external_ids)
+
+async def upsert_leads(db: AsyncSession, tenant: str, platform: str, leads: List[Dict[str, Any]]) -> int:
+    """
+    Store normalized leads for a tenant's platform
+
+    Args:
+        db: Database session
+        tenant: Tenant the records belong to
+        platform: Platform key (e.g. 'hubspot')
+        leads: Leads in normalized format
+
+    Returns:
+        Number of leads written
+    """
+    return await _upsert(db, 'leads', tenant, platform, leads, _lead_columns, search_index.lead_text)
+
+async def upsert_calls(db: AsyncSession, tenant: str, platform: str, calls: List[Dict[str, Any]]) -> int:
+    """
+    Store normalized call records for a tenant's platform
+
+    Args:
+        db: Database session
+        tenant: Tenant the records belong to
+        platform: Platform key (e.g. 'hubspot')
+        calls: Calls in normalized format
+
+    Returns:
+        Number of calls written
+    """
+    return await _upsert(db, 'calls', tenant, platform, calls, _call_columns, search_index.call_text)
+
+async def upsert_deals(db: AsyncSession, tenant: str, platform: str, deals: List[Dict[str, Any]]) -> int:
+    """
+    Store normalized deals for a tenant's platform
+
+    Args:
+        db: Database session
+        tenant: Tenant the records belong to
+        platform: Platform key (e.g. 'hubspot')
+        deals: Deals in normalized format
+
+    Returns:
+        Number of deals written
+    """
+    return await _upsert(db, 'deals', tenant, platform, deals, _deal_columns, search_index.deal_text)
+
+async def list_external_ids(db: AsyncSession, kind: str, tenant: str, platform: str) -> List[str]:
+    """
+    External ids of every record of a kind stored for a tenant's platform
+
+    Args:
+        db: Database session
+        kind: 'leads', 'calls' or 'deals'
+        tenant: Tenant the records belong to
+        platform: Platform key (e.g. 'hubspot')
+    """
+    model = RECORD_KINDS[kind][0]
+    return list(await db.scalars(
+        select(model.external_id).where(model.tenant == tenant, model.platform == platform)
+    ))
+
+async def delete_records(db: AsyncSession, kind: str, tenant: str, platform: str, external_ids: List[str]) -> int:
+    """
+    Delete stored records (and their search documents), e.g. ones deleted in the CRM
+
+    Like upserts, each chunk is committed on its own, and the deletions
+    are recorded in the change log.
+
+    Args:
+        db: Database session
+        kind: 'leads', 'calls' or 'deals'
+        tenant: Tenant the records belong to (other tenants' records are never touched)
+        platform: Platform key (e.g. 'hubspot')
+        external_ids: Records to delete; unknown ids are ignored
+
+    Returns:
+        Number of records deleted
+    """
+    model, doc_type = RECORD_KINDS[kind]
+    external_ids = [str(external_id) for external_id in external_ids]
+    deleted = 0
+
+    for start in range(0, len(external_ids), UPSERT_CHUNK_SIZE):
+        chunk = external_ids[start:start + UPSERT_CHUNK_SIZE]
+        rows = (await db.execute(
+            select(model.id, model.external_id).where(
+                model.tenant == tenant, model.platform == platform, model.external_id.in_(chunk)
+            )
+        )).all()
+        if rows:
+            row_ids = [row.id for row in rows]
+            await search_index.remove_documents(db, doc_type, row_ids)
+            await db.execute(delete(model).where(model.id.in_(row_ids)))
+            await _log_changes(db, kind, tenant, platform, [(row.external_id, 'delete') for row in rows])
+            await db.commit()
+            deleted += len(row_ids)
+
+    return deleted
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Encode the last row's (sort value, id) as an opaque pagination cursor"""
+    if isinstance(sort_value, datetime):
+        payload = {'t': 'dt', 'v': sort_value.isoformat(), 'id': row_id}
+    else:
+        payload = {'t': 'raw', 'v': sort_value, 'id': row_id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value = payload['v']
+        if payload['t'] == 'dt' and value is not None:
+            value = datetime.fromisoformat(value)
+        return value, int(payload['id'])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+async def _keyset_page(db: AsyncSession, model, filters: List[Any], sort_column, descending: bool,
+                       limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Run a filtered query ordered by (sort_column, id) and return one page
+
+    NULL sort values come first in ascending order and last in descending
+    order, so every row has a stable position and pages never overlap.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    conditions = list(filters)
+
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        if descending:
+            if value is None:
+                conditions.append(and_(sort_column.is_(None), model.id < last_id))
+            else:
+                conditions.append(or_(
+                    sort_column < value,
+                    and_(sort_column == value, model.id < last_id),
+                    sort_column.is_(None)
+                ))
+        else:
+            if value is None:
+                conditions.append(or_(
+                    and_(sort_column.is_(None), model.id > last_id),
+                    sort_column.isnot(None)
+                ))
+            else:
+                conditions.append(or_(
+                    sort_column > value,
+                    and_(sort_column == value, model.id > last_id)
+                ))
+
+    if descending:
+        order = (sort_column.desc().nulls_last(), model.id.desc())
+    else:
+        order = (sort_column.asc().nulls_first(), model.id.asc())
+
+    rows = list(await db.scalars(select(model).where(*conditions).order_by(*order).limit(limit + 1)))
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+
+    return {'rows': rows, 'next_cursor': next_cursor}
+
+def _lead_to_dict(row: Lead, include_raw: bool) -> Dict[str, Any]:
+    lead = {
+        'platform': row.platform,
+        'external_id': row.external_id,
+        'name': row.name,
+        'email': row.email,
+        'phone': row.phone,
+        'company': row.company,
+        'status': row.status,
+        'source': row.source,
+        'created_at': row.created_at,
+        'updated_at': row.updated_at,
+        'synced_at': row.synced_at,
+    }
+    if include_raw:
+        lead['raw_data'] = row.raw_data
+    return lead
+
+def _call_to_dict(row: Call, include_raw: bool) -> Dict[str, Any]:
+    call = {
+        'platform': row.platform,
+        'external_id': row.external_id,
+        'lead_external_id': row.lead_external_id,
+        'direction': row.direction,
+        'duration': row.duration,
+        'outcome': row.outcome,
+        'notes': row.notes,
+        'recording_url': row.recording_url,
+        'created_at': row.created_at,
+        'synced_at': row.synced_at,
+    }
+    if include_raw:
+        call['raw_data'] = row.raw_data
+    return call
+
+def _deal_to_dict(row: Deal, include_raw: bool) -> Dict[str, Any]:
+    deal = {
+        'platform': row.platform,
+        'external_id': row.external_id,
+        'name': row.name,
+        'amount': row.amount,
+        'stage': row.stage,
+        'probability': row.probability,
+        'close_date': row.close_date,
+        'created_at': row.created_at,
+        'synced_at': row.synced_at,
+    }
+    if include_raw:
+        deal['raw_data'] = row.raw_data
+    return deal
+
+RECORD_TO_DICT = {
+    'leads': _lead_to_dict,
+    'calls': _call_to_dict,
+    'deals': _deal_to_dict,
+}
+
+async def query_leads(db: AsyncSession,
+                      tenant: str,
+                      platform: Optional[str] = None,
+                      status: Optional[str] = None,
+                      source: Optional[str] = None,
+                      company: Optional[str] = None,
+                      email_domain: Optional[str] = None,
+                      created_after: Optional[datetime] = None,
+                      created_before: Optional[datetime] = None,
+                      updated_after: Optional[datetime] = None,
+                      updated_before: Optional[datetime] = None,
+                      sort_by: str = 'created_at',
+                      descending: bool = True,
+                      limit: int = 50,
+                      cursor: Optional[str] = None,
+                      include_raw: bool = False) -> Dict[str, Any]:
+    """
+    Filter, sort and page through a tenant's synced leads without calling the CRM
+
+    Args:
+        db: Database session
+        tenant: Tenant whose leads are read
+        platform: Only leads from this platform
+        status: Exact lead status
+        source: Exact lead source
+        company: Company name (case-insensitive exact match)
+        email_domain: Email domain (e.g. 'acme.com')
+        created_after/created_before: Creation date range
+        updated_after/updated_before: Last-modified date range
+        sort_by: One of LEAD_SORT_FIELDS
+        descending: Sort direction
+        limit: Page size (capped at MAX_PAGE_SIZE)
+        cursor: next_cursor from the previous page
+        include_raw: Include the raw CRM payload in each lead
+
+    Returns:
+        Dictionary with the page of leads and the cursor for the next page
+
+    Raises:
+        ValueError: If sort_by or cursor is invalid
+    """
+    if sort_by not in LEAD_SORT_FIELDS:
+        raise ValueError(f"Unsupported sort field '{sort_by}'. Use one of: {', '.join(LEAD_SORT_FIELDS)}")
+
+    filters = [Lead.tenant == tenant]
+    if platform:
+        filters.append(Lead.platform == platform)
+    if status:
+        filters.append(Lead.status == status)
+    if source:
+        filters.append(Lead.source == source)
+    if company:
+        filters.append(Lead.company_key == company.strip().lower())
+    if email_domain:
+        filters.append(Lead.email_domain == email_domain.strip().lower().lstrip('@'))
+    if created_after:
+        filters.append(Lead.created_at >= created_after)
+    if created_before:
+        filters.append(Lead.created_at < created_before)
+    if updated_after:
+        filters.append(Lead.updated_at >= updated_after)
+    if updated_before:
+        filters.append(Lead.updated_at < updated_before)
+
+    page = await _keyset_page(db, Lead, filters, LEAD_SORT_FIELDS[sort_by], descending, limit, cursor)
+    leads = [_lead_to_dict(row, include_raw) for row in page['rows']]
+
+    return {
+        'leads': leads,
+        'count': len(leads),
+        'next_cursor': page['next_cursor']
+    }
+
+async def query_calls(db: AsyncSession,
+                      tenant: str,
+                      platform: Optional[str] = None,
+                      outcome: Optional[str] = None,
+                      direction: Optional[str] = None,
+                      lead_id: Optional[str] = None,
+                      created_after: Optional[datetime] = None,
+                      created_before: Optional[datetime] = None,
+                      min_duration: Optional[int] = None,
+                      sort_by: str = 'created_at',
+                      descending: bool = True,
+                      limit: int = 50,
+                      cursor: Optional[str] = None,
+                      include_raw: bool = False) -> Dict[str, Any]:
+    """
+    Filter, sort and page through a tenant's synced call records without calling the CRM
+
+    Args:
+        db: Database session
+        tenant: Tenant whose calls are read
+        platform: Only calls from this platform
+        outcome: Exact call outcome
+        direction: Call direction (e.g. 'OUTBOUND')
+        lead_id: External ID of the associated lead
+        created_after/created_before: Call date range
+        min_duration: Minimum duration in seconds
+        sort_by: One of CALL_SORT_FIELDS
+        descending: Sort direction
+        limit: Page size (capped at MAX_PAGE_SIZE)
+        cursor: next_cursor from the previous page
+        include_raw: Include the raw CRM payload in each call
+
+    Returns:
+        Dictionary with the page of calls and the cursor for the next page
+
+    Raises:
+        ValueError: If sort_by or cursor is invalid
+    """
+    if sort_by not in CALL_SORT_FIELDS:
+        raise ValueError(f"Unsupported sort field '{sort_by}'. Use one of: {', '.join(CALL_SORT_FIELDS)}")
+
+    filters = [Call.tenant == tenant]
+    if platform:
+        filters.append(Call.platform == platform)
+    if outcome:
+        filters.append(Call.outcome == outcome)
+    if direction:
+        filters.append(Call.direction == direction)
+    if lead_id:
+        filters.append(Call.lead_external_id == lead_id)
+    if created_after:
+        filters.append(Call.created_at >= created_after)
+    if created_before:
+        filters.append(Call.created_at < created_before)
+    if min_duration is not None:
+        filters.append(Call.duration >= min_duration)
+
+    page = await _keyset_page(db, Call, filters, CALL_SORT_FIELDS[sort_by], descending, limit, cursor)
+    calls = [_call_to_dict(row, include_raw) for row in page['rows']]
+
+    return {
+        'calls': calls,
+        'count': len(calls),
+        'next_cursor': page['next_cursor']
+    }
+
+async def backfill_change_log(db: AsyncSession):
+    """
+    Log every stored record as an insert if the change log is empty
+
+    Stores synced before the change log existed thus start out with a
+    complete feed instead of one that only knows about later changes.
+    """
+    if await db.scalar(select(RecordChange.version).limit(1)) is not None:
+        return
+    for kind, (model, _) in RECORD_KINDS.items():
+        await db.execute(insert(RecordChange).from_select(
+            ['tenant', 'kind', 'platform', 'external_id', 'operation', 'changed_at'],
+            select(model.tenant, literal(kind), model.platform, model.external_id, literal('insert'), model.synced_at)
+            .order_by(model.id)
+        ))
+    await db.commit()
+
+async def change_log_version(db: AsyncSession, tenant: str) -> int:
+    """Latest change log version of a tenant's records (0 while there are none)"""
+    return await db.scalar(select(func.max(RecordChange.version)).where(RecordChange.tenant == tenant)) or 0
+
+async def query_changes(db: AsyncSession,
+                        tenant: str,
+                        since: int = 0,
+                        kinds: Optional[List[str]] = None,
+                        limit: int = 100,
+                        include_raw: bool = False) -> Dict[str, Any]:
+    """
+    A tenant's records inserted, updated or deleted after a change log version
+
+    Each changed record appears once, with its latest operation and, unless
+    it was deleted, its current data. Pass the returned next_since back as
+    `since` until has_more is false; the feed then holds nothing newer.
+    Consumers can treat 'insert' and 'update' alike (an upsert): a record
+    inserted and then updated since `since` is reported as updated.
+
+    Args:
+        db: Database session
+        tenant: Tenant whose changes are read
+        since: Version the consumer has already seen (0 for everything)
+        kinds: Record kinds to include ('leads', 'calls', 'deals'); all by default
+        limit: Maximum number of changes (capped at MAX_PAGE_SIZE)
+        include_raw: Include the raw CRM payload in each record
+
+    Returns:
+        Dictionary with the changes, next_since, has_more and the log's current version
+
+    Raises:
+        ValueError: If a kind is unknown or since is ahead of the change log
+    """
+    kinds = kinds or list(RECORD_KINDS)
+    unknown = [kind for kind in kinds if kind not in RECORD_KINDS]
+    if unknown:
+        raise ValueError(f"Unsupported record kind '{unknown[0]}'. Use one of: {', '.join(RECORD_KINDS)}")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # Bound the page by the version at the start, so a sync committing
+    # meanwhile can't slip a change behind next_since
+    version = await change_log_version(db, tenant)
+    if since > version:
+        raise ValueError(f"Version {since} is ahead of the change log (at {version}); start over from 0")
+
+    entries = list(await db.scalars(
+        select(RecordChange)
+        .where(
+            RecordChange.tenant == tenant,
+            RecordChange.version > since,
+            RecordChange.version <= version,
+            RecordChange.kind.in_(kinds)
+        )
+        .order_by(RecordChange.version)
+        .limit(limit + 1)
+    ))
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Current data of the inserted/updated records, one query per kind
+    records = {}
+    for kind in kinds:
+        external_ids = [entry.external_id for entry in entries
+                        if entry.kind == kind and entry.operation != 'delete']
+        if not external_ids:
+            continue
+        model = RECORD_KINDS[kind][0]
+        for row in await db.scalars(
+            select(model).where(model.tenant == tenant, model.external_id.in_(external_ids))
+        ):
+            records[(kind, row.platform, row.external_id)] = RECORD_TO_DICT[kind](row, include_raw)
+
+    changes = [{
+        'version': entry.version,
+        'kind': entry.kind,
+        'operation': entry.operation,
+        'platform': entry.platform,
+        'external_id': entry.external_id,
+        'changed_at': entry.changed_at,
+        'record': records.get((entry.kind, entry.platform, entry.external_id)),
+    } for entry in entries]
+
+    return {
+        'changes': changes,
+        'count': len(changes),
+        # Without more entries, the consumer is caught up to the current version
+        'next_since': changes[-1]['version'] if has_more else version,
+        'has_more': has_more,
+        'version': version
+    }
@@ -1,12 +1,29 @@
 import asyncio
+import json
 import os
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Set
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from dotenv import load_dotenv
 
-from mcps.base import BaseMCP
+from mcps.base import BaseMCP, MCPConnectionError
+from mcps.deadline import Deadline, current_deadline, deadline_scope
 from mcps.hubspot import HubSpotMCP
+from mcps.rate_limit import get_tenant_scheduler
+from services.cache import TTLCache
+from services.shared_state import get_shared_state
+from services.snapshot import SnapshotStore
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+# Last successful result per MCP call, served while a circuit is open
+MAX_LAST_GOOD_RESULTS = 64
+
+# Records per platform in the cached reads behind the chat context
+CHAT_CONTEXT_LIMIT = 50
+
+# Tenant served when a request doesn't name one (and the only tenant without TENANTS_CONFIG_FILE)
+DEFAULT_TENANT = 'default'
 
 # Load environment variables
 load_dotenv()
@@ -14,11 +31,42 @@ load_dotenv()
 class MCPOrchestrator:
     """
     MCP Orchestrator manages multiple MCP agents and provides unified data access
+    
+    There is one orchestrator per tenant (HubSpot portal), each with its own
+    MCPs, cache, circuit breakers and stale results.
     """
     
-    def __init__(self):
+    def __init__(self, tenant: str = DEFAULT_TENANT):
+        self.tenant = tenant
         self.mcps: Dict[str, BaseMCP] = {}
         self.last_health_check = None
+        # Short-lived cache of aggregated reads (chat context, etc.), shared
+        # with the other worker processes through SHARED_STATE_URL
+        self.cache = TTLCache(
+            default_ttl=float(os.getenv('CONTEXT_CACHE_TTL_SECONDS', '60')),
+            shared=get_shared_state(),
+            namespace=f'{tenant}:'
+        )
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._last_good: OrderedDict = OrderedDict()
+        
+        # Warm-start snapshot, read on first use; its values are served until
+        # a background load has replaced them
+        snapshot_dir = os.getenv('WARM_SNAPSHOT_DIR', './snapshots')
+        self.snapshot = SnapshotStore(os.path.join(snapshot_dir, f'{tenant}.json.gz')) if snapshot_dir else None
+        self._warm: Optional[Dict[str, Any]] = None
+        self._warm_lock = asyncio.Lock()
+        self._warm_refreshes: Dict[str, asyncio.Task] = {}
+        self._warm_start_task: Optional[asyncio.Task] = None
+        # The snapshot is rewritten from cached reads, in the background, once
+        # keys whose snapshot value predates the data (all of them at first)
+        # have been loaded again
+        self._snapshot_entries: Dict[str, Any] = {}
+        self._snapshot_stale: Set[str] = set(self.warm_loaders())
+        self._snapshot_task: Optional[asyncio.Task] = None
+        # Called after a sync or reconciliation changed the stored data
+        self._data_listeners: List[Callable[[], None]] = []
+        self._syncs_running = 0
     
     def register_mcp(self, name: str, mcp: BaseMCP):
         """
@@ -29,6 +77,12 @@ class MCPOrchestrator:
             mcp: MCP instance
         """
         self.mcps[name] = mcp
+        self.breakers[name] = CircuitBreaker(
+            failure_rate_threshold=float(os.getenv('CIRCUIT_FAILURE_RATE', '0.5')),
+            min_calls=int(os.getenv('CIRCUIT_MIN_CALLS', '5')),
+            window_size=int(os.getenv('CIRCUIT_WINDOW_SIZE', '20')),
+            open_seconds=float(os.getenv('CIRCUIT_OPEN_SECONDS', '30'))
+        )
     
     def get_mcp(self, name: str) -> Optional[BaseMCP]:
         """
@@ -42,67 +96,307 @@ class MCPOrchestrator:
         """
         return self.mcps.get(name)
     
+    async def get_cached(self,
+                         key: str,
+                         loader: Callable[[], Awaitable[Any]],
+                         ttl: Optional[float] = None) -> Any:
+        """
+        Get a value from the orchestrator cache, loading it on a miss
+        
+        Concurrent callers asking for the same missing key share one load.
+        After a restart, keys found in the warm-start snapshot are answered
+        from it straight away (possibly stale) while the load runs in the
+        background.
+        
+        Args:
+            key: Cache key (e.g. 'leads:50')
+            loader: Coroutine function that fetches the value
+            ttl: Seconds the value stays fresh (defaults to CONTEXT_CACHE_TTL_SECONDS)
+            
+        Returns:
+            Cached, snapshot or freshly loaded value
+        """
+        warm = await self._warm_entries()
+        if key in warm and self.cache.get_entry(key) is None:
+            if key not in self._warm_refreshes:
+                self._warm_refreshes[key] = asyncio.create_task(self._refresh_warm(key, loader, ttl))
+            return warm[key]
+        value = await self.cache.get_or_load(key, loader, ttl)
+        if key in self._snapshot_stale:
+            self._schedule_snapshot()
+        return value
+    
+    def add_data_listener(self, listener: Callable[[], None]):
+        """Call listener whenever a sync or reconciliation may have changed the data"""
+        self._data_listeners.append(listener)
+    
+    def remove_data_listener(self, listener: Callable[[], None]):
+        """Stop calling a listener added with add_data_listener"""
+        if listener in self._data_listeners:
+            self._data_listeners.remove(listener)
+    
+    @property
+    def is_syncing(self) -> bool:
+        """Whether a sync or reconciliation is writing to the store right now"""
+        return self._syncs_running > 0
+    
+    def _notify_data_changed(self):
+        for listener in list(self._data_listeners):
+            try:
+                listener()
+            except Exception as e:
+                print(f"Data change listener for tenant '{self.tenant}' failed: {e}")
+    
+    def warm_loaders(self) -> Dict[str, Callable[[], Awaitable[Any]]]:
+        """Loaders of the cached reads the warm-start snapshot holds, by cache key"""
+        return {
+            'chat:leads': lambda: self.get_all_leads(limit=CHAT_CONTEXT_LIMIT),
+            'chat:calls': lambda: self.get_all_calls(limit=CHAT_CONTEXT_LIMIT),
+            'chat:budget': self.get_all_budget_info,
+            'dashboard': self.get_dashboard_summary
+        }
+    
+    async def warm_start(self):
+        """Serve the snapshot and refresh every entry in it in the background"""
+        warm = await self._warm_entries()
+        loaders = self.warm_loaders()
+        for key in list(warm):
+            if key in loaders:
+                await self.get_cached(key, loaders[key])
+    
+    async def save_snapshot(self):
+        """
+        Write the warm-start snapshot from the cached reads
+        
+        Nothing is loaded for it: keys not cached right now keep the value
+        the previous snapshot had.
+        """
+        if not self.snapshot:
+            return
+        await self._warm_entries()
+        entries = dict(self._snapshot_entries)
+        written = set()
+        for key in self.warm_loaders():
+            entry = self.cache.get_entry(key)
+            # Failed reads aren't worth starting from
+            if entry and not _is_failed_read(entry.value):
+                entries[key] = entry.value
+                written.add(key)
+        if not written:
+            return
+        stale = self._snapshot_stale
+        await asyncio.to_thread(self.snapshot.save, entries)
+        self._snapshot_entries = entries
+        # A sync meanwhile replaced the set: its keys stay stale
+        stale -= written
+    
+    def _schedule_snapshot(self):
+        if self.snapshot and (self._snapshot_task is None or self._snapshot_task.done()):
+            self._snapshot_task = asyncio.create_task(self._save_snapshot_in_background())
+    
+    async def _save_snapshot_in_background(self):
+        try:
+            await self.save_snapshot()
+        except Exception as e:
+            print(f"Saving the warm-start snapshot for tenant '{self.tenant}' failed: {e}")
+    
+    def _data_changed(self):
+        """Mark the snapshot outdated and tell the listeners (after a sync or reconciliation)"""
+        if self._warm:
+            self._warm.clear()
+        self._snapshot_stale = set(self.warm_loaders())
+        self._notify_data_changed()
+    
+    async def _warm_entries(self) -> Dict[str, Any]:
+        """Snapshot entries not yet replaced by live data (read from disk once)"""
+        if self._warm is None:
+            async with self._warm_lock:
+                if self._warm is None:
+                    snapshot = await asyncio.to_thread(self.snapshot.load) if self.snapshot else None
+                    self._warm = snapshot['entries'] if snapshot else {}
+                    self._snapshot_entries = dict(self._warm)
+        return self._warm
+    
+    async def _refresh_warm(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]):
+        try:
+            await self.cache.get_or_load(key, loader, ttl)
+            self._warm.pop(key, None)
+            if key in self._snapshot_stale:
+                self._schedule_snapshot()
+        except Exception as e:
+            # Keep serving the snapshot; the next request retries
+            print(f"Refreshing '{key}' for tenant '{self.tenant}' failed: {e}")
+        finally:
+            self._warm_refreshes.pop(key, None)
+    
+    async def call_mcp(self,
+                       name: str,
+                       method: str,
+                       *args,
+                       keep_last_good: bool = True,
+                       **kwargs) -> Any:
+        """
+        Call an MCP method through that MCP's circuit breaker
+        
+        Connection failures (MCPConnectionError) count towards opening the
+        circuit; other errors are passed through without affecting it. While
+        the circuit is open the MCP isn't called at all and CircuitOpenError
+        is raised straight away, carrying the last successful result of the
+        same call (if any) so callers can serve it as stale data.
+        
+        If a deadline is current, the MCP runs under a child deadline keyed
+        by name, so its resume cursors stay apart from other platforms'.
+        
+        Args:
+            name: Name of the MCP
+            method: MCP method to call (e.g. 'get_leads')
+            *args, **kwargs: Arguments for the method
+            keep_last_good: Remember the result for serving while the circuit is open
+            
+        Returns:
+            The method's result
+            
+        Raises:
+            CircuitOpenError: If the circuit is open
+            MCPConnectionError: If the platform could not be reached
+        """
+        mcp = self.mcps[name]
+        breaker = self.breakers[name]
+        key = (name, method, repr(args), repr(sorted(kwargs.items())))
+        
+        if not breaker.allow_request():
+            raise CircuitOpenError(name, breaker.retry_after(), self._last_good.get(key))
+        
+        parent = current_deadline()
+        deadline = parent.child(name) if parent else None
+        try:
+            with deadline_scope(deadline):
+                result = await getattr(mcp, method)(*args, **kwargs)
+        except MCPConnectionError as e:
+            breaker.record_failure(e)
+            raise
+        except BaseException:
+            breaker.record_ignored()
+            raise
+        
+        breaker.record_success()
+        if deadline and (deadline.partial or deadline.resume_from):
+            # Only complete reads are worth serving as stale data
+            keep_last_good = False
+        if keep_last_good:
+            self._last_good[key] = result
+            self._last_good.move_to_end(key)
+            while len(self._last_good) > MAX_LAST_GOOD_RESULTS:
+                self._last_good.popitem(last=False)
+        return result
+    
+    def circuit_status(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the circuit breaker state of an MCP
+        
+        Args:
+            name: Name of the MCP
+            
+        Returns:
+            Breaker status dictionary or None if the MCP isn't registered
+        """
+        breaker = self.breakers.get(name)
+        return breaker.status() if breaker else None
+    
+    def _circuit_error(self, mcp: BaseMCP, field: str, error: Exception) -> Dict[str, Any]:
+        """Result entry for a failed MCP call, using stale data when the circuit is open"""
+        if isinstance(error, CircuitOpenError) and error.cached is not None:
+            result = {
+                field: error.cached,
+                'platform': mcp.get_platform_name(),
+                'stale': True,
+                'circuit': 'open'
+            }
+            if isinstance(error.cached, list):
+                result['count'] = len(error.cached)
+            return result
+        
+        result = {
+            'error': str(error),
+            'platform': mcp.get_platform_name()
+        }
+        if isinstance(error, CircuitOpenError):
+            result['circuit'] = 'open'
+        if field != 'budget_info':
+            result['count'] = 0
+        return result
+    
     async def get_all_leads(self, 
                            limit: Optional[int] = None,
-                           since_date: Optional[datetime] = None) -> Dict[str, Any]:
+                           since_date: Optional[datetime] = None,
+                           deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Get leads from all connected MCPs
         
         Args:
             limit: Maximum number of leads per MCP
             since_date: Only return leads since this date
+            deadline: Stop reading when it passes; platforms cut short are
+                marked partial and their resume cursors kept in the deadline
             
         Returns:
             Dictionary with leads grouped by MCP platform
         """
         results = {}
+        deadline = deadline or current_deadline()
         
-        for name, mcp in self.mcps.items():
-            try:
-                leads = await mcp.get_leads(limit=limit, since_date=since_date)
-                results[name] = {
-                    'leads': leads,
-                    'count': len(leads),
-                    'platform': mcp.get_platform_name()
-                }
-            except Exception as e:
-                results[name] = {
-                    'error': str(e),
-                    'count': 0,
-                    'platform': mcp.get_platform_name()
-                }
+        with deadline_scope(deadline):
+            for name, mcp in self.mcps.items():
+                if deadline and deadline.is_resuming_without(name):
+                    continue
+                try:
+                    leads = await self.call_mcp(name, 'get_leads', limit=limit, since_date=since_date)
+                    results[name] = {
+                        'leads': leads,
+                        'count': len(leads),
+                        'platform': mcp.get_platform_name()
+                    }
+                    if deadline and deadline.is_partial(name):
+                        results[name]['partial'] = True
+                except Exception as e:
+                    results[name] = self._circuit_error(mcp, 'leads', e)
         
         return results
     
     async def get_all_calls(self,
                            limit: Optional[int] = None,
-                           since_date: Optional[datetime] = None) -> Dict[str, Any]:
+                           since_date: Optional[datetime] = None,
+                           deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Get calls from all connected MCPs
         
         Args:
             limit: Maximum number of calls per MCP
             since_date: Only return calls since this date
+            deadline: Stop reading when it passes; platforms cut short are
+                marked partial and their resume cursors kept in the deadline
             
         Returns:
             Dictionary with calls grouped by MCP platform
         """
         results = {}
+        deadline = deadline or current_deadline()
         
-        for name, mcp in self.mcps.items():
-            try:
-                calls = await mcp.get_calls(limit=limit, since_date=since_date)
-                results[name] = {
-                    'calls': calls,
-                    'count': len(calls),
-                    'platform': mcp.get_platform_name()
-                }
-            except Exception as e:
-                results[name] = {
-                    'error': str(e),
-                    'count': 0,
-                    'platform': mcp.get_platform_name()
-                }
+        with deadline_scope(deadline):
+            for name, mcp in self.mcps.items():
+                if deadline and deadline.is_resuming_without(name):
+                    continue
+                try:
+                    calls = await self.call_mcp(name, 'get_calls', limit=limit, since_date=since_date)
+                    results[name] = {
+                        'calls': calls,
+                        'count': len(calls),
+                        'platform': mcp.get_platform_name()
+                    }
+                    if deadline and deadline.is_partial(name):
+                        results[name]['partial'] = True
+                except Exception as e:
+                    results[name] = self._circuit_error(mcp, 'calls', e)
         
         return results
     
@@ -121,20 +415,17 @@ class MCPOrchestrator:
         
         for name, mcp in self.mcps.items():
             try:
-                budget_info = await mcp.get_budget_info(lead_ids=lead_ids)
+                budget_info = await self.call_mcp(name, 'get_budget_info', lead_ids=lead_ids)
                 results[name] = {
                     'budget_info': budget_info,
                     'platform': mcp.get_platform_name()
                 }
             except Exception as e:
-                results[name] = {
-                    'error': str(e),
-                    'platform': mcp.get_platform_name()
-                }
+                results[name] = self._circuit_error(mcp, 'budget_info', e)
         
         return results
     
-    async def sync_all_data(self, db: Session) -> Dict[str, Any]:
+    async def sync_all_data(self, db: AsyncSession) -> Dict[str, Any]:
         """
         Sync data from all MCPs to database
         
@@ -146,40 +437,89 @@ class MCPOrchestrator:
         """
         results = {}
         
-        for name, mcp in self.mcps.items():
-            try:
-                sync_result = await mcp.sync_to_database(db)
-                results[name] = sync_result
-            except Exception as e:
-                results[name] = {
-                    'error': str(e)
-                }
+        self._syncs_running += 1
+        try:
+            for name, mcp in self.mcps.items():
+                try:
+                    sync_result = await self.call_mcp(name, 'sync_to_database', db, keep_last_good=False)
+                    results[name] = sync_result
+                except CircuitOpenError as e:
+                    results[name] = {
+                        'error': str(e),
+                        'circuit': 'open'
+                    }
+                except Exception as e:
+                    results[name] = {
+                        'error': str(e)
+                    }
+        finally:
+            self._syncs_running -= 1
         
+        # Synced data supersedes anything cached from before the sync; the
+        # snapshot follows once the reads are loaded again
+        await self.cache.invalidate_shared()
+        self._data_changed()
         return results
     
-    async def health_check(self) -> Dict[str, Any]:
+    async def reconcile_all_data(self, db: AsyncSession) -> Dict[str, Any]:
         """
-        Check health of all MCP connections
+        Remove records deleted in each platform from the database
         
+        Args:
+            db: Database session
+            
         Returns:
-            Dictionary with health status for each MCP
+            Dictionary with reconciliation results for each MCP
         """
         results = {}
         
-        for name, mcp in self.mcps.items():
-            try:
-                health = await mcp.health_check()
-                results[name] = health
-            except Exception as e:
-                results[name] = {
-                    'status': 'unhealthy',
-                    'message': f'Health check failed: {str(e)}',
-                    'authenticated': False
-                }
+        self._syncs_running += 1
+        try:
+            for name, mcp in self.mcps.items():
+                try:
+                    results[name] = await self.call_mcp(name, 'reconcile_deletions', db, keep_last_good=False)
+                except CircuitOpenError as e:
+                    results[name] = {
+                        'error': str(e),
+                        'circuit': 'open'
+                    }
+                except Exception as e:
+                    results[name] = {
+                        'error': str(e)
+                    }
+        finally:
+            self._syncs_running -= 1
         
-        self.last_health_check = datetime.now()
+        # Cached reads may still include the deleted records
+        deleted = sum(
+            stats.get('deleted', 0)
+            for result in results.values() if isinstance(result, dict)
+            for stats in result.values() if isinstance(stats, dict)
+        )
+        if deleted:
+            await self.cache.invalidate_shared()
+            self._data_changed()
         return results
     
+    def start_background_tasks(self):
+        """Start each MCP's background tasks (e.g. OAuth token refresh) and the warm start"""
+        for mcp in self.mcps.values():
+            mcp.start_background_tasks()
+        self._warm_start_task = asyncio.create_task(self.warm_start())
+    
+    async def stop_background_tasks(self):
+        """Stop each MCP's background tasks and any snapshot refreshes"""
+        for mcp in self.mcps.values():
+            await mcp.stop_background_tasks()
+        for task in [self._warm_start_task, self._snapshot_task, *self._warm_refreshes.values()]:
+            if task and not task.done():
+                task.cancel()
+    
+    async def close(self):
+        """Close each MCP's connections"""
+        for mcp in self.mcps.values():
+            await mcp.close()
+    
     async def get_dashboard_summary(self) -> Dict[str, Any]:
         """
         Get a unified dashboard summary from all MCPs
@@ -304,34 +644,121 @@ class MCPOrchestrator:
             'by_platform': platforms_data
         }
 
-# Global orchestrator instance
-orchestrator = MCPOrchestrator()
+def _is_failed_read(value: Any) -> bool:
+    """Whether an aggregated read (or any platform's part of it) is an error result"""
+    if not isinstance(value, dict):
+        return False
+    return 'error' in value or any(isinstance(part, dict) and 'error' in part for part in value.values())
+
+# Orchestrator per tenant, filled by initialize_mcps()
+orchestrators: Dict[str, MCPOrchestrator] = {DEFAULT_TENANT: MCPOrchestrator(DEFAULT_TENANT)}
+default_tenant = DEFAULT_TENANT
+
+def load_tenant_configs() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Per-tenant platform configuration
+    
+    With TENANTS_CONFIG_FILE set, tenants come from that JSON file:
+    
+        {
+          "default_tenant": "acme",
+          "tenants": {
+            "acme": {"hubspot": {"access_token": "...", "max_concurrency": 10}},
+            "globex": {"hubspot": {"access_token": "...", "token_file": "globex.json"}}
+          }
+        }
+    
+    Otherwise there is a single DEFAULT_TENANT configured from the
+    HUBSPOT_* environment variables.
+    
+    Returns:
+        Dictionary of tenant id -> platform name -> connection config
+    """
+    global default_tenant
+    
+    # Settings every tenant's HubSpot connection defaults to
+    hubspot_defaults = {
+        'request_timeout': os.getenv('HUBSPOT_REQUEST_TIMEOUT_SECONDS'),
+        'sync_partitions': os.getenv('HUBSPOT_SYNC_PARTITIONS'),
+        'sync_queue_size': os.getenv('HUBSPOT_SYNC_QUEUE_SIZE'),
+        'sync_memory_limit_mb': os.getenv('HUBSPOT_SYNC_MEMORY_LIMIT_MB'),
+        'sync_spill_dir': os.getenv('HUBSPOT_SYNC_SPILL_DIR'),
+        'normalize_executor': os.getenv('HUBSPOT_NORMALIZE_EXECUTOR'),
+        'normalize_offload_records': os.getenv('HUBSPOT_NORMALIZE_OFFLOAD_RECORDS')
+    }
+    
+    config_file = os.getenv('TENANTS_CONFIG_FILE')
+    if not config_file:
+        default_tenant = DEFAULT_TENANT
+        return {
+            DEFAULT_TENANT: {
+                'hubspot': {
+                    **hubspot_defaults,
+                    'access_token': os.getenv('HUBSPOT_ACCESS_TOKEN'),
+                    'refresh_token': os.getenv('HUBSPOT_REFRESH_TOKEN'),  # Optional for OAuth apps
+                    'client_id': os.getenv('HUBSPOT_CLIENT_ID'),         # Optional for OAuth apps  
+                    'client_secret': os.getenv('HUBSPOT_CLIENT_SECRET'),  # Optional for OAuth apps
+                    'token_file': os.getenv('HUBSPOT_TOKEN_FILE')  # Optional for OAuth apps
+                }
+            }
+        }
+    
+    with open(config_file) as f:
+        config = json.load(f)
+    
+    tenants = config.get('tenants') or {}
+    if not tenants:
+        raise ValueError(f"No tenants configured in {config_file}")
+    default_tenant = config.get('default_tenant') or next(iter(tenants))
+    if default_tenant not in tenants:
+        raise ValueError(f"Default tenant '{default_tenant}' is not configured in {config_file}")
+    
+    return {
+        tenant: {
+            'hubspot': {**hubspot_defaults, **(platforms.get('hubspot') or {})}
+        }
+        for tenant, platforms in tenants.items()
+    }
 
 def initialize_mcps():
     """
-    Initialize and register MCP agents
+    Initialize and register MCP agents for every tenant
     This should be called when the application starts
     """
-    # HubSpot configuration from environment variables
-    hubspot_config = {
-        'access_token': os.getenv('HUBSPOT_ACCESS_TOKEN'),
-        'refresh_token': os.getenv('HUBSPOT_REFRESH_TOKEN'),  # Optional for OAuth apps
-        'client_id': os.getenv('HUBSPOT_CLIENT_ID'),         # Optional for OAuth apps  
-        'client_secret': os.getenv('HUBSPOT_CLIENT_SECRET')  # Optional for OAuth apps
-    }
+    get_tenant_scheduler().set_max_concurrency(int(os.getenv('TENANT_MAX_CONCURRENCY', '20')))
+    tenant_configs = load_tenant_configs()
     
-    # Only register HubSpot MCP if access token is provided
-    if hubspot_config['access_token']:
-        hubspot_mcp = HubSpotMCP(hubspot_config)
-        orchestrator.register_mcp('hubspot', hubspot_mcp)
-        print("✅ HubSpot MCP registered successfully")
-    else:
-        print("⚠️  HubSpot access token not found. Please set HUBSPOT_ACCESS_TOKEN environment variable.")
+    orchestrators.clear()
+    for tenant, platforms in tenant_configs.items():
+        orchestrator = MCPOrchestrator(tenant)
+        orchestrators[tenant] = orchestrator
+        
+        hubspot_config = {**platforms['hubspot'], 'tenant': tenant}
+        
+        # Only register HubSpot MCP if access token is provided
+        if hubspot_config.get('access_token'):
+            hubspot_mcp = HubSpotMCP(hubspot_config)
+            orchestrator.register_mcp('hubspot', hubspot_mcp)
+            print(f"✅ HubSpot MCP registered successfully (tenant '{tenant}')")
+        else:
+            print(f"⚠️  HubSpot access token not found for tenant '{tenant}'. Please set HUBSPOT_ACCESS_TOKEN environment variable.")
     
     # Future MCPs can be registered here
     # salesforce_mcp = SalesforceMCP(salesforce_config)
     # orchestrator.register_mcp('salesforce', salesforce_mcp)
 
-def get_orchestrator() -> MCPOrchestrator:
-    """Get the global orchestrator instance"""
-    return orchestrator 
\ No newline at end of file
+def get_orchestrator(tenant: Optional[str] = None) -> Optional[MCPOrchestrator]:
+    """
+    Get a tenant's orchestrator
+    
+    Args:
+        tenant: Tenant id (defaults to the default tenant)
+        
+    Returns:
+        The orchestrator, or None if the tenant isn't configured
+    """
+    return orchestrators.get(tenant or default_tenant)
+
+def get_orchestrators() -> Dict[str, MCPOrchestrator]:
+    """Get the orchestrators of all tenants"""
+    return orchestrators
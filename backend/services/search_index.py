@@ -0,0 +1,265 @@
+import re
+from typing import Dict, List, Any, Optional, Tuple
+from sqlalchemy import or_, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from models import Lead, Call, Deal
+
+# Each document's FTS rowid is derived from its source row so that updates
+# delete/replace by rowid instead of scanning the index.
+DOC_TYPE_CODES = {'lead': 1, 'call': 2, 'deal': 3}
+ROWID_STRIDE = 8
+
+MAX_RESULTS = 100
+SNIPPET_TOKENS = 12
+
+def _rowid(doc_type: str, row_id: int) -> int:
+    return row_id * ROWID_STRIDE + DOC_TYPE_CODES[doc_type]
+
+def lead_text(columns: Dict[str, Any]) -> Tuple[str, str]:
+    """Searchable (title, body) for a lead: name, then email and company"""
+    body = ' '.join(value for value in (columns.get('email'), columns.get('company')) if value)
+    return columns.get('name') or '', body
+
+def call_text(columns: Dict[str, Any]) -> Tuple[str, str]:
+    """Searchable (title, body) for a call: the call notes"""
+    return '', columns.get('notes') or ''
+
+def deal_text(columns: Dict[str, Any]) -> Tuple[str, str]:
+    """Searchable (title, body) for a deal: the deal name"""
+    return columns.get('name') or '', ''
+
+def is_supported(db: AsyncSession) -> bool:
+    """The FTS5 index only exists on SQLite stores"""
+    return db.get_bind().dialect.name == 'sqlite'
+
+async def create_search_index(engine: AsyncEngine):
+    """
+    Create the FTS5 search index if it doesn't exist yet
+
+    A freshly created index is backfilled from the existing tables, so stores
+    synced before search was enabled become searchable on the next start.
+    An index from before documents were keyed by tenant is rebuilt.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    async with engine.begin() as conn:
+        exists = (await conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+        )).first()
+        if exists:
+            columns = {row[1] for row in await conn.exec_driver_sql("PRAGMA table_info(search_index)")}
+            if 'tenant' in columns:
+                return
+            await conn.exec_driver_sql("DROP TABLE search_index")
+
+        await conn.exec_driver_sql(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "doc_type UNINDEXED, tenant UNINDEXED, platform UNINDEXED, external_id UNINDEXED, title, body, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+        )
+        # Default ranking: title matches weigh twice as much as body matches
+        await conn.exec_driver_sql(
+            "INSERT INTO search_index(search_index, rank) VALUES ('rank', 'bm25(0.0, 0.0, 0.0, 0.0, 2.0, 1.0)')"
+        )
+
+    async with AsyncSession(engine) as db:
+        await rebuild_search_index(db)
+
+async def index_documents(db: AsyncSession, doc_type: str, documents: List[Tuple[int, str, str, str, str, str]]):
+    """
+    Add or replace documents in the search index
+
+    Runs inside the caller's transaction; the caller commits.
+
+    Args:
+        db: Database session
+        doc_type: 'lead', 'call' or 'deal'
+        documents: (row id, tenant, platform, external id, title, body) tuples
+    """
+    if not documents or not is_supported(db):
+        return
+
+    params = [
+        {
+            'rowid': _rowid(doc_type, row_id),
+            'doc_type': doc_type,
+            'tenant': tenant,
+            'platform': platform,
+            'external_id': external_id,
+            'title': title,
+            'body': body
+        }
+        for row_id, tenant, platform, external_id, title, body in documents
+    ]
+    await db.execute(text("DELETE FROM search_index WHERE rowid = :rowid"), [{'rowid': p['rowid']} for p in params])
+    await db.execute(
+        text(
+            "INSERT INTO search_index(rowid, doc_type, tenant, platform, external_id, title, body) "
+            "VALUES (:rowid, :doc_type, :tenant, :platform, :external_id, :title, :body)"
+        ),
+        params
+    )
+
+async def remove_documents(db: AsyncSession, doc_type: str, row_ids: List[int]):
+    """
+    Remove the documents of deleted rows from the search index
+
+    Runs inside the caller's transaction; the caller commits.
+
+    Args:
+        db: Database session
+        doc_type: 'lead', 'call' or 'deal'
+        row_ids: Ids of the rows the documents were indexed from
+    """
+    if not row_ids or not is_supported(db):
+        return
+
+    await db.execute(
+        text("DELETE FROM search_index WHERE rowid = :rowid"),
+        [{'rowid': _rowid(doc_type, row_id)} for row_id in row_ids]
+    )
+
+async def rebuild_search_index(db: AsyncSession) -> int:
+    """
+    Re-index every stored lead, call and deal
+
+    Returns:
+        Number of documents indexed
+    """
+    if not is_supported(db):
+        return 0
+
+    await db.execute(text("DELETE FROM search_index"))
+    total = 0
+    for doc_type, model, to_text, fields in (
+        ('lead', Lead, lead_text, ('name', 'email', 'company')),
+        ('call', Call, call_text, ('notes',)),
+        ('deal', Deal, deal_text, ('name',)),
+    ):
+        documents = []
+        for row in await db.scalars(select(model)):
+            title, body = to_text({field: getattr(row, field) for field in fields})
+            documents.append((row.id, row.tenant, row.platform, row.external_id, title, body))
+        await index_documents(db, doc_type, documents)
+        total += len(documents)
+
+    # Merge index segments after a bulk load for faster queries
+    await db.execute(text("INSERT INTO search_index(search_index) VALUES ('optimize')"))
+    await db.commit()
+    return total
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression
+
+    Every word must match; the last word also matches as a prefix so
+    partially typed queries ("acm") still find results.
+    """
+    tokens = re.findall(r'\w+', query, re.UNICODE)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens[:-1]]
+    terms.append(f'"{tokens[-1]}"*')
+    return ' '.join(terms)
+
+async def search(db: AsyncSession,
+                 tenant: str,
+                 query: str,
+                 doc_types: Optional[List[str]] = None,
+                 platform: Optional[str] = None,
+                 limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Full-text search over a tenant's lead names/emails/companies, call notes and deal names
+
+    Args:
+        db: Database session
+        tenant: Tenant whose records are searched
+        query: Free-text query
+        doc_types: Restrict to 'lead', 'call' and/or 'deal'
+        platform: Only documents from this platform
+        limit: Maximum number of results (capped at MAX_RESULTS)
+
+    Returns:
+        Ranked hits, best match first
+
+    Raises:
+        ValueError: If a document type is unknown
+    """
+    for doc_type in doc_types or []:
+        if doc_type not in DOC_TYPE_CODES:
+            raise ValueError(f"Unknown document type '{doc_type}'. Use one of: {', '.join(DOC_TYPE_CODES)}")
+
+    limit = max(1, min(limit, MAX_RESULTS))
+    match_query = build_match_query(query)
+    if not match_query:
+        return []
+
+    if not is_supported(db):
+        return await _search_without_index(db, tenant, query, doc_types, platform, limit)
+
+    sql = (
+        "SELECT doc_type, platform, external_id, title, "
+        f"snippet(search_index, -1, '**', '**', '…', {SNIPPET_TOKENS}) AS snippet, rank "
+        "FROM search_index WHERE search_index MATCH :match AND tenant = :tenant"
+    )
+    params = {'match': match_query, 'tenant': tenant, 'limit': limit}
+
+    if doc_types:
+        placeholders = ', '.join(f':doc_type_{i}' for i in range(len(doc_types)))
+        sql += f" AND doc_type IN ({placeholders})"
+        params.update({f'doc_type_{i}': doc_type for i, doc_type in enumerate(doc_types)})
+    if platform:
+        sql += " AND platform = :platform"
+        params['platform'] = platform
+
+    sql += " ORDER BY rank LIMIT :limit"
+
+    return [
+        {
+            'type': row.doc_type,
+            'platform': row.platform,
+            'external_id': row.external_id,
+            'title': row.title,
+            'snippet': row.snippet,
+            'score': -row.rank  # bm25 ranks are negative; higher score is better
+        }
+        for row in await db.execute(text(sql), params)
+    ]
+
+async def _search_without_index(db: AsyncSession,
+                                tenant: str,
+                                query: str,
+                                doc_types: Optional[List[str]],
+                                platform: Optional[str],
+                                limit: int) -> List[Dict[str, Any]]:
+    """Unranked substring search for stores without FTS5 (non-SQLite databases)"""
+    pattern = f'%{query.strip()}%'
+    sources = {
+        'lead': (Lead, (Lead.name, Lead.email, Lead.company), lead_text, ('name', 'email', 'company')),
+        'call': (Call, (Call.notes,), call_text, ('notes',)),
+        'deal': (Deal, (Deal.name,), deal_text, ('name',)),
+    }
+
+    hits = []
+    for doc_type in doc_types or list(sources):
+        model, columns, to_text, fields = sources[doc_type]
+        statement = select(model).where(model.tenant == tenant, or_(*(column.ilike(pattern) for column in columns)))
+        if platform:
+            statement = statement.where(model.platform == platform)
+
+        for row in await db.scalars(statement.limit(limit - len(hits))):
+            title, body = to_text({field: getattr(row, field) for field in fields})
+            hits.append({
+                'type': doc_type,
+                'platform': row.platform,
+                'external_id': row.external_id,
+                'title': title,
+                'snippet': body[:200],
+                'score': None
+            })
+        if len(hits) >= limit:
+            break
+
+    return hits
@@ -0,0 +1,330 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Optional, Union
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Shared state unless configured otherwise: a SQLite file, fine for workers on one host
+DEFAULT_SHARED_STATE_URL = 'sqlite:///./shared_state.db'
+
+def _encode_default(value: Any) -> Any:
+    # Dates are tagged so they come back as dates, not strings
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    return str(value)
+
+def _decode_object(obj: dict) -> Any:
+    if len(obj) == 1:
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+    return obj
+
+def encode_value(value: Any) -> str:
+    """
+    Serialize a value to JSON, keeping datetimes and dates typed
+
+    Other values JSON can't represent are stored as strings.
+    """
+    return json.dumps(value, separators=(',', ':'), default=_encode_default)
+
+def decode_value(text: Union[str, bytes]) -> Any:
+    """Parse JSON written by encode_value"""
+    return json.loads(text, object_hook=_decode_object)
+
+class StateBackend(ABC):
+    """
+    Key/value state shared by every worker process of a deployment
+
+    Values are JSON-serializable (datetimes and dates are kept typed, see
+    encode_value). Keys may expire after a TTL (seconds).
+    With `uvicorn --workers N`, cached reads, OAuth tokens, rate-limit
+    counters and single-flight locks kept here make the workers act like
+    one client towards the CRM.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any:
+        """Value of key, or None if it is missing or expired"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        pass
+
+    @abstractmethod
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set key only if it doesn't exist (or expired); returns whether it was set"""
+        pass
+
+    @abstractmethod
+    async def delete(self, key: str, value: Any = None) -> bool:
+        """Delete key (only if it holds value, when given); returns whether it was deleted"""
+        pass
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str):
+        """Delete every key starting with prefix"""
+        pass
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """
+        Atomically add amount to a counter and return the new value
+
+        A missing counter starts at 0 and expires ttl seconds after creation.
+        """
+        pass
+
+class SQLiteStateBackend(StateBackend):
+    """
+    Shared state in a local SQLite file (the default backend)
+
+    Works for workers on one host. Each operation runs in a worker thread
+    with its own connection; writes use immediate transactions, so counters
+    and locks are atomic across processes.
+    """
+
+    # Writes between sweeps of expired rows
+    PURGE_EVERY = 500
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS shared_state '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    async def _run(self, operation: Callable, *args) -> Any:
+        return await asyncio.to_thread(operation, *args)
+
+    def _write(self, operation: Callable, *args) -> Any:
+        """Run operation(conn, now, *args) in an immediate transaction"""
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = operation(conn, now, *args)
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                conn.execute('DELETE FROM shared_state WHERE expires_at <= ?', (now,))
+            conn.execute('COMMIT')
+            return result
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    @staticmethod
+    def _live(conn: sqlite3.Connection, now: float, key: str) -> Optional[str]:
+        row = conn.execute(
+            'SELECT value FROM shared_state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (key, now)
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _put(conn: sqlite3.Connection, now: float, key: str, value: Any, ttl: Optional[float]):
+        conn.execute(
+            'INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, encode_value(value), now + ttl if ttl is not None else None)
+        )
+
+    async def get(self, key: str) -> Any:
+        def get(key):
+            value = self._live(self._connect(), time.time(), key)
+            return decode_value(value) if value is not None else None
+        return await self._run(get, key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await self._run(self._write, self._put, key, value, ttl)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        def add(conn, now, key, value, ttl):
+            if self._live(conn, now, key) is not None:
+                return False
+            self._put(conn, now, key, value, ttl)
+            return True
+        return await self._run(self._write, add, key, value, ttl)
+
+    async def delete(self, key: str, value: Any = None) -> bool:
+        def delete(conn, now, key, value):
+            if value is None:
+                cursor = conn.execute('DELETE FROM shared_state WHERE key = ?', (key,))
+            else:
+                cursor = conn.execute(
+                    'DELETE FROM shared_state WHERE key = ? AND value = ?',
+                    (key, encode_value(value))
+                )
+            return cursor.rowcount > 0
+        return await self._run(self._write, delete, key, value)
+
+    async def delete_prefix(self, prefix: str):
+        def delete_prefix(conn, now, prefix):
+            escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conn.execute("DELETE FROM shared_state WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',))
+        await self._run(self._write, delete_prefix, prefix)
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        def incr(conn, now, key, amount, ttl):
+            row = conn.execute(
+                'SELECT value, expires_at FROM shared_state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, now)
+            ).fetchone()
+            if row is None:
+                self._put(conn, now, key, amount, ttl)
+                return amount
+            value = json.loads(row[0]) + amount
+            conn.execute('UPDATE shared_state SET value = ? WHERE key = ?', (json.dumps(value), key))
+            return value
+        return await self._run(self._write, incr, key, amount, ttl)
+
+class RedisStateBackend(StateBackend):
+    """
+    Shared state in Redis (or a Redis-compatible server), for workers on several hosts
+
+    Needs the optional `redis` package.
+    """
+
+    # Deletes the key only if it still holds the expected value
+    _DELETE_IF_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url: str):
+        """
+        Args:
+            url: Redis URL, e.g. redis://localhost:6379/0
+        """
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("SHARED_STATE_URL points to Redis, but the 'redis' package is not installed") from e
+        self._redis = redis.from_url(url)
+
+    @staticmethod
+    def _ttl_ms(ttl: Optional[float]) -> Optional[int]:
+        return max(1, int(ttl * 1000)) if ttl is not None else None
+
+    async def get(self, key: str) -> Any:
+        value = await self._redis.get(key)
+        return decode_value(value) if value is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        await self._redis.set(key, encode_value(value), px=self._ttl_ms(ttl))
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        return bool(await self._redis.set(key, encode_value(value), px=self._ttl_ms(ttl), nx=True))
+
+    async def delete(self, key: str, value: Any = None) -> bool:
+        if value is None:
+            return bool(await self._redis.delete(key))
+        return bool(await self._redis.eval(self._DELETE_IF_SCRIPT, 1, key, encode_value(value)))
+
+    async def delete_prefix(self, prefix: str):
+        keys = [key async for key in self._redis.scan_iter(match=prefix.replace('*', '\\*') + '*')]
+        if keys:
+            await self._redis.delete(*keys)
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        value = await self._redis.incrby(key, amount)
+        if value == amount and ttl is not None:
+            await self._redis.pexpire(key, self._ttl_ms(ttl))
+        return value
+
+async def load_once(backend: StateBackend,
+                    key: str,
+                    loader: Callable[[], Awaitable[Any]],
+                    ttl: Union[float, Callable[[Any], Optional[float]], None] = None,
+                    lock_timeout: float = 30.0,
+                    poll_interval: float = 0.05) -> Any:
+    """
+    Get key from the shared backend, loading it in at most one process at a time
+
+    The process that takes the key's lock runs loader and stores the result;
+    the others wait for it to appear instead of calling the CRM themselves.
+    If the lock holder doesn't deliver within lock_timeout (e.g. it died),
+    waiters load the value themselves.
+
+    Args:
+        backend: Shared state backend
+        key: Key the value is stored under
+        loader: Coroutine function producing the value (None results aren't stored)
+        ttl: Seconds the value is kept, or a function of the value returning them
+        lock_timeout: Longest time to wait for another process's load
+        poll_interval: Seconds between checks while waiting
+
+    Returns:
+        The stored or freshly loaded value
+    """
+    lock_key = f'{key}:lock'
+    give_up_at = time.monotonic() + lock_timeout
+    while True:
+        value = await backend.get(key)
+        if value is not None:
+            return value
+
+        token = uuid.uuid4().hex
+        if await backend.add(lock_key, token, lock_timeout):
+            try:
+                value = await loader()
+                if value is not None:
+                    await backend.set(key, value, ttl(value) if callable(ttl) else ttl)
+                return value
+            finally:
+                await backend.delete(lock_key, token)
+
+        if time.monotonic() >= give_up_at:
+            return await loader()
+        await asyncio.sleep(poll_interval)
+
+def create_state_backend(url: Optional[str]) -> Optional[StateBackend]:
+    """
+    Backend for a SHARED_STATE_URL
+
+    Args:
+        url: sqlite:///path/to/file.db or redis://host:port/db (empty for no shared state)
+    """
+    if not url:
+        return None
+    if url.startswith('sqlite:///'):
+        return SQLiteStateBackend(url[len('sqlite:///'):])
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisStateBackend(url)
+    raise ValueError(f"Unsupported SHARED_STATE_URL: {url}")
+
+# Global shared state backend; an empty SHARED_STATE_URL keeps all state in the process
+shared_state = create_state_backend(os.getenv('SHARED_STATE_URL', DEFAULT_SHARED_STATE_URL))
+
+def get_shared_state() -> Optional[StateBackend]:
+    """Get the shared state backend, if one is configured"""
+    return shared_state
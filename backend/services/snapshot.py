@@ -0,0 +1,65 @@
+import gzip
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from services.shared_state import decode_value, encode_value
+
+class SnapshotStore:
+    """
+    Warm-start snapshot of an orchestrator's cached reads, as gzipped JSON
+
+    Holds the normalized leads/calls, budget info and dashboard aggregates
+    the first requests after a restart need, so they can be answered from
+    disk instead of waiting on the CRM. Writes replace the file atomically
+    (temporary file + os.replace), so a crash mid-write leaves the previous
+    snapshot intact.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Snapshot file location
+        """
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the snapshot
+
+        Returns:
+            {'saved_at': ISO timestamp, 'entries': {cache key: value}}, or
+            None if there is no (readable) snapshot
+        """
+        try:
+            with gzip.open(self.path, 'rb') as snapshot_file:
+                snapshot = decode_value(snapshot_file.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            print(f"Could not read snapshot {self.path}: {e}")
+            return None
+        if not isinstance(snapshot, dict) or not isinstance(snapshot.get('entries'), dict):
+            return None
+        return snapshot
+
+    def save(self, entries: Dict[str, Any]):
+        """
+        Atomically replace the snapshot
+
+        Args:
+            entries: Cache key -> value (JSON-serializable; datetimes stay typed)
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as raw_file, gzip.GzipFile(fileobj=raw_file, mode='wb') as snapshot_file:
+                snapshot = {'saved_at': datetime.now().isoformat(), 'entries': entries}
+                snapshot_file.write(encode_value(snapshot).encode('utf-8'))
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
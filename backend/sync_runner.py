@@ -0,0 +1,243 @@
+"""
+Sharded full (or incremental) sync outside the web process
+
+    python -m sync_runner [--tenant acme] [--objects leads,calls,deals]
+                          [--workers 4] [--shards 16] [--since 2024-01-01]
+                          [--checkpoint sync_checkpoint.json] [--restart]
+
+Each object type's hs_object_id space is split into ranges (shards) that
+a pool of worker processes syncs into the same local store as the API.
+The workers share one HubSpot rate-limit budget and OAuth token through
+SHARED_STATE_URL (a SQLite file next to the store by default), together
+with the API workers.
+
+Workers report progress after every written batch and the checkpoint
+file is updated about once a second: running the same command again
+resumes unfinished shards where they stopped, unless --restart is given.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from dotenv import load_dotenv
+
+# Workers must share the rate-limit budget and tokens, so shared state is
+# required here even if SHARED_STATE_URL was set empty (set before the
+# modules that read it are imported)
+load_dotenv()
+if not os.getenv('SHARED_STATE_URL'):
+    os.environ['SHARED_STATE_URL'] = 'sqlite:///./shared_state.db'
+
+from database import SessionLocal, init_db, close_db
+from mcps.hubspot import HubSpotMCP, SYNC_OBJECTS
+from services import mcp_orchestrator
+
+# Seconds between checkpoint writes / progress lines while batches come in
+CHECKPOINT_INTERVAL_SECONDS = 1.0
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _sync_shard(shard: Dict[str, Any], hubspot_config: Dict[str, Any], since: Optional[str]) -> int:
+    """Worker process entry point: sync one shard, reporting progress on the queue"""
+    return asyncio.run(_sync_shard_async(shard, hubspot_config, since))
+
+
+async def _sync_shard_async(shard: Dict[str, Any], hubspot_config: Dict[str, Any], since: Optional[str]) -> int:
+    mcp = HubSpotMCP(hubspot_config)
+
+    async def report(next_start: int, records: int):
+        _progress_queue.put((shard['id'], next_start, records))
+
+    try:
+        async with SessionLocal() as db:
+            return await mcp.sync_id_range(
+                db, shard['object'], shard['next_start'], shard['end'],
+                since_date=datetime.fromisoformat(since) if since else None,
+                on_progress=report
+            )
+    finally:
+        await mcp.close()
+        await close_db()
+
+
+async def _plan(hubspot_config: Dict[str, Any], objects: List[str], shards: int, since: Optional[str]) -> List[Dict[str, Any]]:
+    """Shards for a new run: one per ID range of each object type"""
+    mcp = HubSpotMCP(hubspot_config)
+    try:
+        plan = []
+        for name in objects:
+            ranges = await mcp.plan_sync_ranges(name, shards, datetime.fromisoformat(since) if since else None)
+            print(f"{name}: {len(ranges)} shards")
+            plan.extend({
+                'id': f'{name}:{start}-{end}',
+                'object': name,
+                'start': start,
+                'end': end,
+                'next_start': start,
+                'records': 0,
+                'done': False
+            } for start, end in ranges)
+        return plan
+    finally:
+        await mcp.close()
+
+
+async def _finish(tenant: str):
+    """Drop the API's cached reads of the tenant, which predate the synced data"""
+    await mcp_orchestrator.MCPOrchestrator(tenant).cache.invalidate_shared()
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as checkpoint_file:
+            return json.load(checkpoint_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Could not read checkpoint {path}: {e}")
+        return None
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    """Atomically replace the checkpoint file"""
+    checkpoint['updated_at'] = datetime.now().isoformat()
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file, indent=1)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def _report(shards: List[Dict[str, Any]], synced: int, started: float):
+    done = sum(1 for shard in shards if shard['done'])
+    total = sum(shard['records'] for shard in shards)
+    elapsed = time.monotonic() - started
+    rate = synced / elapsed if elapsed > 0 else 0
+    print(f"{done}/{len(shards)} shards done, {total} records stored ({rate:.0f}/s this run)", flush=True)
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Plan (or resume) and execute a sharded sync
+
+    Returns:
+        Process exit code: 0 when every shard finished
+    """
+    asyncio.run(init_db())
+
+    tenant_configs = mcp_orchestrator.load_tenant_configs()
+    tenant = args.tenant or mcp_orchestrator.default_tenant
+    if tenant not in tenant_configs:
+        print(f"Unknown tenant: {tenant}")
+        return 2
+    hubspot_config = {**tenant_configs[tenant]['hubspot'], 'tenant': tenant}
+    if not hubspot_config.get('access_token'):
+        print(f"HubSpot access token not found for tenant '{tenant}'")
+        return 2
+
+    run_key = {'tenant': tenant, 'objects': args.objects, 'since': args.since}
+    checkpoint = None if args.restart else load_checkpoint(args.checkpoint)
+    if checkpoint and checkpoint.get('run') == run_key:
+        print(f"Resuming from {args.checkpoint}")
+    else:
+        checkpoint = {'run': run_key, 'shards': asyncio.run(_plan(hubspot_config, args.objects, args.shards, args.since))}
+        save_checkpoint(args.checkpoint, checkpoint)
+
+    shards = checkpoint['shards']
+    by_id = {shard['id']: shard for shard in shards}
+    pending = [shard for shard in shards if not shard['done']]
+    stored_before = {shard['id']: shard['records'] for shard in pending}
+    failed = 0
+    synced = 0
+    started = time.monotonic()
+
+    context = multiprocessing.get_context('spawn')
+    progress_queue = context.Queue()
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context,
+                             initializer=_init_worker, initargs=(progress_queue,)) as pool:
+        futures = {pool.submit(_sync_shard, dict(shard), hubspot_config, args.since): shard for shard in pending}
+
+        def drain():
+            nonlocal synced
+            while not progress_queue.empty():
+                shard_id, next_start, records = progress_queue.get()
+                shard = by_id[shard_id]
+                synced += records
+                if shard['done']:
+                    continue
+                shard['next_start'] = max(shard['next_start'], next_start)
+                shard['records'] += records
+
+        while futures:
+            finished, _ = wait(futures, timeout=CHECKPOINT_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+            drain()
+            for future in finished:
+                shard = futures.pop(future)
+                try:
+                    # The worker's count is authoritative; progress messages may still be queued
+                    shard['records'] = stored_before[shard['id']] + future.result()
+                    shard['next_start'] = shard['end']
+                    shard['done'] = True
+                except Exception as e:
+                    failed += 1
+                    print(f"Shard {shard['id']} failed: {e}")
+            save_checkpoint(args.checkpoint, checkpoint)
+            _report(shards, synced, started)
+
+    asyncio.run(_finish(tenant))
+    if failed:
+        print(f"{failed} shards failed; run the same command again to resume them")
+        return 1
+    print(f"Sync finished: {sum(shard['records'] for shard in shards)} records")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m sync_runner', description='Sharded HubSpot sync into the local store')
+    parser.add_argument('--tenant', help='Tenant (HubSpot portal) to sync; the default tenant if omitted')
+    parser.add_argument('--objects', default=','.join(SYNC_OBJECTS),
+                        help='Comma-separated object types (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--shards', type=int, default=None,
+                        help='ID ranges per object type (default: 4 per worker)')
+    parser.add_argument('--since', help='Only sync records changed after this ISO date')
+    parser.add_argument('--checkpoint', default='sync_checkpoint.json',
+                        help='Checkpoint file (default: %(default)s)')
+    parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint')
+    args = parser.parse_args(argv)
+
+    args.objects = [name.strip() for name in args.objects.split(',') if name.strip()]
+    unknown = [name for name in args.objects if name not in SYNC_OBJECTS]
+    if unknown:
+        parser.error(f"unknown object types: {', '.join(unknown)}")
+    if args.since:
+        try:
+            datetime.fromisoformat(args.since)
+        except ValueError:
+            parser.error(f"invalid --since date: {args.since}")
+    args.workers = max(1, args.workers)
+    args.shards = args.shards or args.workers * 4
+    return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
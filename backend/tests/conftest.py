@@ -0,0 +1,46 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Modules read their configuration at import time: point them at scratch
+# storage before anything from the backend is imported
+_scratch = tempfile.mkdtemp(prefix='gtm-compass-tests-')
+os.environ['DATABASE_URL'] = f'sqlite:///{_scratch}/store.db'
+os.environ['WARM_SNAPSHOT_DIR'] = ''
+os.environ['SHARED_STATE_URL'] = f'sqlite:///{_scratch}/shared_state.db'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def run_in_store():
+    """
+    Run an async scenario(db) against an emptied local store
+
+    Pooled connections don't outlive the event loop, so they are closed
+    before returning.
+    """
+    from sqlalchemy import delete
+
+    from database import SessionLocal, engine, init_db
+    from models import Call, Deal, Lead, RecordChange
+    from services import search_index
+
+    def run(scenario):
+        async def main():
+            try:
+                await init_db()
+                async with SessionLocal() as db:
+                    for model in (Lead, Call, Deal, RecordChange):
+                        await db.execute(delete(model))
+                    await db.commit()
+                    await search_index.rebuild_search_index(db)
+                    return await scenario(db)
+            finally:
+                await engine.dispose()
+        return asyncio.run(main())
+
+    return run
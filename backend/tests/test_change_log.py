@@ -0,0 +1,54 @@
+from services import local_store
+from services.dashboard_push import DashboardBroadcaster
+from services.mcp_orchestrator import MCPOrchestrator
+
+
+def _leads(*ids):
+    return [{'external_id': external_id, 'name': f'Lead {external_id}'} for external_id in ids]
+
+
+def test_feed_only_holds_the_tenants_changes(run_in_store):
+    async def scenario(db):
+        await local_store.upsert_leads(db, 'acme', 'hubspot', _leads('1', '2'))
+        await local_store.upsert_leads(db, 'globex', 'hubspot', _leads('1'))
+        await local_store.delete_records(db, 'leads', 'globex', 'hubspot', ['1'])
+        return (
+            await local_store.query_changes(db, 'acme'),
+            await local_store.query_changes(db, 'globex'),
+        )
+
+    acme, globex = run_in_store(scenario)
+    assert [(change['external_id'], change['operation']) for change in acme['changes']] == [('1', 'insert'), ('2', 'insert')]
+    assert [change['record']['name'] for change in acme['changes']] == ['Lead 1', 'Lead 2']
+    # globex's lead 1 was deleted; acme's lead 1 with the same key is unaffected
+    assert [(change['external_id'], change['operation'], change['record']) for change in globex['changes']] == [('1', 'delete', None)]
+    assert acme['version'] < globex['version']
+
+
+def test_paging_a_tenants_feed(run_in_store):
+    async def scenario(db):
+        await local_store.upsert_leads(db, 'acme', 'hubspot', _leads('1', '2', '3'))
+        await local_store.upsert_leads(db, 'globex', 'hubspot', _leads('9'))
+        first = await local_store.query_changes(db, 'acme', limit=2)
+        rest = await local_store.query_changes(db, 'acme', since=first['next_since'], limit=2)
+        return first, rest
+
+    first, rest = run_in_store(scenario)
+    assert first['has_more'] and not rest['has_more']
+    assert [change['external_id'] for change in first['changes'] + rest['changes']] == ['1', '2', '3']
+    assert rest['next_since'] == first['version']
+
+
+def test_watcher_version_ignores_other_tenants(run_in_store):
+    broadcaster = DashboardBroadcaster(MCPOrchestrator('acme'))
+
+    async def scenario(db):
+        await local_store.upsert_leads(db, 'acme', 'hubspot', _leads('1'))
+        before = await broadcaster._change_version()
+        await local_store.upsert_leads(db, 'globex', 'hubspot', _leads('1', '2'))
+        unchanged = await broadcaster._change_version()
+        await local_store.upsert_leads(db, 'acme', 'hubspot', [{'external_id': '1', 'name': 'Renamed'}])
+        return before, unchanged, await broadcaster._change_version()
+
+    before, unchanged, after = run_in_store(scenario)
+    assert before == unchanged < after
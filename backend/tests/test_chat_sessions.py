@@ -0,0 +1,26 @@
+from services.chat_sessions import ChatSessionStore
+
+
+def test_session_ids_only_resolve_for_their_tenant():
+    store = ChatSessionStore()
+    session = store.get_or_create('acme')
+    store.append(session, 'user', 'How many leads came in this week?')
+
+    assert store.get('acme', session.session_id) is session
+    assert store.get('globex', session.session_id) is None
+    # Another tenant presenting the id gets a new, empty session instead
+    other = store.get_or_create('globex', session.session_id)
+    assert other is not session and other.session_id != session.session_id
+    assert not store.delete('globex', session.session_id)
+    assert store.delete('acme', session.session_id)
+
+
+def test_least_recently_used_session_is_evicted():
+    store = ChatSessionStore(max_sessions=2)
+    first = store.get_or_create('acme')
+    second = store.get_or_create('globex')
+    store.get('acme', first.session_id)
+    store.get_or_create('acme')
+
+    assert store.get('acme', first.session_id) is first
+    assert store.get('globex', second.session_id) is None
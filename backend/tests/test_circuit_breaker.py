@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from mcps.base import MCPConnectionError
+from services import circuit_breaker
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.mcp_orchestrator import MCPOrchestrator
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the breaker"""
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def _breaker(**options):
+    return CircuitBreaker(**{'failure_rate_threshold': 0.5, 'min_calls': 4, 'window_size': 10, 'open_seconds': 30, **options})
+
+
+def _fail(breaker, times):
+    for _ in range(times):
+        assert breaker.allow_request()
+        breaker.record_failure(MCPConnectionError('unreachable'))
+
+
+def test_stays_closed_until_the_window_holds_min_calls(clock):
+    breaker = _breaker()
+    _fail(breaker, 3)
+    assert breaker.state == CircuitBreaker.CLOSED
+    _fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_opens_when_the_rolling_window_reaches_the_failure_rate(clock):
+    breaker = _breaker()
+    for _ in range(6):
+        assert breaker.allow_request()
+        breaker.record_success()
+    _fail(breaker, 4)
+    assert breaker.failure_rate() == pytest.approx(0.4)
+    assert breaker.state == CircuitBreaker.CLOSED
+    # The window is full: the next failure pushes out a success (5 of 10)
+    _fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_open_rejects_until_open_seconds_pass(clock):
+    breaker = _breaker()
+    _fail(breaker, 4)
+    assert not breaker.allow_request()
+    assert breaker.retry_after() == 30
+    assert breaker.total_rejections == 1
+
+    clock[0] += 29.9
+    assert not breaker.allow_request()
+    clock[0] += 0.1
+    assert breaker.status()['state'] == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = _breaker()
+    _fail(breaker, 4)
+    clock[0] += 30
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_successful_probe_closes_with_an_empty_window(clock):
+    breaker = _breaker()
+    _fail(breaker, 4)
+    clock[0] += 30
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.status()['window_calls'] == 0
+    # The old failures don't count towards opening it again
+    _fail(breaker, 3)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_probe_reopens(clock):
+    breaker = _breaker()
+    _fail(breaker, 4)
+    clock[0] += 30
+    _fail(breaker, 1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_after() == 30
+
+
+def test_ignored_probe_frees_its_slot(clock):
+    breaker = _breaker()
+    _fail(breaker, 4)
+    clock[0] += 30
+    assert breaker.allow_request()
+    breaker.record_ignored()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+class FlakyMCP:
+    def __init__(self):
+        self.up = True
+        self.calls = 0
+
+    async def get_leads(self, limit=None):
+        self.calls += 1
+        if not self.up:
+            raise MCPConnectionError('HubSpot unreachable')
+        return [{'id': '1'}][:limit]
+
+    async def get_calls(self):
+        raise ValueError('bad request')
+
+
+def test_open_circuit_fails_fast_with_the_last_good_result(clock, monkeypatch):
+    monkeypatch.setenv('CIRCUIT_MIN_CALLS', '2')
+    orchestrator = MCPOrchestrator('breaker-test')
+    mcp = FlakyMCP()
+    orchestrator.register_mcp('hubspot', mcp)
+
+    async def scenario():
+        assert await orchestrator.call_mcp('hubspot', 'get_leads', limit=5) == [{'id': '1'}]
+        mcp.up = False
+        # One success and one failure: half the minimum window failed
+        with pytest.raises(MCPConnectionError):
+            await orchestrator.call_mcp('hubspot', 'get_leads', limit=5)
+        with pytest.raises(CircuitOpenError) as rejected:
+            await orchestrator.call_mcp('hubspot', 'get_leads', limit=5)
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.cached == [{'id': '1'}]
+    assert mcp.calls == 2  # the rejected call never reached the MCP
+    assert orchestrator.circuit_status('hubspot')['state'] == CircuitBreaker.OPEN
+
+
+def test_other_errors_leave_the_circuit_closed(clock):
+    orchestrator = MCPOrchestrator('breaker-test')
+    orchestrator.register_mcp('hubspot', FlakyMCP())
+
+    async def scenario():
+        for _ in range(10):
+            with pytest.raises(ValueError):
+                await orchestrator.call_mcp('hubspot', 'get_calls')
+
+    asyncio.run(scenario())
+    assert orchestrator.circuit_status('hubspot')['state'] == CircuitBreaker.CLOSED
@@ -0,0 +1,67 @@
+import copy
+
+import pytest
+
+from services.dashboard_push import merge_patch
+
+
+def apply_patch(target, patch):
+    """RFC 7386 merge patch application, as a client does it"""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_patch(result.get(key), value)
+    return result
+
+
+SUMMARY = {
+    'platforms': ['hubspot'],
+    'leads_summary': {'total_leads': 10, 'by_platform': {'hubspot': {'count': 10, 'new_this_week': 2}}},
+    'calls_summary': {'total_calls': 4},
+    'last_updated': '2024-05-01T09:00:00',
+}
+
+
+def test_unchanged_summary_gives_an_empty_patch():
+    assert merge_patch(SUMMARY, copy.deepcopy(SUMMARY)) == {}
+
+
+def test_nested_changes_are_diffed_key_by_key():
+    new = copy.deepcopy(SUMMARY)
+    new['leads_summary']['by_platform']['hubspot']['new_this_week'] = 3
+    new['last_updated'] = '2024-05-01T09:05:00'
+
+    assert merge_patch(SUMMARY, new) == {
+        'leads_summary': {'by_platform': {'hubspot': {'new_this_week': 3}}},
+        'last_updated': '2024-05-01T09:05:00',
+    }
+
+
+def test_removed_keys_become_null_and_added_keys_are_sent_whole():
+    new = copy.deepcopy(SUMMARY)
+    del new['calls_summary']
+    new['budget_summary'] = {'total_pipeline_value': 1200.0}
+
+    assert merge_patch(SUMMARY, new) == {'calls_summary': None, 'budget_summary': {'total_pipeline_value': 1200.0}}
+
+
+def test_lists_and_type_changes_are_replaced_whole():
+    new = copy.deepcopy(SUMMARY)
+    new['platforms'] = ['hubspot', 'salesforce']
+    new['calls_summary'] = 'unavailable'
+
+    assert merge_patch(SUMMARY, new) == {'platforms': ['hubspot', 'salesforce'], 'calls_summary': 'unavailable'}
+
+
+@pytest.mark.parametrize('new', [
+    {},
+    {'platforms': []},
+    {**SUMMARY, 'leads_summary': {'total_leads': 11}},
+    {**SUMMARY, 'extra': {'nested': {'deep': [1, 2]}}},
+])
+def test_applying_the_patch_gives_the_new_summary(new):
+    assert apply_patch(copy.deepcopy(SUMMARY), merge_patch(SUMMARY, new)) == new
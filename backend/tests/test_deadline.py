@@ -0,0 +1,28 @@
+import pytest
+
+from mcps.deadline import Deadline, decode_resume_cursor, encode_resume_cursor
+
+
+def test_resume_cursor_round_trip():
+    deadline = Deadline(timeout=0)
+    deadline.child('hubspot').stop('contacts', 'after-200')
+
+    cursor = deadline.resume_cursor()
+
+    assert decode_resume_cursor(cursor) == {'hubspot': {'contacts': 'after-200'}}
+
+
+@pytest.mark.parametrize('cursors', [
+    ['hubspot'],
+    {'hubspot': 5},
+    {'hubspot': 'contacts'},
+    {'hubspot': {'contacts': ['after-200']}},
+])
+def test_malformed_resume_cursor_is_rejected(cursors):
+    with pytest.raises(ValueError):
+        decode_resume_cursor(encode_resume_cursor(cursors))
+
+
+def test_garbage_resume_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_resume_cursor('not base64 json')
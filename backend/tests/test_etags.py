@@ -0,0 +1,110 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from services.etags import ConditionalResponder, etag_matches
+
+
+def _request(if_none_match=None):
+    headers = [(b'if-none-match', if_none_match.encode())] if if_none_match else []
+    return Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': headers})
+
+
+def test_matching_if_none_match_gets_304():
+    responder = ConditionalResponder()
+    content = {'leads': [{'id': '1', 'name': 'Ada'}], 'count': 1}
+
+    first = responder.respond(_request(), content)
+    etag = first.headers['etag']
+    assert first.status_code == 200 and etag.startswith('"')
+
+    again = responder.respond(_request(etag), content)
+    assert again.status_code == 304
+    assert again.body == b''
+    assert again.headers['etag'] == etag
+
+
+def test_changed_content_gets_a_new_etag_and_body():
+    responder = ConditionalResponder()
+    etag = responder.respond(_request(), {'count': 1}).headers['etag']
+
+    changed = responder.respond(_request(etag), {'count': 2})
+    assert changed.status_code == 200
+    assert changed.headers['etag'] != etag
+    assert changed.body == b'{"count":2}'
+
+
+def test_volatile_fields_leave_the_etag_alone():
+    responder = ConditionalResponder()
+    first = responder.respond(_request(), {'count': 1, 'retrieved_at': '10:00'}, volatile=('retrieved_at',))
+
+    later = responder.respond(_request(first.headers['etag']), {'count': 1, 'retrieved_at': '10:05'}, volatile=('retrieved_at',))
+    assert later.status_code == 304
+
+
+def test_versioned_content_reuses_its_etag_and_body():
+    responder = ConditionalResponder()
+    first = responder.respond(_request(), {'count': 1}, versions=(('dashboard', 7),))
+
+    # Same version: answered from what was kept, without looking at the content
+    again = responder.respond(_request(), {'count': 'not serialized'}, versions=(('dashboard', 7),))
+    assert again.headers['etag'] == first.headers['etag']
+    assert again.body == first.body
+    assert responder.respond(_request(first.headers['etag']), None, versions=(('dashboard', 7),)).status_code == 304
+
+
+def test_if_none_match_comparison():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"xyz", "abc"', '"abc"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_dashboard_round_trip():
+    from main import app
+    from services.mcp_orchestrator import get_orchestrator
+
+    client = TestClient(app)
+    first = client.get('/api/mcp/dashboard')
+    etag = first.headers['etag']
+    assert first.status_code == 200
+    assert first.headers['cache-control'] == 'private, no-cache'
+
+    unchanged = client.get('/api/mcp/dashboard', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b''
+
+    # A recomputed summary (new last_updated) is a new version of the data
+    asyncio.run(get_orchestrator().cache.invalidate_shared('dashboard'))
+    recomputed = client.get('/api/mcp/dashboard', headers={'If-None-Match': etag})
+    assert recomputed.status_code == 200
+    assert recomputed.headers['etag'] != etag
+
+
+def test_leads_revalidation_skips_the_fetch(monkeypatch):
+    from main import app
+    from services.mcp_orchestrator import get_orchestrator
+
+    orchestrator = get_orchestrator()
+    fetches = []
+
+    async def get_all_leads(limit=None, since_date=None, deadline=None):
+        fetches.append(limit)
+        return {'hubspot': {'leads': [{'id': '1'}], 'count': 1, 'platform': 'HubSpot'}}
+
+    monkeypatch.setattr(orchestrator, 'get_all_leads', get_all_leads)
+    asyncio.run(orchestrator.cache.invalidate_shared('leads:7:None'))
+    client = TestClient(app)
+
+    first = client.get('/api/mcp/leads?limit=7')
+    unchanged = client.get('/api/mcp/leads?limit=7', headers={'If-None-Match': first.headers['etag']})
+    assert first.status_code == 200 and first.json()['leads']['hubspot']['count'] == 1
+    assert unchanged.status_code == 304
+    assert fetches == [7]
+
+    # Reads with a deadline are live and never cached
+    client.get('/api/mcp/leads?limit=7&timeout_ms=5000')
+    assert fetches == [7, 7]
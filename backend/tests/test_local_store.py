@@ -0,0 +1,60 @@
+from sqlalchemy import create_engine, inspect
+
+from database import _drop_tables_without_tenant
+from services import local_store, search_index
+
+
+def _lead(external_id, name, company):
+    return {'external_id': external_id, 'name': name, 'email': f'{name.lower()}@{company.lower()}.com', 'company': company}
+
+
+def test_tenants_keep_their_own_copy_of_a_record(run_in_store):
+    async def scenario(db):
+        await local_store.upsert_leads(db, 'acme', 'hubspot', [_lead('1', 'Ada', 'Acme')])
+        await local_store.upsert_leads(db, 'globex', 'hubspot', [_lead('1', 'Grace', 'Globex')])
+        acme = await local_store.query_leads(db, 'acme')
+        globex = await local_store.query_leads(db, 'globex')
+        return acme['leads'], globex['leads']
+
+    acme, globex = run_in_store(scenario)
+    assert [lead['name'] for lead in acme] == ['Ada']
+    assert [lead['name'] for lead in globex] == ['Grace']
+
+
+def test_search_only_finds_the_tenants_records(run_in_store):
+    async def scenario(db):
+        await local_store.upsert_leads(db, 'acme', 'hubspot', [_lead('1', 'Ada', 'Shared')])
+        await local_store.upsert_leads(db, 'globex', 'hubspot', [_lead('2', 'Grace', 'Shared')])
+        return await search_index.search(db, 'globex', 'shared')
+
+    assert [(hit['external_id'], hit['title']) for hit in run_in_store(scenario)] == [('2', 'Grace')]
+
+
+def _legacy_store(path, tables):
+    legacy = create_engine(f'sqlite:///{path}')
+    with legacy.begin() as connection:
+        for statement in tables:
+            connection.exec_driver_sql(statement)
+    return legacy
+
+
+def test_store_from_before_tenants_is_dropped(tmp_path):
+    legacy = _legacy_store(tmp_path / 'legacy.db', [
+        'CREATE TABLE leads (id INTEGER PRIMARY KEY, platform TEXT, external_id TEXT)',
+        'CREATE TABLE record_changes (version INTEGER PRIMARY KEY)',
+    ])
+    with legacy.begin() as connection:
+        assert sorted(_drop_tables_without_tenant(connection)) == ['leads', 'record_changes']
+        assert inspect(connection).get_table_names() == []
+        # Nothing left to drop the next time
+        assert _drop_tables_without_tenant(connection) == []
+
+
+def test_change_log_from_before_tenants_is_dropped_alone(tmp_path):
+    legacy = _legacy_store(tmp_path / 'legacy.db', [
+        'CREATE TABLE leads (id INTEGER PRIMARY KEY, tenant TEXT, platform TEXT, external_id TEXT)',
+        'CREATE TABLE record_changes (version INTEGER PRIMARY KEY)',
+    ])
+    with legacy.begin() as connection:
+        assert _drop_tables_without_tenant(connection) == ['record_changes']
+        assert inspect(connection).get_table_names() == ['leads']
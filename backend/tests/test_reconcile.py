@@ -0,0 +1,77 @@
+from mcps.hubspot import HubSpotMCP
+from services import local_store
+
+
+class FakePortal:
+    """The ID lookups reconciliation makes, answered from a set of live record IDs"""
+
+    def __init__(self, live, archived=()):
+        self.live = set(live)
+        self.archived = set(archived)
+
+    async def archived_ids(self, session, object_type):
+        return set(self.archived)
+
+    async def count_range(self, session, object_type, start, end):
+        return sum(start <= record_id < end for record_id in self.live)
+
+    async def list_range_ids(self, session, object_type, start, end):
+        return sorted(record_id for record_id in self.live if start <= record_id < end)
+
+
+def _mcp(tenant, portal):
+    mcp = HubSpotMCP({'access_token': 'token', 'tenant': tenant})
+    mcp._archived_ids = portal.archived_ids
+    mcp._count_range = portal.count_range
+    mcp._list_range_ids = portal.list_range_ids
+    return mcp
+
+
+def _leads(ids):
+    return [{'external_id': str(record_id), 'name': f'Lead {record_id}'} for record_id in ids]
+
+
+def test_reconcile_only_deletes_the_tenants_records(run_in_store):
+    # Both portals use IDs 1-6; acme deleted 2 and archived 5, globex deleted nothing
+    acme = _mcp('acme', FakePortal(live=[1, 3, 4, 6], archived=[5]))
+
+    async def scenario(db):
+        await local_store.upsert_leads(db, 'acme', 'hubspot', _leads(range(1, 7)))
+        await local_store.upsert_leads(db, 'globex', 'hubspot', _leads(range(1, 7)))
+        stats = await acme._reconcile_object(None, db, 'hubspot', 'leads')
+        return (
+            stats,
+            sorted(await local_store.list_external_ids(db, 'leads', 'acme', 'hubspot')),
+            sorted(await local_store.list_external_ids(db, 'leads', 'globex', 'hubspot'))
+        )
+
+    stats, acme_ids, globex_ids = run_in_store(scenario)
+    assert (stats['stored'], stats['archived'], stats['vanished'], stats['deleted']) == (6, 1, 1, 2)
+    assert acme_ids == ['1', '3', '4', '6']
+    assert globex_ids == ['1', '2', '3', '4', '5', '6']
+
+
+def test_reconcile_ignores_records_of_other_tenants(run_in_store):
+    # Only globex has stored records; acme's pass must find nothing to compare
+    acme = _mcp('acme', FakePortal(live=[]))
+
+    async def scenario(db):
+        await local_store.upsert_leads(db, 'globex', 'hubspot', _leads(range(1, 4)))
+        stats = await acme._reconcile_object(None, db, 'hubspot', 'leads')
+        return stats, await local_store.list_external_ids(db, 'leads', 'globex', 'hubspot')
+
+    stats, globex_ids = run_in_store(scenario)
+    assert stats['stored'] == 0 and stats['deleted'] == 0
+    assert sorted(globex_ids) == ['1', '2', '3']
+
+
+def test_delete_records_is_scoped_to_the_tenant(run_in_store):
+    async def scenario(db):
+        await local_store.upsert_leads(db, 'acme', 'hubspot', _leads([1, 2]))
+        await local_store.upsert_leads(db, 'globex', 'hubspot', _leads([1, 2]))
+        deleted = await local_store.delete_records(db, 'leads', 'acme', 'hubspot', ['1', '2', '3'])
+        return deleted, await local_store.list_external_ids(db, 'leads', 'globex', 'hubspot')
+
+    deleted, globex_ids = run_in_store(scenario)
+    assert deleted == 2
+    assert sorted(globex_ids) == ['1', '2']
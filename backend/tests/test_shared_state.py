@@ -0,0 +1,38 @@
+import asyncio
+from datetime import date, datetime, timezone
+
+from services.shared_state import SQLiteStateBackend, decode_value, encode_value
+
+
+def test_values_keep_their_types():
+    value = {
+        'created': datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+        'due': date(2024, 6, 1),
+        'leads': [{'name': 'Ada', 'score': 3.5, 'tags': None}],
+    }
+    assert decode_value(encode_value(value)) == value
+
+
+def test_sqlite_backend_round_trips_datetimes(tmp_path):
+    backend = SQLiteStateBackend(str(tmp_path / 'state.db'))
+    stamp = datetime(2024, 5, 1, 12, 30)
+
+    async def run():
+        await backend.set('leads', [{'created_at': stamp}], ttl=60)
+        return await backend.get('leads')
+
+    assert asyncio.run(run()) == [{'created_at': stamp}]
+
+
+def test_sqlite_backend_locks(tmp_path):
+    backend = SQLiteStateBackend(str(tmp_path / 'state.db'))
+
+    async def run():
+        assert await backend.add('lock', 'a', ttl=60)
+        assert not await backend.add('lock', 'b', ttl=60)
+        assert not await backend.delete('lock', 'b')
+        assert await backend.delete('lock', 'a')
+        assert await backend.incr('calls', ttl=60) == 1
+        assert await backend.incr('calls', 2, ttl=60) == 3
+
+    asyncio.run(run())
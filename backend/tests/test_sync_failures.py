@@ -0,0 +1,118 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import sync_runner
+from mcps.hubspot import HubSpotMCP
+
+
+class FakeSearch:
+    """The search endpoint over a set of record IDs, failing requests for chosen ranges"""
+
+    def __init__(self, ids, fail_ranges=(), fail_after_pages=0):
+        self.ids = sorted(ids)
+        self.fail_ranges = set(fail_ranges)
+        # Pages of a failing range served before its requests start failing
+        self.fail_after_pages = fail_after_pages
+        self.served = {}
+
+    async def fetch_page(self, session, object_type, properties, page_size,
+                         after=None, filters=None, sorts=None, archived=False):
+        start, end = 0, float('inf')
+        for search_filter in filters or []:
+            if search_filter['operator'] == 'GTE':
+                start = int(search_filter['value'])
+            elif search_filter['operator'] == 'LT':
+                end = int(search_filter['value'])
+        if (start, end) in self.fail_ranges:
+            self.served[start, end] = self.served.get((start, end), 0) + 1
+            if self.served[start, end] > self.fail_after_pages:
+                return [], None, None
+
+        matches = [record_id for record_id in self.ids if start <= record_id < end]
+        if sorts and sorts[0]['direction'] == 'DESCENDING':
+            matches.reverse()
+        offset = int(after or 0)
+        page = matches[offset:offset + page_size]
+        next_after = str(offset + page_size) if offset + page_size < len(matches) else None
+        return [{'id': str(record_id), 'properties': {}} for record_id in page], next_after, len(matches)
+
+
+def _mcp(search, **config):
+    mcp = HubSpotMCP({'access_token': 'token', **config})
+    mcp.is_authenticated = True
+    mcp._fetch_page = search.fetch_page
+    return mcp
+
+
+def test_sync_reports_an_error_when_the_id_bounds_request_fails():
+    # A failed bounds lookup must not pass for an empty portal
+    mcp = _mcp(FakeSearch(range(1, 11), fail_ranges=[(0, float('inf'))]), sync_partitions=2)
+
+    result = asyncio.run(mcp.sync_to_database(None))
+
+    assert 'error' in result and 'leads' not in result
+
+
+def test_partitioned_fetch_raises_when_a_page_fails():
+    # Two partitions of 1-800 with two pages each; the upper one fails after its first page
+    search = FakeSearch(range(1, 801), fail_ranges=[(401, 801)], fail_after_pages=1)
+    mcp = _mcp(search, sync_partitions=2)
+
+    async def run():
+        pages = mcp._iter_partitioned(None, 'contacts', [])
+        return [record async for page in pages for record in page]
+
+    with pytest.raises(RuntimeError, match='contacts 401-801'):
+        asyncio.run(run())
+
+
+def test_plan_sync_ranges_raises_when_a_range_count_fails():
+    # Ranges 1-201 and 201-401; counting the upper one fails
+    mcp = _mcp(FakeSearch(range(1, 401), fail_ranges=[(201, 401)]))
+
+    with pytest.raises(RuntimeError, match='contacts 201-401'):
+        asyncio.run(mcp.plan_sync_ranges('leads', 2))
+
+
+def test_sync_id_range_raises_when_a_page_fails():
+    # Two pages of 200; the second one fails
+    mcp = _mcp(FakeSearch(range(1, 401), fail_ranges=[(1, 401)], fail_after_pages=1))
+    progress = []
+
+    async def on_progress(next_start, records):
+        progress.append(next_start)
+
+    with pytest.raises(RuntimeError, match='contacts 1-401'):
+        asyncio.run(mcp.sync_id_range(None, 'leads', 1, 401, on_progress=on_progress))
+    # Progress may cover the first page, never the failed one
+    assert all(next_start <= 201 for next_start in progress)
+
+
+def test_sync_runner_keeps_a_failed_shard_resumable(monkeypatch, tmp_path):
+    # Shards 1-401 and 401-801 of two pages each; the second page of the upper one fails
+    search = FakeSearch(range(1, 801), fail_ranges=[(401, 801)], fail_after_pages=2)
+
+    class FakeHubSpot(HubSpotMCP):
+        def __init__(self, config):
+            super().__init__(config)
+            self.is_authenticated = True
+            self._fetch_page = search.fetch_page
+
+    # Threads instead of worker processes, so they see the fakes
+    monkeypatch.setattr(sync_runner, 'ProcessPoolExecutor',
+                        lambda max_workers, mp_context, **kwargs: ThreadPoolExecutor(max_workers, **kwargs))
+    monkeypatch.setattr(sync_runner, 'HubSpotMCP', FakeHubSpot)
+    monkeypatch.setattr(sync_runner.mcp_orchestrator, 'load_tenant_configs',
+                        lambda: {'acme': {'hubspot': {'access_token': 'token'}}})
+    checkpoint = str(tmp_path / 'checkpoint.json')
+
+    exit_code = sync_runner.main(['--tenant', 'acme', '--objects', 'leads', '--workers', '2',
+                                  '--shards', '2', '--checkpoint', checkpoint])
+
+    shards = {shard['id']: shard for shard in sync_runner.load_checkpoint(checkpoint)['shards']}
+    assert exit_code == 1
+    assert shards['leads:1-401']['done'] and shards['leads:1-401']['records'] == 400
+    assert not shards['leads:401-801']['done']
+    assert shards['leads:401-801']['next_start'] < 801
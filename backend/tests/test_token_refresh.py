@@ -0,0 +1,35 @@
+import asyncio
+
+from mcps import hubspot
+from mcps.hubspot import HubSpotMCP
+
+
+def test_refresh_loop_waits_when_token_expiry_is_unknown(monkeypatch, tmp_path):
+    # Shrink the assumed lifetime so the test sees a couple of cycles
+    monkeypatch.setattr(hubspot, 'TOKEN_REFRESH_MARGIN_SECONDS', 300)
+    monkeypatch.setattr(hubspot, 'DEFAULT_TOKEN_LIFETIME_SECONDS', 300.2)
+    mcp = HubSpotMCP({
+        'access_token': 'access',
+        'refresh_token': 'refresh',
+        'token_file': str(tmp_path / 'tokens.json'),
+    })
+    refreshes = []
+
+    async def refresh():
+        # A token response without expires_in
+        refreshes.append(asyncio.get_running_loop().time())
+        mcp.token_expires_at = None
+        return True
+
+    mcp._refresh_access_token = refresh
+
+    async def run():
+        task = asyncio.create_task(mcp._refresh_loop())
+        await asyncio.sleep(0.5)
+        task.cancel()
+
+    asyncio.run(run())
+
+    # One refresh at startup, then one per assumed lifetime - not a busy loop
+    assert 2 <= len(refreshes) <= 4
+    assert all(later - earlier >= 0.15 for earlier, later in zip(refreshes, refreshes[1:]))
@@ -0,0 +1,56 @@
+import asyncio
+from datetime import datetime
+
+from services.mcp_orchestrator import MCPOrchestrator
+from services.snapshot import SnapshotStore
+
+
+def _orchestrator(path):
+    orchestrator = MCPOrchestrator('snapshot-test')
+    orchestrator.snapshot = SnapshotStore(str(path))
+    return orchestrator
+
+
+def test_snapshot_is_written_from_cached_reads(tmp_path):
+    orchestrator = _orchestrator(tmp_path / 'snapshot.json.gz')
+    summary = {'total_platforms': 0, 'last_updated': datetime(2024, 5, 1, 9, 0)}
+
+    async def run():
+        async def load():
+            return summary
+        assert await orchestrator.get_cached('dashboard', load) == summary
+        await orchestrator._snapshot_task
+
+    asyncio.run(run())
+
+    # Restored with its datetime intact, and only what was cached
+    entries = SnapshotStore(str(tmp_path / 'snapshot.json.gz')).load()['entries']
+    assert entries == {'dashboard': summary}
+
+
+def test_sync_leaves_the_snapshot_to_the_next_reads(tmp_path):
+    path = tmp_path / 'snapshot.json.gz'
+    orchestrator = _orchestrator(path)
+
+    async def run():
+        await orchestrator.sync_all_data(db=None)
+        assert orchestrator._snapshot_task is None
+
+    asyncio.run(run())
+
+    assert not path.exists()
+    assert orchestrator._snapshot_stale == set(orchestrator.warm_loaders())
+
+
+def test_failed_reads_are_left_out(tmp_path):
+    orchestrator = _orchestrator(tmp_path / 'snapshot.json.gz')
+
+    async def run():
+        async def fail():
+            return {'error': 'CRM unavailable'}
+        await orchestrator.get_cached('dashboard', fail)
+        await orchestrator._snapshot_task
+
+    asyncio.run(run())
+
+    assert SnapshotStore(str(tmp_path / 'snapshot.json.gz')).load() is None
@@ -40,6 +40,7 @@ const MCPHubSpotAgent = () => {
   const [isLoading, setIsLoading] = useState(false);
   const [mcpStatus, setMcpStatus] = useState<MCPStatus | null>(null);
   const [mcpData, setMcpData] = useState<MCPData | null>(null);
+  const [sessionId, setSessionId] = useState<string | null>(null);
 
   // Query MCP health status
   const { data: healthData, isError: healthError } = useQuery({
@@ -96,13 +97,10 @@ const MCPHubSpotAgent = () => {
         headers: {
           'Content-Type': 'application/json',
         },
+        // History lives server-side in the chat session; only send the new message
         body: JSON.stringify({
           message: currentInput,
-          conversation_history: messages.map(msg => ({
-            type: msg.type,
-            content: msg.content,
-            timestamp: msg.timestamp.toISOString()
-          }))
+          session_id: sessionId
         })
       });
 
@@ -111,6 +109,7 @@ const MCPHubSpotAgent = () => {
       }
 
       const chatData = await response.json();
+      setSessionId(chatData.session_id ?? null);
       
       const botResponse: Message = {
         id: Date.now() + 1,